@@ -0,0 +1,57 @@
+"""
+picviz: charts of the OCHA Palestine-Israel casualty data.
+
+The chart classes are loaded lazily: `import app.picviz` imports none of the
+plotting backends, and each backend (bokeh, matplotlib, plotly, ...) is only
+imported when a class of its module is first accessed, e.g. `picviz.Heatmap`.
+Run `python -m app.picviz.utils.importtime` to check the startup cost.
+"""
+from importlib import import_module
+
+_LAZY_ATTRS = {
+    # bokeh / matplotlib / pydantic
+    "CustomBar": ".src.bars",
+    "Bar": ".src.bars",
+    "StackBar": ".src.bars",
+    # bokeh server
+    "StackBarApp": ".src.stackbar_app",
+    # plotly
+    "Heatmap": ".src.heatmap",
+    # plotly / plotly.express
+    "Bubbles": ".src.hsb",
+    "Scatter": ".src.hsb",
+    "Histogram": ".src.hsb",
+    # plotly / matplotlib / PIL
+    "PieChartYs": ".src.pies",
+    "PieChartMs": ".src.pies",
+    "pie_chart_mf": ".src.pies",
+    "pie_chart_sf": ".src.pies",
+    "Choice": ".src.pies",
+    # pandas / numpy only
+    "Loader": ".utils.data",
+    "AggregateCube": ".utils.aggregate",
+    "StreamAggregator": ".utils.aggregate",
+    "Dataset": ".utils.dataset",
+    "SharedDataset": ".utils.shared",
+    "ValidatedDataset": ".utils.schema",
+    "validate": ".utils.schema",
+    "RenderCache": ".utils.render_cache",
+    "StaticExporter": ".utils.export",
+    "AsyncRenderer": ".aio",
+    "ChartService": ".server",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
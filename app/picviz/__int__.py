@@ -1,25 +0,0 @@
-from .src.bars import(
-    CustomBar,
-    Bar,
-    StackBar
-)
-from .src.heatmap import(
-    Heatmap,
-    Choice
-)
-from .src.hsb import(
-    Bubbles,
-    Scatter,
-    Histogram
-)
-from .src.pies import(
-    PieChartYs,
-    PieChartMs,
-    pie_chart_mf,
-    pie_chart_sf,
-    Choice
-    
-)
-from .utils.data import(
-    Loader
-)
\ No newline at end of file
@@ -0,0 +1,262 @@
+"""
+Asynchronous chart rendering for async web backends.
+
+Building a figure is synchronous and CPU-bound, so calling `show()` or
+`render()` from a coroutine blocks the event loop. `AsyncRenderer` runs
+`render.render_chart` in a bounded process (or thread) pool instead:
+
+    async with AsyncRenderer(max_workers=4) as renderer:
+        renderer.add_dataset("monthly", Loader().read_csv("data/ps_il.csv"))
+        html = await renderer.render("Heatmap", "monthly", {"choice": "Injuries", "cmap": "turbid"}, timeout=30)
+
+At most `max_workers` charts are handed to the executor at a time; further
+requests wait in the event loop, where they can still be cancelled, and at
+most `max_queue` of them: beyond that a request either waits for room or, with
+`wait=False`, fails at once with RendererBusy so the caller can shed load.
+Every request has a deadline covering its wait and its rendering; a request
+past it raises RenderTimeout, and a process worker stops the chart at the
+deadline. A slot is only freed once its worker is done, so cancelled and
+timed-out requests never let the executor queue grow.
+"""
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from .render import CHARTS, JobTimeout, _init_worker, render_chart
+
+EXECUTORS = ("process", "thread")
+
+
+class RendererBusy(Exception):
+    """
+    Raised when an AsyncRenderer is full and a request does not wait for room.
+    """
+
+
+class RenderTimeout(TimeoutError):
+    """
+    Raised when a request is not rendered before its deadline.
+    """
+
+
+class AsyncRenderer:
+    """
+    A class used to render charts from coroutines without blocking the event loop.
+
+    With the 'process' executor (the default) every chart runs in a worker
+    process with the Agg backend, datasets registered with `add_dataset` are
+    shared with the workers through a SharedDataset, and a chart past its
+    deadline is stopped in the worker. The 'thread' executor avoids the process
+    start-up and data transfer and suits the plotly and bokeh charts; a thread
+    cannot be stopped, so a late chart keeps its slot until it finishes.
+
+    Methods
+    -------
+    add_dataset(name, data): Registers a dataset that requests can name instead of passing data.
+    render(chart, data, params=None, format=None, options=None, timeout=None, wait=True): Renders one chart.
+    render_many(requests, return_exceptions=True): Renders several charts concurrently.
+    stats(): Returns the number of running and waiting requests.
+    close(): Cancels the waiting work and shuts the executor down.
+    """
+
+    def __init__(self, max_workers=None, max_queue=None, executor="process", timeout=60, cache_dir=None,
+                 assets=None):
+        """
+        Initialize the AsyncRenderer object.
+
+        Parameters:
+        max_workers (int, optional): The number of charts rendered at a time.
+            Defaults to the CPU count.
+        max_queue (int, optional): The number of requests that may wait for a
+            worker. Defaults to 4 * max_workers.
+        executor (str): 'process' or 'thread'. Defaults to 'process'.
+        timeout (float, optional): The default deadline of a request in seconds;
+            None waits forever. Defaults to 60.
+        cache_dir (str, optional): A RenderCache directory shared by the workers.
+        assets (str, optional): How HTML output loads its JavaScript, see `figure_bytes`.
+
+        Raises:
+        ValueError: If executor is not one of `EXECUTORS` or a bound is not positive.
+        """
+        if executor not in EXECUTORS:
+            raise ValueError(f"executor must be one of {EXECUTORS}, got {executor!r}")
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = 4 * self.max_workers if max_queue is None else max_queue
+        if self.max_workers < 1 or self.max_queue < 0:
+            raise ValueError("max_workers must be positive and max_queue must not be negative")
+        self.executor = executor
+        self.timeout = timeout
+        self.cache_dir = cache_dir
+        self.assets = assets
+        self.running = 0
+        self.waiting = 0
+        self._pool = None
+        self._slots = asyncio.Semaphore(self.max_workers)
+        self._room = asyncio.Semaphore(self.max_workers + self.max_queue)
+        self._datasets = {}
+        self._shared = []
+        self._closed = False
+
+    def _executor(self):
+        if self._pool is None:
+            pool = ProcessPoolExecutor if self.executor == "process" else ThreadPoolExecutor
+            self._pool = pool(max_workers=self.max_workers, initializer=_init_worker)
+        return self._pool
+
+    def add_dataset(self, name, data):
+        """
+        Register a dataset that requests can name instead of passing data.
+
+        With the process executor the rows are copied into shared memory once,
+        so requests do not pickle them.
+
+        Parameters:
+        name (str): The dataset name.
+        data (DataFrame or Dataset): The rows.
+        """
+        if self.executor == "process":
+            from .utils.shared import SharedDataset
+
+            data = SharedDataset(data)
+            self._shared.append(data)
+        self._datasets[name] = data
+
+    def stats(self):
+        """
+        Return the load of the renderer.
+
+        Returns:
+        dict: The `running` and `waiting` requests and their bounds.
+        """
+        return {"running": self.running, "waiting": self.waiting, "max_workers": self.max_workers,
+                "max_queue": self.max_queue}
+
+    def _remaining(self, deadline):
+        if deadline is None:
+            return None
+        remaining = deadline - asyncio.get_running_loop().time()
+        if remaining <= 0:
+            raise RenderTimeout("deadline exceeded")
+        return remaining
+
+    async def render(self, chart, data, params=None, format=None, options=None, timeout=None, wait=True):
+        """
+        Render one chart in the executor.
+
+        Parameters:
+        chart (str): A chart class of `render.CHARTS`, e.g. 'Heatmap'.
+        data: The chart input, or the name of a dataset registered with `add_dataset`.
+        params (dict, optional): The constructor keyword arguments.
+        format (str, optional): The output format; defaults to the `RENDER_FORMAT` of the chart.
+        options (dict, optional): The keyword arguments of `build_figure`.
+        timeout (float, optional): The deadline of this request in seconds,
+            including its wait for a worker. Defaults to the renderer timeout.
+        wait (bool): Whether to wait for room when the queue is full, instead of
+            raising RendererBusy. Defaults to True.
+
+        Returns:
+        bytes: The rendered chart.
+
+        Raises:
+        ValueError: If chart is unknown or data names no registered dataset.
+        RendererBusy: If wait is False and max_queue requests are already waiting.
+        RenderTimeout: If the chart is not rendered before the deadline.
+        RuntimeError: If the renderer is closed.
+        """
+        if self._closed:
+            raise RuntimeError("The renderer is closed.")
+        if chart not in CHARTS:
+            raise ValueError(f"Unknown chart: {chart}")
+        if isinstance(data, str):
+            if data not in self._datasets:
+                raise ValueError(f"Unknown dataset: {data}")
+            data = self._datasets[data]
+        timeout = self.timeout if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+
+        if not wait:
+            if self._room.locked():
+                raise RendererBusy(f"{self.running} charts running and {self.waiting} waiting")
+            # An uncontended acquire does not yield, so no other request can take the room in between
+            await self._room.acquire()
+        else:
+            try:
+                await asyncio.wait_for(self._room.acquire(), self._remaining(deadline))
+            except asyncio.TimeoutError:
+                raise RenderTimeout(f"the queue had no room within {timeout}s") from None
+        try:
+            return await self._run(chart, data, params, format, options, timeout, deadline)
+        finally:
+            self._room.release()
+
+    async def _run(self, chart, data, params, format, options, timeout, deadline):
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self._remaining(deadline))
+        except asyncio.TimeoutError:
+            raise RenderTimeout(f"no worker became free within {timeout}s") from None
+        finally:
+            self.waiting -= 1
+
+        try:
+            future = self._executor().submit(render_chart, chart, data, params, format, options,
+                                             self._remaining(deadline), self.cache_dir, self.assets)
+        except BaseException:
+            self._slots.release()
+            raise
+        self.running += 1
+
+        def release(done):
+            self.running -= 1
+            self._slots.release()
+            if not done.cancelled():
+                done.exception()  # retrieved here when the caller has stopped waiting
+
+        # The slot is freed when the worker is done, not when the caller stops waiting
+        done = asyncio.wrap_future(future)
+        done.add_done_callback(release)
+        try:
+            return await asyncio.wait_for(asyncio.shield(done), self._remaining(deadline))
+        except (asyncio.TimeoutError, JobTimeout):
+            future.cancel()
+            raise RenderTimeout(f"{chart} was not rendered within {timeout}s") from None
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+
+    async def render_many(self, requests, return_exceptions=True):
+        """
+        Render several charts concurrently, e.g. the panels of one report.
+
+        Parameters:
+        requests (list): The keyword arguments of `render` for every chart.
+        return_exceptions (bool): Whether a failed chart yields its exception in
+            the results instead of cancelling the others. Defaults to True.
+
+        Returns:
+        list: The bytes (or exception) of every request, in order.
+        """
+        return await asyncio.gather(*(self.render(**request) for request in requests),
+                                    return_exceptions=return_exceptions)
+
+    async def close(self):
+        """
+        Cancel the work that has not started, shut the executor down and free the shared datasets.
+        """
+        self._closed = True
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            await asyncio.get_running_loop().run_in_executor(
+                None, lambda: pool.shutdown(wait=True, cancel_futures=True))
+        for dataset in self._shared:
+            dataset.close()
+            dataset.unlink()
+        self._shared.clear()
+        self._datasets.clear()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
@@ -0,0 +1,103 @@
+import argparse
+import json
+import os
+import sys
+
+from .utils.export import HTML_ASSETS
+
+
+def render_command(args):
+    from .render import format_summary, load_manifest, render_manifest
+
+    manifest = load_manifest(args.manifest)
+    if args.output_dir:
+        manifest["output_dir"] = os.path.abspath(args.output_dir)
+    if args.cache_dir:
+        manifest["cache"] = os.path.abspath(args.cache_dir)
+    dashboard = os.path.abspath(args.dashboard) if args.dashboard else None
+    summary = render_manifest(manifest, processes=args.processes, timeout=args.timeout, only=args.only,
+                              cache=not args.no_cache, assets=args.assets, dashboard=dashboard)
+    summary_path = args.summary or os.path.join(manifest["output_dir"], "render_summary.json")
+    os.makedirs(os.path.dirname(os.path.abspath(summary_path)), exist_ok=True)
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    print(format_summary(summary))
+    print(f"summary written to {summary_path}")
+    return 1 if summary["failed"] else 0
+
+
+def serve_command(args):
+    from .src.stackbar_app import StackBarApp
+    from .utils.dataset import Dataset
+
+    app = StackBarApp(Dataset.from_csv(args.data), variable=args.variable)
+    print(f"serving the StackBar app at http://localhost:{args.port}/stackbar")
+    app.serve(port=args.port, show=args.show, allow_websocket_origin=args.allow_websocket_origin)
+    return 0
+
+
+def http_command(args):
+    from .server import ChartService, make_server
+    from .utils.data import Loader
+
+    service = ChartService(Loader().read_many(args.data), max_workers=args.workers, executor=args.executor,
+                           timeout=args.timeout, cache_bytes=int(args.cache_mb * 1024 ** 2))
+    server = make_server(service, args.host, args.port)
+    print(f"serving charts at http://{args.host}:{server.server_address[1]}/charts")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="picviz", description="picviz command line tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    render = commands.add_parser("render", help="render every chart of a manifest in a process pool")
+    render.add_argument("manifest", help="the JSON or YAML manifest of charts to render")
+    render.add_argument("--processes", type=int, default=None, help="worker processes (default: manifest, then CPU count)")
+    render.add_argument("--timeout", type=float, default=None, help="per-job timeout in seconds (default: manifest, then 120)")
+    render.add_argument("--output-dir", default=None, help="override the output directory of the manifest")
+    render.add_argument("--summary", default=None, help="timing summary path (default: <output dir>/render_summary.json)")
+    render.add_argument("--cache-dir", default=None, help="render cache directory (default: the manifest's 'cache')")
+    render.add_argument("--no-cache", action="store_true", help="render every chart, ignoring the render cache")
+    render.add_argument("--assets", choices=HTML_ASSETS, default=None,
+                        help="how HTML outputs load plotly.js/BokehJS: embedded, from the CDN, or one shared "
+                             "copy in the output directory (default: the manifest's 'html_assets')")
+    render.add_argument("--dashboard", default=None,
+                        help="write every chart into this single HTML page instead of one file per job")
+    render.add_argument("--only", nargs="*", default=None, help="render only the jobs with these names or charts")
+    render.set_defaults(func=render_command)
+
+    serve = commands.add_parser("serve", help="serve the interactive StackBar chart with a Bokeh server")
+    serve.add_argument("data", help="the CSV file of monthly rows")
+    serve.add_argument("--port", type=int, default=5006, help="the port to listen on (default: 5006)")
+    serve.add_argument("--variable", default="Palestinians Fatalities",
+                       help="the measure shown when a session opens (default: Palestinians Fatalities)")
+    serve.add_argument("--allow-websocket-origin", action="append", default=None,
+                       help="a host:port allowed to connect, as for 'bokeh serve' (default: localhost)")
+    serve.add_argument("--show", action="store_true", help="open the app in a browser")
+    serve.set_defaults(func=serve_command)
+
+    http = commands.add_parser("http", help="serve every chart over a local HTTP API with a shared result cache")
+    http.add_argument("data", help="the CSV or Excel file(s) of monthly rows (a path or a glob)")
+    http.add_argument("--host", default="127.0.0.1", help="the address to listen on (default: 127.0.0.1)")
+    http.add_argument("--port", type=int, default=8000, help="the port to listen on (default: 8000)")
+    http.add_argument("--workers", type=int, default=None, help="charts rendered at a time (default: CPU count)")
+    http.add_argument("--executor", choices=("process", "thread"), default="process",
+                      help="render in worker processes or threads (default: process)")
+    http.add_argument("--timeout", type=float, default=60, help="the deadline of a rendering in seconds (default: 60)")
+    http.add_argument("--cache-mb", type=float, default=64, help="the size of the in-memory result cache (default: 64)")
+    http.set_defaults(func=http_command)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
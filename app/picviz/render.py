@@ -0,0 +1,514 @@
+"""
+Batch rendering of chart manifests.
+
+A manifest (JSON or YAML) names the datasets to load and the charts to render:
+
+    datasets:
+      monthly: data/ps_il.csv          # a path, a glob or a list (see Loader.read_many)
+      grouped: data/ps_il.xlsx
+    output_dir: outputs
+    processes: 4
+    timeout: 120                       # seconds per job
+    cache: .picviz_render_cache        # optional RenderCache directory
+    cache_max_mb: 512
+    html_assets: directory             # inline, cdn or directory (one shared plotly.js/BokehJS)
+    dashboard: dashboard.html          # optional: one page with every chart instead of one file per job
+    jobs:
+      - chart: Bar
+        params: {y_label: Palestinians Injuries}
+        output: ps_i_yearbar.png
+      - chart: Bubbles
+        data: grouped
+        output: Bubbles.html
+      - chart: pie_chart_mf
+        output: "{feature}_per_Months.png"
+
+Every dataset is loaded once and shared with the worker processes through a
+`SharedDataset`. Jobs build their figure headlessly with `build_figure` (the
+matplotlib Agg backend) and serialise it with `figure_bytes`, and are timed
+individually. With a `cache` directory, charts whose data slice
+and parameters are unchanged are written from the RenderCache without being
+built. Plotly charts with an image output (.png, .svg, .pdf, ...) are
+exported through a StaticExporter that each worker keeps warm for all its jobs.
+With `html_assets: directory`, HTML outputs reference one copy of plotly.js and
+BokehJS written next to them instead of embedding it. With a `dashboard`, the
+jobs are serialised as compact JSON (PNG for matplotlib) and bundled into a
+single page. Paths are relative to the manifest file; the dashboard path is
+relative to the output directory.
+"""
+import json
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from collections.abc import Iterator
+from importlib import import_module
+from pathlib import Path
+
+from .utils.export import HTML_ASSETS, IMAGE_FORMATS
+
+# chart name -> (module, builder, data keyword); functions yield (feature, figure) pairs drawn on one reused figure
+CHARTS = {
+    "Bar": (".src.bars", "Bar", None),
+    "StackBar": (".src.bars", "StackBar", None),
+    "CustomBar": (".src.bars", "CustomBar", "data"),
+    "Heatmap": (".src.heatmap", "Heatmap", None),
+    "Histogram": (".src.hsb", "Histogram", None),
+    "Scatter": (".src.hsb", "Scatter", None),
+    "Bubbles": (".src.hsb", "Bubbles", None),
+    "PieChartYs": (".src.pies", "PieChartYs", None),
+    "PieChartMs": (".src.pies", "PieChartMs", None),
+    "pie_chart_mf": (".src.pies", "pie_variants_mf", None),
+    "pie_chart_sf": (".src.pies", "pie_variants_sf", None),
+    "pie_panel_mf": (".src.pies", "pie_panel_mf", None),
+    "pie_panel_sf": (".src.pies", "pie_panel_sf", None),
+}
+
+PLOTLY_CHARTS = {"Heatmap", "Histogram", "Scatter", "Bubbles", "PieChartYs", "PieChartMs"}
+BOKEH_CHARTS = {"StackBar"}
+
+
+def chart_library(chart):
+    """
+    Return the plotting library a chart draws with.
+
+    Parameters:
+    chart (str): A key of `CHARTS`.
+
+    Returns:
+    str: 'plotly', 'bokeh' or 'matplotlib'.
+    """
+    if chart in PLOTLY_CHARTS:
+        return "plotly"
+    return "bokeh" if chart in BOKEH_CHARTS else "matplotlib"
+
+
+class JobTimeout(Exception):
+    """
+    Raised inside a worker when a job exceeds its timeout.
+    """
+
+
+def load_manifest(path):
+    """
+    Read a render manifest and resolve its paths against the manifest directory.
+
+    Parameters:
+    path (str): The path of the .json, .yaml or .yml manifest.
+
+    Returns:
+    dict: The manifest with `datasets` (name -> path or list of paths),
+        `output_dir` (absolute), `processes`, `timeout`, `cache` (absolute or
+        None), `cache_max_mb`, `html_assets`, `dashboard` (absolute or None),
+        `title` and `jobs`.
+
+    Raises:
+    ValueError: If the manifest has no jobs, a job names an unknown chart or
+        dataset, a job has no output, or `html_assets` is unknown.
+    """
+    path = Path(path)
+    with open(path, "r", encoding="utf-8") as f:
+        if path.suffix == ".json":
+            manifest = json.load(f)
+        else:
+            import yaml
+            manifest = yaml.safe_load(f)
+    base = path.resolve().parent
+
+    def resolve(p):
+        return str(base / p)
+
+    datasets = manifest.get("datasets") or {"data": manifest.get("data")}
+    datasets = {name: [resolve(p) for p in value] if isinstance(value, list) else resolve(value)
+                for name, value in datasets.items() if value is not None}
+    if not datasets:
+        raise ValueError("The manifest names no dataset.")
+    jobs = manifest.get("jobs") or []
+    if not jobs:
+        raise ValueError("The manifest has no jobs.")
+    default = next(iter(datasets))
+    for i, job in enumerate(jobs):
+        if job.get("chart") not in CHARTS:
+            raise ValueError(f"Job {i}: unknown chart {job.get('chart')!r}. Known charts: {sorted(CHARTS)}")
+        if not job.get("output"):
+            raise ValueError(f"Job {i} ({job['chart']}) has no output.")
+        job.setdefault("data", default)
+        if job["data"] not in datasets:
+            raise ValueError(f"Job {i} ({job['chart']}): unknown dataset {job['data']!r}.")
+        job.setdefault("name", job["output"])
+        job.setdefault("params", {})
+        job.setdefault("options", {})
+    assets = manifest.get("html_assets")
+    if assets is not None and assets not in HTML_ASSETS:
+        raise ValueError(f"Unknown html_assets {assets!r}. Supported: {HTML_ASSETS}")
+    cache = manifest.get("cache")
+    output_dir = resolve(manifest.get("output_dir", "."))
+    dashboard = manifest.get("dashboard")
+    return {"datasets": datasets, "output_dir": output_dir,
+            "processes": manifest.get("processes"), "timeout": manifest.get("timeout", 120),
+            "cache": resolve(cache) if cache else None, "cache_max_mb": manifest.get("cache_max_mb", 512),
+            "html_assets": assets, "dashboard": os.path.join(output_dir, dashboard) if dashboard else None,
+            "title": manifest.get("title", "picviz dashboard"), "jobs": jobs}
+
+
+def create(chart, data, params=None):
+    """
+    Create one chart object, or the figures of a pie function.
+
+    String values of a `choice` parameter are converted to the Choice enum of the chart module.
+
+    Parameters:
+    chart (str): A key of `CHARTS`.
+    data: The chart input (DataFrame, Dataset, SharedDataset, ...).
+    params (dict, optional): The constructor (or function) keyword arguments.
+
+    Returns:
+    The chart object, or an iterator of (feature, figure) pairs for the pie functions.
+    """
+    module_name, attr, keyword = CHARTS[chart]
+    module = import_module(module_name, __package__)
+    target = getattr(module, attr)
+    params = dict(params or {})
+    if isinstance(params.get("choice"), str):
+        params["choice"] = module.Choice[params["choice"]]
+    if not isinstance(target, type):
+        return target(data, **params)
+    return target(**{keyword: data}, **params) if keyword else target(data, **params)
+
+
+def build(chart, data, params=None, options=None):
+    """
+    Build the figure(s) of one chart without showing them.
+
+    Parameters:
+    chart (str): A key of `CHARTS`.
+    data: The chart input (DataFrame, Dataset, SharedDataset, ...).
+    params (dict, optional): The constructor (or function) keyword arguments.
+    options (dict, optional): The keyword arguments of `build_figure`.
+
+    Returns:
+    The figure, or an iterator of (feature, figure) pairs for the pie functions;
+    their figure is reused, so save each one before advancing.
+    """
+    target = create(chart, data, params)
+    return target if not hasattr(target, "build_figure") else target.build_figure(**(options or {}))
+
+
+def render_chart(chart, data, params=None, format=None, options=None, timeout=None, cache_dir=None, assets=None):
+    """
+    Render one chart class to bytes. Runs in a worker process or thread.
+
+    Parameters:
+    chart (str): A key of `CHARTS` naming a chart class (not a pie function).
+    data: The chart input (DataFrame, Dataset, SharedDataset, ...).
+    params (dict, optional): The constructor keyword arguments.
+    format (str, optional): The output format; defaults to the `RENDER_FORMAT` of the chart.
+    options (dict, optional): The keyword arguments of `build_figure`.
+    timeout (float, optional): The timeout in seconds, enforced with SIGALRM
+        where the platform has it and this is the main thread.
+    cache_dir (str, optional): The RenderCache directory; None renders the chart.
+    assets (str, optional): How HTML output loads its JavaScript, see `figure_bytes`.
+
+    Returns:
+    bytes: The rendered chart.
+
+    Raises:
+    ValueError: If chart does not name a chart class.
+    JobTimeout: If the chart takes longer than timeout.
+    """
+    alarm = timeout and hasattr(signal, "SIGALRM") and threading.current_thread() is threading.main_thread()
+    if alarm:
+        signal.signal(signal.SIGALRM, _on_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        target = create(chart, data, params)
+        if not hasattr(target, "render"):
+            raise ValueError(f"{chart} builds several figures; render_chart needs a chart class.")
+        cache = None
+        if cache_dir is not None:
+            from .utils.render_cache import RenderCache
+
+            cache = RenderCache(cache_dir)
+        return target.render(format, cache=cache, assets=assets, **(options or {}))
+    finally:
+        if alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def save_figure(fig, path, assets=None):
+    """
+    Write a matplotlib, plotly or bokeh figure to disk, chosen by the file extension.
+
+    Parameters:
+    fig: The figure.
+    path (str): The output path; .html for plotly and bokeh, any matplotlib
+        format for matplotlib, and an image format for plotly (needs kaleido).
+    assets (str, optional): How HTML output loads its JavaScript, see `figure_bytes`.
+
+    Raises:
+    ValueError: If the figure type and the extension do not fit together.
+    """
+    from .utils.export import figure_bytes
+
+    write_bytes(figure_bytes(fig, Path(path).suffix.lstrip("."), title=Path(path).stem, assets=assets,
+                             bbox_inches="tight"), path)
+
+
+def write_bytes(payload, path):
+    """
+    Write rendered bytes to a file, creating its directory.
+
+    Parameters:
+    payload (bytes): The rendered chart.
+    path (str): The output path.
+    """
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(payload)
+
+
+def output_paths(output, figures, output_dir):
+    """
+    Return the (figure, path) pairs of a job.
+
+    Parameters:
+    output (str): The output file name; `{feature}` is replaced by the feature
+        name (spaces as underscores) for jobs that build several figures.
+    figures: A figure, a dict of figures by feature or an iterator of
+        (feature, figure) pairs.
+    output_dir (str): The output directory.
+
+    Returns:
+    iterator: The (figure, path) pairs, produced lazily so reused figures can
+        be saved one at a time.
+
+    Raises:
+    ValueError: If a multi-figure job has no `{feature}` placeholder.
+    """
+    if not isinstance(figures, (dict, Iterator)):
+        return iter([(figures, os.path.join(output_dir, output))])
+    if "{feature}" not in output:
+        raise ValueError(f"Output {output!r} builds several figures and needs a '{{feature}}' placeholder.")
+    pairs = figures.items() if isinstance(figures, dict) else figures
+    return ((fig, os.path.join(output_dir, output.format(feature=feature.replace(" ", "_"))))
+            for feature, fig in pairs)
+
+
+def _on_timeout(signum, frame):
+    raise JobTimeout()
+
+
+def _init_worker(static=False):
+    os.environ["MPLBACKEND"] = "Agg"
+    import matplotlib
+    matplotlib.use("Agg")
+    if static:
+        # One export browser per worker, reused by every static plotly job it runs
+        from multiprocessing.util import Finalize
+        from .utils.export import StaticExporter
+
+        try:
+            exporter = StaticExporter().start()
+        except RuntimeError:
+            return  # the jobs report that kaleido is missing
+        Finalize(exporter, exporter.stop, exitpriority=10)
+
+
+def run_job(job, data, output_dir, timeout=None, cache_dir=None, cache_max_mb=512, assets=None, dashboard=False):
+    """
+    Render one job and time it. Runs in a worker process.
+
+    Parameters:
+    job (dict): The manifest job.
+    data: The chart input.
+    output_dir (str): The output directory.
+    timeout (float, optional): The job timeout in seconds, enforced with
+        SIGALRM where the platform has it.
+    cache_dir (str, optional): The RenderCache directory; None renders every chart.
+    cache_max_mb (float): The size bound of the RenderCache in MiB.
+    assets (str, optional): How HTML outputs load their JavaScript, see `figure_bytes`.
+    dashboard (bool): Serialise the figures as dashboard panels instead of writing the output.
+
+    Returns:
+    dict: The job `name`, `chart`, `status` ('ok', 'error' or 'timeout'),
+        `cached` (whether the output came from the RenderCache), `seconds`,
+        `outputs` and `error`; in dashboard mode also `panels`, the
+        (library, format, payload, title) tuples of `Dashboard.add_payload`.
+    """
+    record = {"name": job["name"], "chart": job["chart"], "status": "ok", "cached": False,
+              "outputs": [], "error": None}
+    if dashboard:
+        record["panels"] = []
+    alarm = timeout and hasattr(signal, "SIGALRM")
+    if alarm:
+        signal.signal(signal.SIGALRM, _on_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    start = time.perf_counter()
+    try:
+        target = create(job["chart"], data, job.get("params"))
+        if dashboard:
+            from .utils.export import Dashboard, figure_bytes
+
+            library = chart_library(job["chart"])
+            format = Dashboard.panel_format(library)
+            title = job.get("title", job["name"])
+            savefig_kwargs = {"bbox_inches": "tight"} if library == "matplotlib" else {}
+        if cache_dir is not None and hasattr(target, "cache_slice"):
+            from .utils.render_cache import RenderCache
+
+            cache = RenderCache(cache_dir, max_bytes=int(cache_max_mb * 1024 ** 2))
+            if dashboard:
+                payload = cache.render(target, format, savefig_kwargs=savefig_kwargs, **job.get("options", {}))
+                record["panels"].append((library, format, payload, title))
+            else:
+                path = os.path.join(output_dir, job["output"])
+                write_bytes(cache.render(target, Path(path).suffix.lstrip("."), savefig_kwargs={"bbox_inches": "tight"},
+                                         assets=assets, **job.get("options", {})), path)
+                record["outputs"].append(path)
+            record["cached"] = cache.hits > 0
+        else:
+            figures = target if not hasattr(target, "build_figure") else target.build_figure(**job.get("options", {}))
+            if dashboard:
+                if isinstance(figures, (dict, Iterator)):
+                    named = figures.items() if isinstance(figures, dict) else figures
+                else:
+                    named = [(None, figures)]
+                for feature, fig in named:
+                    record["panels"].append((library, format, figure_bytes(fig, format, **savefig_kwargs),
+                                             f"{title}: {feature}" if feature else title))
+            else:
+                for fig, path in output_paths(job["output"], figures, output_dir):
+                    save_figure(fig, path, assets)
+                    record["outputs"].append(path)
+    except JobTimeout:
+        record.update(status="timeout", error=f"exceeded {timeout}s")
+    except Exception as e:
+        record.update(status="error", error=f"{type(e).__name__}: {e}")
+    finally:
+        if alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    record["seconds"] = round(time.perf_counter() - start, 3)
+    return record
+
+
+def load_datasets(datasets):
+    """
+    Load every dataset of a manifest once and copy it into shared memory.
+
+    Parameters:
+    datasets (dict): Dataset name -> path, glob or list of paths.
+
+    Returns:
+    dict: Dataset name -> SharedDataset. The caller must unlink them.
+    """
+    from .utils.data import Loader
+    from .utils.shared import SharedDataset
+
+    loader = Loader()
+    return {name: SharedDataset(loader.read_many(paths)) for name, paths in datasets.items()}
+
+
+def render_manifest(manifest, processes=None, timeout=None, only=None, cache=True, assets=None, dashboard=None):
+    """
+    Render every job of a manifest in a process pool.
+
+    Parameters:
+    manifest (dict): The output of `load_manifest`.
+    processes (int, optional): The number of worker processes; overrides the
+        manifest. 1 renders in this process.
+    timeout (float, optional): The per-job timeout in seconds; overrides the manifest.
+    only (list, optional): Render only the jobs with these names or charts.
+    cache (bool): Whether to use the RenderCache of the manifest, if it names one.
+    assets (str, optional): How HTML outputs load plotly.js and BokehJS, one of
+        `HTML_ASSETS`; overrides the manifest `html_assets`.
+    dashboard (str, optional): Bundle every chart into this one HTML page
+        instead of writing the job outputs; overrides the manifest.
+
+    Returns:
+    dict: The timing summary, with `load_seconds`, `render_seconds`, `jobs`
+        (one record per job, see `run_job`), `failed`, `cached` and, in
+        dashboard mode, `dashboard` (the page path).
+    """
+    jobs = [job for job in manifest["jobs"] if not only or job["name"] in only or job["chart"] in only]
+    processes = processes or manifest.get("processes") or os.cpu_count() or 1
+    timeout = timeout or manifest.get("timeout")
+    output_dir = manifest["output_dir"]
+    cache_args = (manifest.get("cache") if cache else None, manifest.get("cache_max_mb", 512))
+    assets = assets or manifest.get("html_assets")
+    dashboard = dashboard or manifest.get("dashboard")
+    job_kwargs = {"assets": assets, "dashboard": bool(dashboard)}
+    static = not dashboard and any(job["chart"] in PLOTLY_CHARTS and Path(job["output"]).suffix.lstrip(".").lower() in IMAGE_FORMATS
+                 for job in jobs)
+
+    start = time.perf_counter()
+    needed = {job["data"] for job in jobs}
+    shared = load_datasets({k: v for k, v in manifest["datasets"].items() if k in needed})
+    load_seconds = time.perf_counter() - start
+
+    records = []
+    try:
+        if processes == 1 or len(jobs) == 1:
+            _init_worker(static)
+            records = [run_job(job, shared[job["data"]], output_dir, timeout, *cache_args, **job_kwargs) for job in jobs]
+        else:
+            with multiprocessing.Pool(min(processes, len(jobs)), initializer=_init_worker, initargs=(static,)) as pool:
+                pending = [pool.apply_async(run_job, (job, shared[job["data"]], output_dir, timeout, *cache_args),
+                                            job_kwargs) for job in jobs]
+                # Workers enforce their own timeout; this only guards platforms without SIGALRM.
+                rounds = -(-len(jobs) // min(processes, len(jobs)))
+                deadline = time.monotonic() + (timeout or 3600) * rounds + 30
+                for job, result in zip(jobs, pending):
+                    try:
+                        records.append(result.get(max(deadline - time.monotonic(), 0)))
+                    except multiprocessing.TimeoutError:
+                        records.append({"name": job["name"], "chart": job["chart"], "status": "timeout",
+                                        "cached": False, "seconds": None, "outputs": [], "error": f"exceeded {timeout}s"})
+    finally:
+        for dataset in shared.values():
+            dataset.close()
+            dataset.unlink()
+
+    summary = {}
+    if dashboard:
+        from .utils.export import Dashboard
+
+        page = Dashboard(manifest.get("title", "picviz dashboard"))
+        for record in records:
+            for panel in record.pop("panels", []):
+                page.add_payload(*panel)
+        summary["dashboard"] = page.write(dashboard, assets or "inline")
+    elif assets == "directory":
+        from .utils.export import write_assets
+
+        libraries = {chart_library(job["chart"]) for job in jobs if Path(job["output"]).suffix == ".html"}
+        write_assets(output_dir, tuple(libraries - {"matplotlib"}))
+
+    summary.update({"load_seconds": round(load_seconds, 3),
+                    "render_seconds": round(time.perf_counter() - start - load_seconds, 3),
+                    "processes": processes, "jobs": records, "failed": sum(r["status"] != "ok" for r in records),
+                    "cached": sum(r["cached"] for r in records)})
+    return summary
+
+
+def format_summary(summary):
+    """
+    Format a timing summary as a text table, slowest job first.
+
+    Parameters:
+    summary (dict): The output of `render_manifest`.
+
+    Returns:
+    str: The table.
+    """
+    lines = [f"{'seconds':>8}  {'status':<8} job"]
+    for r in sorted(summary["jobs"], key=lambda r: r["seconds"] or float("inf"), reverse=True):
+        seconds = "-" if r["seconds"] is None else f"{r['seconds']:.2f}"
+        status = "cached" if r["cached"] else r["status"]
+        lines.append(f"{seconds:>8}  {status:<8} {r['name']} ({r['chart']})" + (f": {r['error']}" if r["error"] else ""))
+    lines.append(f"loaded data in {summary['load_seconds']:.2f}s, rendered {len(summary['jobs'])} jobs "
+                 f"in {summary['render_seconds']:.2f}s on {summary['processes']} processes, "
+                 f"{summary['cached']} from cache, {summary['failed']} failed")
+    if summary.get("dashboard"):
+        lines.append(f"dashboard written to {summary['dashboard']}")
+    return "\n".join(lines)
@@ -0,0 +1,475 @@
+"""
+A local HTTP service that renders the charts once for many consumers.
+
+    python -m app.picviz http data/ps_il.csv --port 8000
+
+Every chart class is an endpoint; the query selects the measure, the Choice,
+the year range and the output format (html, json or png):
+
+    GET /charts/Heatmap?choice=Fatalities&years=2010-2020
+    GET /charts/StackBar.json?variable=Israelis%20Injuries
+    GET /charts/Bar.png?variable=Palestinians%20Injuries&years=2014
+    GET /charts                              the endpoints and their parameters
+    GET /health                              cache and renderer load
+
+Rendered results are kept in an in-memory LRU bounded by size, and identical
+requests that arrive while a chart is being rendered wait for that one
+rendering instead of starting their own (single-flight). Charts are rendered
+by an `AsyncRenderer`, so the service inherits its bounded worker pool, its
+backpressure (503 with Retry-After when the queue is full) and its deadlines
+(504). Only the standard library is used on top of the picviz dependencies.
+"""
+import asyncio
+import hashlib
+import importlib.util
+import json
+import threading
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from .aio import AsyncRenderer, RendererBusy, RenderTimeout
+from .render import chart_library
+from .utils.export import FORMATS
+
+# endpoint -> dataset layout, the constructor keyword of `variable` and of `choice`, and the default parameters
+ENDPOINTS = {
+    "Bar": {"data": "wide", "variable": "y_label", "defaults": {"y_label": "Palestinians Fatalities"}},
+    "StackBar": {"data": "wide", "variable": "variable", "defaults": {"variable": "Palestinians Fatalities"}},
+    "CustomBar": {"data": "wide", "defaults": {"title": "Human Cost of Palestine-Israel Conflict"}},
+    "Heatmap": {"data": "wide", "choice": "choice", "defaults": {"choice": "Injuries", "cmap": "turbid"}},
+    "Histogram": {"data": "grouped", "choice": "variable", "defaults": {"variable": "Injuries"}},
+    "Scatter": {"data": "wide", "variable": "var", "defaults": {"var": "Palestinians Fatalities"}},
+    "Bubbles": {"data": "grouped", "defaults": {}},
+    "PieChartYs": {"data": "wide", "defaults": {"title": "Human-Cost of the Palestine-Israel Conflict"}},
+    "PieChartMs": {"data": "wide", "choice": "choice", "defaults": {"choice": "Injuries"}},
+}
+
+SERVICE_FORMATS = ("html", "json", "png")
+CHOICES = ("Injuries", "Fatalities")
+
+
+class RequestError(ValueError):
+    """
+    Raised for a request the service cannot serve; `status` is the HTTP status to answer with.
+    """
+
+    def __init__(self, message, status=HTTPStatus.BAD_REQUEST):
+        self.status = status
+        super().__init__(message)
+
+
+class LRUCache:
+    """
+    A class used to keep rendered results in memory, bounded by their total size.
+
+    Methods
+    -------
+    get(key): Returns the stored bytes and marks them as recently used, or None.
+    put(key, payload): Stores the bytes and evicts the least recently used results.
+    stats(): Returns the size, entry count, hits and misses.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 ** 2):
+        """
+        Initialize the LRUCache object.
+
+        Parameters:
+        max_bytes (int): The size bound in bytes. Defaults to 64 MiB.
+        """
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Return the stored bytes of a key and mark them as recently used.
+
+        Parameters:
+        key: The result key.
+
+        Returns:
+        bytes: The stored bytes, or None on a miss.
+        """
+        with self._lock:
+            payload = self._items.get(key)
+            if payload is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return payload
+
+    def put(self, key, payload):
+        """
+        Store the bytes of a key, then evict the least recently used results over `max_bytes`.
+
+        Parameters:
+        key: The result key.
+        payload (bytes): The rendered result; results larger than `max_bytes` are not stored.
+        """
+        if len(payload) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._items.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._items[key] = payload
+            self.size += len(payload)
+            while self.size > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.size -= len(evicted)
+
+    def stats(self):
+        """
+        Return the size, entry count, hits and misses of the cache.
+
+        Returns:
+        dict: The statistics.
+        """
+        with self._lock:
+            return {"entries": len(self._items), "bytes": self.size, "max_bytes": self.max_bytes,
+                    "hits": self.hits, "misses": self.misses}
+
+    def __len__(self):
+        return len(self._items)
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    A class used to run one call per key at a time and share its result with concurrent callers.
+
+    Methods
+    -------
+    do(key, func): Returns the result of func and whether it was shared with another caller.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        """
+        Call func, unless a call with the same key is running: then wait for its result.
+
+        Parameters:
+        key: The key identifying identical calls.
+        func (callable): The call, without arguments.
+
+        Returns:
+        tuple: The result and True if it came from another caller's call.
+
+        Raises:
+        Exception: The exception of the call, raised in every waiting caller.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+
+def parse_years(value):
+    """
+    Parse a year range such as '2010-2020', '2014' or '2010-'.
+
+    Parameters:
+    value (str): The query value.
+
+    Returns:
+    tuple: The first and last year, None for an open side.
+
+    Raises:
+    RequestError: If the value is not a year range.
+    """
+    low, sep, high = value.partition("-")
+    try:
+        years = (int(low) if low else None, (int(high) if high else None) if sep else int(low))
+    except ValueError:
+        raise RequestError(f"years must look like 2010-2020, got {value!r}") from None
+    if None not in years and years[0] > years[1]:
+        raise RequestError(f"years {value!r} is an empty range")
+    return years
+
+
+class ChartService:
+    """
+    A class used to render the chart endpoints with an LRU of results and single-flight rendering.
+
+    The service is independent of HTTP: `ChartRequestHandler` only parses the
+    request and writes the answer.
+
+    Methods
+    -------
+    render(chart, format=None, variable=None, choice=None, years=None): Returns the bytes and how they were served.
+    stats(): Returns the cache and renderer load.
+    close(): Stops the renderer.
+    """
+
+    def __init__(self, data, max_workers=None, max_queue=None, executor="process", timeout=60,
+                 cache_bytes=64 * 1024 ** 2, assets="inline"):
+        """
+        Initialize the ChartService object.
+
+        Parameters:
+        data (DataFrame): The OCHA rows, in the wide or the grouped layout.
+        max_workers (int, optional): The number of charts rendered at a time.
+        max_queue (int, optional): The number of renderings that may wait for a worker.
+        executor (str): 'process' or 'thread', see `AsyncRenderer`. Defaults to 'process'.
+        timeout (float, optional): The deadline of a rendering in seconds. Defaults to 60.
+        cache_bytes (int): The size bound of the result LRU. Defaults to 64 MiB.
+        assets (str): How HTML output loads its JavaScript, see `figure_bytes`. Defaults to 'inline'.
+        """
+        from .utils.data import to_layout
+
+        self.frames = {layout: to_layout(data, layout) for layout in ("wide", "grouped")}
+        self.cache = LRUCache(cache_bytes)
+        self.flight = SingleFlight()
+        self.coalesced = 0
+        self.timeout = timeout
+        self._subsets = OrderedDict()
+        self._subsets_lock = threading.Lock()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="picviz-renderer", daemon=True)
+        self._thread.start()
+        self.renderer = AsyncRenderer(max_workers=max_workers, max_queue=max_queue, executor=executor,
+                                      timeout=timeout, assets=assets)
+        for layout, frame in self.frames.items():
+            self.renderer.add_dataset(layout, frame)
+        self._png_plotly = importlib.util.find_spec("kaleido") is not None
+
+    def _data(self, layout, years):
+        """
+        Return the dataset name, or the rows of the year range (a few recent ranges are kept).
+        """
+        if years is None or years == (None, None):
+            return layout
+        key = (layout, years)
+        with self._subsets_lock:
+            subset = self._subsets.get(key)
+            if subset is None:
+                frame = self.frames[layout]
+                mask = frame["Year"].between(years[0] if years[0] is not None else frame["Year"].min(),
+                                             years[1] if years[1] is not None else frame["Year"].max())
+                subset = frame[mask].reset_index(drop=True)
+                self._subsets[key] = subset
+                if len(self._subsets) > 32:
+                    self._subsets.popitem(last=False)
+            else:
+                self._subsets.move_to_end(key)
+        if subset.empty:
+            raise RequestError(f"no rows in the years {years[0]}-{years[1]}", HTTPStatus.NOT_FOUND)
+        return subset
+
+    def request(self, chart, format=None, variable=None, choice=None, years=None):
+        """
+        Check a request and return its render arguments.
+
+        Parameters:
+        chart, format, variable, choice, years: As for `render`.
+
+        Returns:
+        tuple: The chart, format, constructor parameters and dataset layout.
+
+        Raises:
+        RequestError: If the chart, format, variable or choice is invalid.
+        """
+        spec = ENDPOINTS.get(chart)
+        if spec is None:
+            raise RequestError(f"Unknown chart {chart!r}. Charts: {sorted(ENDPOINTS)}", HTTPStatus.NOT_FOUND)
+        library = chart_library(chart)
+        format = format or ("png" if library == "matplotlib" else "html")
+        allowed = {"matplotlib": ("png",), "bokeh": ("html", "json")}.get(library, SERVICE_FORMATS)
+        if format not in allowed:
+            raise RequestError(f"{chart} can be rendered as {list(allowed)}, not {format!r}")
+        if format == "png" and library == "plotly" and not self._png_plotly:
+            raise RequestError("PNG output of plotly charts needs kaleido", HTTPStatus.NOT_IMPLEMENTED)
+        params = dict(spec["defaults"])
+        if variable is not None:
+            if "variable" not in spec:
+                raise RequestError(f"{chart} has no variable parameter")
+            if variable not in self.frames[spec["data"]].columns or variable in ("Year", "Month"):
+                raise RequestError(f"Unknown variable {variable!r}")
+            params[spec["variable"]] = variable
+        if choice is not None:
+            if "choice" not in spec:
+                raise RequestError(f"{chart} has no choice parameter")
+            if choice not in CHOICES:
+                raise RequestError(f"choice must be one of {list(CHOICES)}, got {choice!r}")
+            params[spec["choice"]] = choice
+        return chart, format, params, spec["data"]
+
+    def render(self, chart, format=None, variable=None, choice=None, years=None):
+        """
+        Render an endpoint, from the LRU when possible.
+
+        Parameters:
+        chart (str): A key of `ENDPOINTS`.
+        format (str, optional): 'html', 'json' or 'png'. Defaults to png for the
+            matplotlib charts and html otherwise.
+        variable (str, optional): The measure, e.g. 'Israelis Injuries'.
+        choice (str, optional): 'Injuries' or 'Fatalities'.
+        years (tuple, optional): The first and last year to draw.
+
+        Returns:
+        tuple: The rendered bytes, the format and 'hit', 'miss' or 'coalesced'.
+
+        Raises:
+        RequestError: If the request is invalid.
+        RendererBusy: If the renderer queue is full.
+        RenderTimeout: If the chart is not rendered in time.
+        """
+        chart, format, params, layout = self.request(chart, format, variable, choice, years)
+        key = (chart, format, tuple(sorted(params.items())), years)
+        payload = self.cache.get(key)
+        if payload is not None:
+            return payload, format, "hit"
+
+        def render():
+            data = self._data(layout, years)
+            future = asyncio.run_coroutine_threadsafe(
+                self.renderer.render(chart, data, params, format, wait=False), self._loop)
+            payload = future.result()
+            self.cache.put(key, payload)
+            return payload
+
+        payload, shared = self.flight.do(key, render)
+        if shared:
+            self.coalesced += 1
+        return payload, format, "coalesced" if shared else "miss"
+
+    def stats(self):
+        """
+        Return the load of the service.
+
+        Returns:
+        dict: The LRU statistics, the coalesced requests and the renderer load.
+        """
+        return {"cache": self.cache.stats(), "coalesced": self.coalesced, "renderer": self.renderer.stats()}
+
+    def close(self):
+        """
+        Stop the renderer and its event loop.
+        """
+        asyncio.run_coroutine_threadsafe(self.renderer.close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+class ChartRequestHandler(BaseHTTPRequestHandler):
+    """
+    A class used to answer the HTTP requests of a ChartService.
+    """
+
+    server_version = "picviz"
+    service = None
+
+    def _send(self, status, payload, content_type, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(payload)
+
+    def _send_json(self, status, obj, headers=None):
+        self._send(status, json.dumps(obj, indent=2).encode("utf-8"), "application/json", headers)
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        parts = [p for p in url.path.split("/") if p]
+        try:
+            if parts in ([], ["charts"]):
+                self._send_json(HTTPStatus.OK, {"charts": {name: {
+                    "library": chart_library(name),
+                    "parameters": ["format", "years"] + [p for p in ("variable", "choice") if p in spec],
+                    "defaults": spec["defaults"]} for name, spec in ENDPOINTS.items()},
+                    "formats": list(SERVICE_FORMATS), "choices": list(CHOICES)})
+                return
+            if parts == ["health"]:
+                self._send_json(HTTPStatus.OK, self.service.stats())
+                return
+            if len(parts) != 2 or parts[0] != "charts":
+                raise RequestError(f"Unknown path {url.path!r}", HTTPStatus.NOT_FOUND)
+            chart, _, extension = parts[1].partition(".")
+            format = extension or query.get("format")
+            years = parse_years(query["years"]) if query.get("years") else None
+            payload, format, served = self.service.render(chart, format, query.get("variable"),
+                                                          query.get("choice"), years)
+        except RequestError as e:
+            self._send_json(e.status, {"error": str(e)})
+            return
+        except RendererBusy as e:
+            self._send_json(HTTPStatus.SERVICE_UNAVAILABLE, {"error": str(e)}, {"Retry-After": "1"})
+            return
+        except RenderTimeout as e:
+            self._send_json(HTTPStatus.GATEWAY_TIMEOUT, {"error": str(e)})
+            return
+        except (ValueError, TypeError, KeyError) as e:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": f"{type(e).__name__}: {e}"})
+            return
+        except Exception as e:
+            self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(e).__name__}: {e}"})
+            return
+
+        etag = '"' + hashlib.sha256(payload).hexdigest()[:32] + '"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache", "X-Picviz-Cache": served}
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            return
+        content_type = FORMATS[format] + ("; charset=utf-8" if format in ("html", "json") else "")
+        self._send(HTTPStatus.OK, payload, content_type, headers)
+
+
+def make_server(service, host="127.0.0.1", port=8000):
+    """
+    Create the HTTP server of a ChartService; every connection is handled in its own thread.
+
+    Parameters:
+    service (ChartService): The service.
+    host (str): The address to listen on. Defaults to 127.0.0.1.
+    port (int): The port to listen on. Defaults to 8000.
+
+    Returns:
+    ThreadingHTTPServer: The server; call `serve_forever()` to run it.
+    """
+    handler = type("Handler", (ChartRequestHandler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
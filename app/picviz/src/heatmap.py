@@ -1,13 +1,14 @@
 from typing import List
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
 from enum import Enum
 import warnings
 import calendar
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import plotly.io as pio
+from ..utils.aggregate import AggregateCube, as_cube
+from ..utils.dataset import Dataset
+from ..utils.export import Renderable, display_bytes
 
 # Ignore the FutureWarning message
 warnings.filterwarnings("ignore", category=UserWarning)
@@ -18,6 +19,12 @@ class Choice(Enum):
     Fatalities = "Fatalities"
 
 
+COLUMN_MAPPING = {
+    Choice.Injuries: ["Palestinians Injuries", "Israelis Injuries"],
+    Choice.Fatalities: ["Palestinians Fatalities", "Israelis Fatalities"]
+}
+
+
 class Preprocessor:
     
     def reindex_monthcols(self, data: pd.DataFrame, months: List[str], rename = False) -> pd.DataFrame:
@@ -39,26 +46,62 @@ class Preprocessor:
         return data
 
     def get_data(self, data, choice, months):
-        column_mapping = {
-            Choice.Injuries: ["Palestinians Injuries", "Israelis Injuries"],
-            Choice.Fatalities: ["Palestinians Fatalities", "Israelis Fatalities"]
-        }
-        column_names = column_mapping[choice]
+        column_names = COLUMN_MAPPING[choice]
+
+        if isinstance(data, AggregateCube):
+            grouped_data = [self.reindex_monthcols(data.year_month(var), months,
+                                                   rename=True).rename_axis(index=None, columns=None) for var in column_names]
+            return grouped_data, column_names
 
         grouped_data = [self.reindex_monthcols(data.groupby(["Year", "Month"])[var].sum().sort_index(ascending=True).unstack(level=1).fillna(0).astype(int), months, 
                                                rename=True).rename_axis(index=None, columns=None) for var in column_names]
         return grouped_data, column_names
 
+    def get_all(self, data, months):
+        """
+        Return the Year x Month tables of every Choice, aggregated in one pass.
+
+        Args:
+            data (pd.DataFrame or AggregateCube): The raw rows or their cube.
+            months (List[str]): The list of months to use for reindexing.
+
+        Returns:
+            dict: The [Palestinians, Israelis] tables of each Choice, as `get_data` returns them.
+        """
+        column_names = [var for choice in Choice for var in COLUMN_MAPPING[choice]]
+        if isinstance(data, AggregateCube):
+            tables = {var: data.year_month(var) for var in column_names}
+        else:
+            grouped = data.groupby(["Year", "Month"])[column_names].sum().sort_index(ascending=True)
+            tables = {var: grouped[var].unstack(level=1).fillna(0).astype(int) for var in column_names}
+        return {choice: [self.reindex_monthcols(tables[var], months, rename=True).rename_axis(index=None, columns=None)
+                         for var in COLUMN_MAPPING[choice]] for choice in Choice}
+
 
-class Heatmap:
-    def __init__(self, df, choice: Choice, cmap: str):
+class Heatmap(Renderable):
+    def __init__(self, df, choice: Choice, cmap: str, toggle: bool = False):
+        """
+        Initialize the Heatmap object.
+
+        Parameters:
+        - df: The input data (DataFrame, AggregateCube or Dataset).
+        - choice: The Choice to draw, or to show first in toggle mode.
+        - cmap: The plotly colorscale.
+        - toggle: Whether to embed both Choices in one figure, with buttons that
+          switch between them in the browser. Default is False.
+        """
         self._df = None
         self._choice = None
         self.df = df
         self.choice = choice
         self.cmap = cmap
+        self.toggle = toggle
         self.library = "go"
-        self.months = self.df['Month'].unique().tolist()
+        if isinstance(self.df, AggregateCube):
+            # Same December-first row order as the OCHA file, so both inputs render alike.
+            self.months = self.df.months[::-1]
+        else:
+            self.months = self.df['Month'].unique().tolist()
         self.preprocessor = Preprocessor()
 
     @property
@@ -67,8 +110,11 @@ class Heatmap:
 
     @df.setter
     def df(self, value):
-        if not isinstance(value, pd.DataFrame):
-            raise TypeError("df must be a pandas DataFrame")
+        # A Dataset also keeps the largest cell of every measure, the colour scale maximum
+        self.dataset = value if isinstance(value, Dataset) else None
+        value = as_cube(value) or value
+        if not isinstance(value, (pd.DataFrame, AggregateCube)):
+            raise TypeError("df must be a pandas DataFrame or an AggregateCube")
         self._df = value
 
     @property
@@ -126,8 +172,53 @@ class Heatmap:
             
     def _create_heatmap_go(self, data):
         fig = make_subplots(rows=2, cols=1, shared_xaxes=True, shared_yaxes=True, vertical_spacing=0.07)
-        max_value = max(data[0].max().max(), data[1].max().max())
+        self._add_traces(fig, data)
+        max_value = self._max_value(self.choice, data)
+        self.add_subtitles(fig)
+        self.update_layout(fig, max_value)
+        return fig
 
+    def _create_toggle_heatmap_go(self, data_by_choice):
+        """
+        Draw the tables of every Choice into one figure, showing self.choice first.
+
+        Each Choice has its two traces; the buttons only switch the trace
+        visibility, the title and the coloraxis range, so the tables are embedded
+        once and switching needs no new data.
+        """
+        fig = make_subplots(rows=2, cols=1, shared_xaxes=True, shared_yaxes=True, vertical_spacing=0.07)
+        choices = list(data_by_choice)
+        for choice in choices:
+            self._add_traces(fig, data_by_choice[choice], visible=choice is self.choice)
+        max_values = {choice: self._max_value(choice, data_by_choice[choice]) for choice in choices}
+        self.add_subtitles(fig)
+        self.update_layout(fig, max_values[self.choice])
+
+        buttons = []
+        for choice in choices:
+            visible = [c is choice for c in choices for _ in data_by_choice[c]]
+            buttons.append(dict(
+                label=choice.value, method="update",
+                args=[{"visible": visible},
+                      {"title.text": self._title(choice), "coloraxis.cmax": int(max_values[choice]),
+                       "coloraxis.colorbar.title.text": choice.value}]))
+        fig.update_layout(updatemenus=[dict(
+            type="buttons", direction="right", active=choices.index(self.choice), buttons=buttons,
+            x=0, y=1.12, xanchor="left", yanchor="bottom", showactive=True)])
+        return fig
+
+    def _max_value(self, choice, data):
+        """
+        Return the largest value of the Palestinians and Israelis tables of one Choice.
+        """
+        if self.dataset is not None:
+            return self.dataset.cell_max[COLUMN_MAPPING[choice]].max()
+        return max(data[0].max().max(), data[1].max().max())
+
+    def _add_traces(self, fig, data, visible=None):
+        """
+        Add the Palestinians and Israelis heatmaps of one Choice.
+        """
         row = 1
         for data_item in data:
             data_item = data_item.T
@@ -138,14 +229,13 @@ class Heatmap:
                 x=xticks,
                 y=yticks,
                 coloraxis="coloraxis",
+                visible=visible,
                 hoverongaps=False,
                 hovertemplate='Year: %{x}<br>Month: %{y}<br>Count: %{z}<extra></extra>'
             )
             fig.add_trace(heatmap, row=row, col=1)
             row = row + 1
-        self.add_subtitles(fig)
-        self.update_layout(fig, max_value)
-        return fig
+
     def add_subtitles(self, fig):
         subtitle_font = dict(size=14, color="#C51605")
 
@@ -168,18 +258,20 @@ class Heatmap:
        
     def _set_colorbar(self):
         colorbar = dict(
-            title=self.choice.value,
-            titleside="top",
+            title=dict(text=self.choice.value, side="top"),
             tickmode="auto",
             ticktext=["Low", "Medium", "High"],
             ticks="outside",
             len=0.75, y=0.5)
         return colorbar
 
+    def _title(self, choice):
+        return f'Palestine-Israeli Conflict {choice.value} 2000 - April 2024'
+
     def update_layout(self, fig, max_value):
         fig.update_layout(
             title={
-                'text': f'Palestine-Israeli Conflict {self.choice.value} 2000 - April 2024',
+                'text': self._title(self.choice),
                 'x': 0.6,
                 'y': 0.95,
                 'xanchor': 'center',
@@ -205,13 +297,40 @@ class Heatmap:
         )
         fig.update_yaxes(ticksuffix="  ")
       
-    def show(self, savefilename=None):
+    def build_figure(self):
+        """
+        Build the heatmap figure without showing or saving it.
+
+        Returns:
+        go.Figure: The plotly figure.
+        """
+        if self.toggle:
+            return self._create_toggle_heatmap_go(self.preprocessor.get_all(self.df, self.months))
         data, _ = self.preprocessor.get_data(self.df, self.choice, self.months)
-        fig = self.create_heatmap(data)
+        return self.create_heatmap(data)
+
+    def cache_slice(self):
+        """
+        Return the aggregated data the chart draws, as hashed by RenderCache.
+        """
+        if self.toggle:
+            return self.preprocessor.get_all(self.df, self.months)
+        return self.preprocessor.get_data(self.df, self.choice, self.months)[0]
+
+    def show(self, savefilename=None, cache=None):
+        if cache is not None:
+            # Served from the render cache when the data slice and parameters are unchanged
+            payload = cache.render(self, 'html')
+            if savefilename is not None:
+                with open(f'{savefilename}go.html', 'wb') as f:
+                    f.write(payload)
+            display_bytes(payload, 'html')
+            return
+        if self.library != 'go':
+            # Only the plotly heatmap exists; the seaborn one is commented out above
+            raise ValueError(f"Unsupported heatmap library: {self.library}. Only 'go' is available.")
+        fig = self.build_figure()
         if savefilename is not None:
-            if self.library == 'sns':
-                plt.savefig(f'{savefilename}sns.pdf', transparent=True, bbox_inches='tight', pad_inches=0)
-            elif self.library == 'go':
-                fig.write_html(f'{savefilename}go.html')
+            fig.write_html(f'{savefilename}go.html')
         fig.show()
 
@@ -2,11 +2,14 @@ import json
 import plotly.io as pio
 import pandas as pd
 import plotly.graph_objects as go
-import math
+import numpy as np
 import time
 import plotly.express as px
 from typing import List 
 import logging
+from ..utils.data import as_frame, DataFrameCopier
+from ..utils.schema import ValidatedDataset
+from ..utils.export import Renderable, display_bytes
 
 class Config:
     """
@@ -66,13 +69,13 @@ class Config:
         with open(json_file, 'r') as file:
             config_dict = json.load(file)
         return cls.from_dict(config_dict)
-class Histogram:
+class Histogram(Renderable):
     def __init__(self, data: pd.DataFrame, variable: str):
         """
         Initialize the Histogram class.
 
         Parameters:
-        - data (pd.DataFrame): The input data for creating the histogram.
+        - data (pd.DataFrame): The input data for creating the histogram (or a Dataset/SharedDataset/ValidatedDataset).
         - variable (str): The variable to be plotted on the y-axis of the histogram.
         - colors (List[str]): The list of colors to be used for the histogram bars.
 
@@ -83,12 +86,15 @@ class Histogram:
         - ValueError: If colors has less than 2 elements.
         - ValueError: If any element in colors is not a string.
         """
-        if not isinstance(data, pd.DataFrame):
-            raise TypeError("Data must be a pandas DataFrame")
-        if data.empty:
-            raise ValueError("Data cannot be empty")
-        if data.isnull().values.any():
-            raise ValueError("Data contains NaN values")
+        validated = isinstance(data, ValidatedDataset)
+        data = as_frame(data)
+        if not validated:
+            if not isinstance(data, pd.DataFrame):
+                raise TypeError("Data must be a pandas DataFrame")
+            if data.empty:
+                raise ValueError("Data cannot be empty")
+            if data.isnull().values.any():
+                raise ValueError("Data contains NaN values")
 
         self.data = data
         if not isinstance(variable, str):
@@ -215,17 +221,41 @@ class Histogram:
             fig.add_annotation(text_annotation)
 
                 
-    def show(self, save_filename: str = None):
+    def build_figure(self):
+        """
+        Build the histogram figure without showing or saving it.
+
+        Returns:
+        - go.Figure: The plotly figure.
+        """
+        return self.create_histogram()
+
+    def cache_slice(self):
+        """
+        Return the data the chart draws, as hashed by RenderCache.
+        """
+        return self.data[[self.data.columns[0], self.variable, self.data.columns[4]]]
+
+    def show(self, save_filename: str = None, cache=None):
         """
         Show the histogram plot.
 
         Parameters:
         - save_filename (str): The filename to save the plot as HTML.
+        - cache (RenderCache): Serve the HTML from this render cache when the data
+          and parameters are unchanged.
 
         Returns:
         - str: A success message if the plot is successfully saved as HTML.
         """
-        fig = self.create_histogram()
+        if cache is not None:
+            payload = cache.render(self, 'html')
+            if save_filename is not None and isinstance(save_filename, str) and save_filename.endswith(".html"):
+                with open(save_filename, 'wb') as f:
+                    f.write(payload)
+            display_bytes(payload, 'html')
+            return
+        fig = self.build_figure()
         if save_filename is not None and isinstance(save_filename, str) and save_filename.endswith(".html"):
             try:
                 fig.write_html(save_filename)
@@ -237,9 +267,9 @@ class Histogram:
 
 
 
-class Scatter:
+class Scatter(Renderable):
     def __init__(self, df : pd.DataFrame, var : str):
-        self.df = df
+        self.df = as_frame(df)
         self.var = self.validate_var(var, self.df)
         self.config = Config()
 
@@ -263,6 +293,12 @@ class Scatter:
     #         return result
     #     return wrapper
 
+    def cache_slice(self):
+        """
+        Return the data the chart draws, as hashed by RenderCache.
+        """
+        return self.df[["Year", "Month", self.var]]
+
     #@log_execution_time
     def show(self, save_filename: str = None):
         """_summary_
@@ -272,6 +308,18 @@ class Scatter:
             _description_
             To set path to html-file-name that used to save figure, Defaults to None.
         """
+        fig = self.build_figure()
+        if  save_filename is not None :
+            fig.write_html(save_filename)
+        fig.show()
+
+    def build_figure(self):
+        """
+        Build the scatter figure without showing or saving it.
+
+        Returns:
+            go.Figure: The plotly figure.
+        """
         yearstxt = "2000 2005 2010 2015 2020 2024"
         try:
             if self.var.split()[1] == "Killed":
@@ -362,67 +410,75 @@ class Scatter:
             
 
             # Create a figure
-            fig = go.Figure(data=[trace], layout=layout)
-            if  save_filename is not None :
-                fig.write_html(save_filename)
-            fig.show()
+            return go.Figure(data=[trace], layout=layout)
             
         except Exception as e:
             raise e
 
 
-class Bubbles:
-    def __init__(self, data : pd.DataFrame):
+class Bubbles(Renderable):
+    # Above this many points the groups are drawn as WebGL (Scattergl) traces
+    WEBGL_THRESHOLD = 10000
+
+    def __init__(self, data : pd.DataFrame, webgl_threshold : int = None):
         """
         Initialize the class with data, colors, and optional required columns.
 
         Args:
-            data (pd.DataFrame): The input data as a pandas DataFrame.
+            data (pd.DataFrame): The input data as a pandas DataFrame (or a Dataset/SharedDataset/ValidatedDataset).
+            webgl_threshold (int, optional): Draw with Scattergl instead of Scatter when the data
+                has more rows than this. Defaults to WEBGL_THRESHOLD.
           
         """
-        if not isinstance(data, pd.DataFrame):
-            raise TypeError("Data must be a pandas DataFrame")
-        if data.empty:
-            raise ValueError("Data cannot be empty")
-        if data.isnull().values.any():
-            raise ValueError("Data contains NaN values")
+        validated = isinstance(data, ValidatedDataset)
+        data = as_frame(data)
+        if not validated:
+            if not isinstance(data, pd.DataFrame):
+                raise TypeError("Data must be a pandas DataFrame")
+            if data.empty:
+                raise ValueError("Data cannot be empty")
+            if data.isnull().values.any():
+                raise ValueError("Data contains NaN values")
 
         self.data = data
+        self.webgl_threshold = self.WEBGL_THRESHOLD if webgl_threshold is None else webgl_threshold
+        self.copier = DataFrameCopier(data)
         self.config = Config()
         self.create_text_and_sizes()
         
     def create_text_and_sizes(self):
         """
-        Create text and size columns
+        Register the text and size columns as derived columns.
+        They are computed on first use and never added to the input data.
         """
-        self.data['text'] = self.data.apply(lambda row: ('Year: {year}<br>'+
-                                                         'Month: {month}<br>'+
-                                                         'Fatalities: {fatalities}<br>'+
-                                                         'Injuries: {injuries}<br>').format(year=row['Year'],
-                                                                                            month=row['Month'],
-                                                                                            fatalities=row['Fatalities'],
-                                                                                            injuries=row['Injuries']), axis=1)
-        self.data['size'] = self.data['Injuries'].apply(math.sqrt)
+        self.copier.derive('text', lambda df: ('Year: ' + df['Year'].astype(str) +
+                                                '<br>Month: ' + df['Month'].astype(str) +
+                                                '<br>Fatalities: ' + df['Fatalities'].astype(str) +
+                                                '<br>Injuries: ' + df['Injuries'].astype(str) + '<br>'))
+        self.copier.derive('size', lambda df: np.sqrt(df['Injuries'].to_numpy(dtype=float)))
 
     def create_figure(self):
         """
         Create a scatter plot from the DataFrame
         """
-        max_size = max(self.data['size'])
-        sizeref = 2. * max_size / (100 * 50)
+        data = self.copier.view()
+        sizes = data['size'].to_numpy()
+        sizeref = 2. * sizes.max() / (100 * 50)
 
-        # Dictionary with dataframes for each group
-        groups = self.data['Group'].value_counts().index.tolist()
-        groups_data = {group: self.data[self.data['Group'] == group] for group in groups}
+        # Row positions of every group from one groupby, largest group first
+        positions = data.groupby('Group', observed=True, sort=False).indices
+        groups = data['Group'].value_counts().index.tolist()
+        columns = {name: data[name].to_numpy() for name in ('Fatalities', 'Injuries', 'text')}
 
+        trace = go.Scattergl if len(data) > self.webgl_threshold else go.Scatter
         fig = go.Figure()
         
-        fig.add_traces([go.Scatter(
-            x=group['Fatalities'], y=group['Injuries'],
-            name=group_name, text=group['text'],
-            marker_size=group['size'],
+        fig.add_traces([trace(
+            x=columns['Fatalities'][positions[group_name]], y=columns['Injuries'][positions[group_name]],
+            name=group_name, text=columns['text'][positions[group_name]],
+            marker_size=sizes[positions[group_name]],
             marker_color=self.config.colors[2] if group_name == 'Israel' else self.config.colors[3]
-        ) for group_name, group in groups_data.items()])
+        ) for group_name in groups if group_name in positions])
 
         # Tune marker appearance and layout
         fig.update_traces(mode='markers', marker=dict(sizemode='area',
@@ -494,14 +550,40 @@ class Bubbles:
         
         return fig
 
-    def show(self, save_filename : str = None):
+    def build_figure(self):
+        """
+        Build the bubble figure without showing or saving it.
+
+        Returns:
+            go.Figure: The plotly figure.
+        """
+        return self.create_figure()
+
+    def cache_slice(self):
+        """
+        Return the data the chart draws, as hashed by RenderCache.
+        """
+        return self.data
+
+    def show(self, save_filename : str = None, cache=None):
         """
         Display the plot
         Args:
             filename (str, optional): The filename for the plot. Defaults to 'bubblechart.html'.
+            cache (RenderCache, optional): Serve the HTML from this render cache when
+                the data and parameters are unchanged.
         """
-
-        fig = self.create_figure()
+        if save_filename is not None and not save_filename.endswith('.html'):
+            raise ValueError("Invalid filename. Filename must be end with '.html'")
+        if cache is not None:
+            payload = cache.render(self, 'html')
+            if save_filename is not None:
+                with open(save_filename, 'wb') as f:
+                    f.write(payload)
+            display_bytes(payload, 'html')
+            return
+
+        fig = self.build_figure()
         if fig is None:
             raise ValueError("Failed to create the plot")
         if save_filename is not None:
@@ -3,14 +3,20 @@ from plotly.subplots import make_subplots
 import plotly.io as pio
 from typing import List
 import pandas as pd
-from PIL import Image
 import plotly.offline as py
 import itertools
 from enum import Enum
 import pandas as pd
 import  matplotlib.pyplot as plt
-import random
+from matplotlib.patches import Shadow
+import numpy as np
+import hashlib
 from pathlib import Path
+from ..utils.aggregate import AggregateCube, as_cube
+from ..utils.assets import ASSETS
+from ..utils.data import DataFrameCopier
+from ..utils.dataset import Dataset
+from ..utils.export import Renderable
 class Choice(Enum):
     Injuries = "Injuries"
     Fatalities = "Fatalities"
@@ -55,11 +61,17 @@ def reset_months(data):
         print(f'Error occurred during renaming process: {e}')
 
     return data
-class PieChartYs:
+class PieChartYs(Renderable):
+    # the people icons are drawn at a tenth of the 1100px figure width; keep 2x for high-dpi screens
+    IMAGE_SIZE = (220, 220)
+
     def __init__(self, df, title,
                  colors : List[str]=["#820300",'#F4DFC8','#053B50']):
-        if not isinstance(df, pd.DataFrame):
-            raise TypeError("data must be a pandas DataFrame")
+        # A Dataset keeps the grand totals up to date on append, so the pies read them directly
+        self.dataset = df if isinstance(df, Dataset) else None
+        df = as_cube(df) or df
+        if not isinstance(df, (pd.DataFrame, AggregateCube)):
+            raise TypeError("data must be a pandas DataFrame or an AggregateCube")
         if not isinstance(title, str):
             raise TypeError("title must be a string")
         
@@ -72,7 +84,7 @@ class PieChartYs:
                      ["Palestinians Injuries","Israelis Injuries"]]
         self.legend_labels=["Palestinians", 'Israelis']
         self.pie_labels=["Fatalities","Injuries"]
-        self.paths=[Path("app\picviz\images\people.png"),Path("app\picviz\images\people.png")]
+        self.paths=["app/picviz/images/people.png","app/picviz/images/people.png"]
         self.colors = colors
 
 
@@ -80,7 +92,13 @@ class PieChartYs:
         # Use a loop to iterate over self.vars and create a list of dataframes
         dfs = []
         for sublist in self.vars:
-            df = pd.DataFrame(self.df[sublist].sum()).reset_index().rename(columns={'index':'group',0:'sum'})
+            if self.dataset is not None:
+                sums = self.dataset.grand_totals[sublist]
+            elif isinstance(self.df, AggregateCube):
+                sums = self.df.totals(sublist)
+            else:
+                sums = self.df[sublist].sum()
+            df = pd.DataFrame(sums).reset_index().rename(columns={'index':'group',0:'sum'})
             df['group'] = self.legend_labels
             df = self.remove_zero_rows(df)
             dfs.append(df)
@@ -158,9 +176,8 @@ class PieChartYs:
         Y = [1.15, 1.15]
         images= []
         for x, y, path in zip(X, Y, self.paths):
-                image = Image.open(path)
                 image_obj = go.layout.Image(
-                source=image,
+                source=ASSETS.data_uri(path, max_size=self.IMAGE_SIZE),
                 xref="paper", yref="paper",
                 x=x, y=y,
                 sizex=0.1, sizey=0.1,
@@ -252,28 +269,43 @@ class PieChartYs:
         - colors (list): A list of color values for the pie charts. Default is ['#088395','#E55604','#053B50'].
         - save_plot (bool): Whether to save the plot as an HTML file. Default is True.
         """
+        fig = self.build_figure()
+        if save_plot and save_filename is not None:
+            py.plot(fig, filename=save_filename)
+        fig.show()
+
+    def cache_slice(self):
+        """
+        Return the aggregated data the chart draws, as hashed by RenderCache.
+        """
+        return self.preprocess_data()
+
+    def build_figure(self):
+        """
+        Build the pie chart figure without showing or saving it.
+
+        Returns:
+        - go.Figure: The plotly figure.
+        """
         dfs, totals, row_totals = self.preprocess_data()
         df1,df2 = dfs
         total1,total2 = totals 
         df1row1,df1row2,df2row1,df2row2 = row_totals 
         chart1, chart2 = self.create_charts(df1,df2)
         fig = self.create_subplot(chart1, chart2)
-        fig = self.update_layout(fig, total1, total2,df1row1,df1row2, df2row1, df2row2)
-        if save_plot and save_filename is not None:
-            py.plot(fig, filename=save_filename)
-        fig.show()
+        return self.update_layout(fig, total1, total2,df1row1,df1row2, df2row1, df2row2)
         
         
         
 
          
-class PieChartMs:
+class PieChartMs(Renderable):
     def __init__(self, df, choice:Choice, title:str = None, colors : List[str]=['#088395','#E55604','#053B50']):
         """
         Initialize the class with the given parameters.
 
         Args:
-            df (pd.DataFrame): The pandas DataFrame containing the data.
+            df (pd.DataFrame, AggregateCube or Dataset): The data, raw or pre-aggregated.
             choice (Choice): The choice value indicating whether to consider 'Injuries' or 'Fatalities'.
             save_filename_without_extension (str, optional): The filename without extension to save the data. Defaults to None.
 
@@ -282,15 +314,22 @@ class PieChartMs:
             ValueError: If df is empty or if it doesn't contain the necessary columns based on the choice value.
             TypeError: If save_filename_without_extension is not a string or None.
         """
-        if not isinstance(df, pd.DataFrame):
-            raise TypeError("df must be a pandas DataFrame")
+        df = as_cube(df) or df
+        if not isinstance(df, (pd.DataFrame, AggregateCube)):
+            raise TypeError("df must be a pandas DataFrame or an AggregateCube")
         if not isinstance(choice, Choice):
             raise TypeError("Invalid choice value. Allowed values are 'Injuries' and 'Fatalities'.")
-        if df.empty:
-            raise ValueError("df cannot be empty")
-        if choice == Choice.Injuries and not all(col in df.columns for col in ["Palestinians Injuries", "Israelis Injuries"]):
+        if isinstance(df, AggregateCube):
+            if not len(df.years):
+                raise ValueError("df cannot be empty")
+            columns = df.measures
+        else:
+            if df.empty:
+                raise ValueError("df cannot be empty")
+            columns = df.columns
+        if choice == Choice.Injuries and not all(col in columns for col in ["Palestinians Injuries", "Israelis Injuries"]):
             raise ValueError("Missing necessary columns for choice 'Injuries'")
-        if choice == Choice.Fatalities and not all(col in df.columns for col in ["Palestinians Fatalities", "Israelis Fatalities"]):
+        if choice == Choice.Fatalities and not all(col in columns for col in ["Palestinians Fatalities", "Israelis Fatalities"]):
             raise ValueError("Missing necessary columns for choice 'Fatalities'")
         self.df = df
         self.choice = choice
@@ -305,7 +344,10 @@ class PieChartMs:
             "Fatalities": ["Palestinians Fatalities", "Israelis Fatalities"]
         }
         cols = columns_mapping[self.choice.value]
-        df = self.df.groupby(["Year"])[cols].sum().sort_index(ascending=True)
+        if isinstance(self.df, AggregateCube):
+            df = self.df.by_year(cols)
+        else:
+            df = self.df.groupby(["Year"])[cols].sum().sort_index(ascending=True)
         df = self.remove_zero_rows(df)
         df = df.reset_index()
         return df, cols
@@ -486,14 +528,26 @@ class PieChartMs:
         """
         Orchestrates the tasks of preprocessing data, creating charts, creating subplots, updating layout, and showing the figure.
         """
-        df, cols = self.preprocess_data()
-        charts = self.create_charts(df, cols)
-        subplot = self.create_subplot(charts)
-        layout = self.update_layout(fig = subplot)
+        layout = self.build_figure()
         if save_plot and save_filename is not None:
             py.plot(layout, filename=save_filename)
         self.show_figure(layout)
 
+    def cache_slice(self):
+        """
+        Returns the aggregated data the chart draws, as hashed by RenderCache.
+        """
+        return self.preprocess_data()
+
+    def build_figure(self):
+        """
+        Builds the pie chart figure without showing or saving it.
+        """
+        df, cols = self.preprocess_data()
+        charts = self.create_charts(df, cols)
+        subplot = self.create_subplot(charts)
+        return self.update_layout(fig = subplot)
+
  
     def show_figure(self, fig):
         """
@@ -502,105 +556,392 @@ class PieChartMs:
         fig.show()
         
         
-def pie_chart_mf(data, Project_Path=None):
+PIE_COLORS = ['#92C7CF','#AAD7D9','#FBF9F1','#E5E1DA','#DBA979','#ECCA9C','#E8EFCF','#AFD198',
+              '#FF407D','#FFCAD4','#FEC7B4','#FC819E','#FFCF96','#F6FDC3','#CDFAD5','#F2AFEF','#C499F3']
+PIE_FEATURES = ["Palestinians Fatalities","Israelis Fatalities","Palestinians Injuries","Israelis Injuries"]
+SEASON_MAP = {
+    'JANUARY': 'Winter', 'FEBRUARY': 'Winter', 'MARCH': 'Spring', 'APRIL': 'Spring',
+    'MAY': 'Spring', 'JUNE': 'Summer', 'JULY': 'Summer', 'AUGUST': 'Summer',
+    'SEPTEMBER': 'Autumn', 'OCTOBER': 'Autumn', 'NOVEMBER': 'Autumn', 'DECEMBER': 'Winter'
+}
+
+
+class PieSkeleton:
     """
-    Create a pie chart based on the given data.
+    A class used to draw many variants of the month / season pie chart on one figure.
+
+    The figure, the wedges with their shadows and labels, the centre circle and
+    the title are built once with the first values. `update` then only moves and
+    recolours the wedges and rewrites the labels and the title, so a variant
+    costs a redraw instead of a new figure with freshly laid out text.
+
+    Methods
+    -------
+    update(values, colors, title): Draws a variant in place and returns the figure.
+    """
+
+    def __init__(self, labels, labeldistance, ax=None):
+        """
+        Initialize the PieSkeleton object.
+
+        Parameters:
+        - labels: The wedge labels (months or seasons); every variant has one value per label.
+        - labeldistance: The radial position of the labels.
+        - ax: An equal-aspect axes to draw into, e.g. a panel of a multi-panel figure;
+          the title then becomes the axes title. Defaults to a new 6x6 figure.
+        """
+        self.labels = list(labels)
+        self.labeldistance = labeldistance
+        self.ax = ax
+        self.fig = None if ax is None else ax.figure
+        self.wedges = None
+
+    def _build(self, values, colors, title):
+        if self.ax is None:
+            self.fig, ax = plt.subplots(figsize=(6, 6), subplot_kw=dict(aspect='equal'))
+            self.fig.subplots_adjust(left=0.1, right=0.9, bottom=0.1, top=0.95)
+        else:
+            ax = self.ax
+        wedge_properties = {'linewidth': 1, 'edgecolor': 'white'}
+        self.wedges, self.label_texts, self.pct_texts = ax.pie(
+            values, labels=self.labels, colors=colors, autopct=make_autopct(values),
+            labeldistance=self.labeldistance, pctdistance=1.15, shadow=True, counterclock=True,
+            wedgeprops=wedge_properties, rotatelabels=True, textprops={'fontsize': 7})
+        self.shadows = {p.patch: p for p in ax.patches if isinstance(p, Shadow)}
+        center_circle = plt.Circle((0, 0), 0.5, fc='white')
+        ax.add_artist(center_circle)
+        self.title = self.fig.suptitle(title) if self.ax is None else ax.set_title(title, fontsize=10, pad=18)
+
+    @staticmethod
+    def _place(text, theta, distance, rotate):
+        # Labels sit on the bisector of their wedge; rotated ones read outwards
+        x, y = distance * np.cos(theta), distance * np.sin(theta)
+        text.set_position((x, y))
+        if rotate:
+            text.set_rotation(np.rad2deg(theta) + (0 if x > 0 else 180))
+            text.set_horizontalalignment('left' if x > 0 else 'right')
+            text.set_verticalalignment('bottom' if y > 0 else 'top')
+
+    def update(self, values, colors, title):
+        """
+        Draw a variant: the first call builds the figure, later calls update it in place.
+
+        Parameters:
+        - values: One non-negative value per label.
+        - colors: The wedge colours, cycled as by `Axes.pie`.
+        - title: The figure title.
+
+        Returns:
+        Figure: The matplotlib figure, valid until the next update.
+        """
+        values = np.asarray(values, dtype=float)
+        if self.wedges is None:
+            self._build(values, colors, title)
+            return self.fig
+        autopct = make_autopct(values)
+        fracs = values / values.sum()
+        bounds = np.concatenate([[0.], np.cumsum(fracs)])
+        for i, (wedge, color) in enumerate(zip(self.wedges, itertools.cycle(colors))):
+            wedge.set_theta1(360. * bounds[i])
+            wedge.set_theta2(360. * bounds[i + 1])
+            wedge.set_facecolor(color)
+            shadow = self.shadows.get(wedge)
+            if shadow is not None:
+                # a new Shadow darkens the new colour the way Axes.pie did the first one
+                shade = Shadow(wedge, 0, 0).get_facecolor()
+                shadow.set_facecolor(shade)
+                shadow.set_edgecolor(shade)
+            theta = np.deg2rad(0.5 * (wedge.theta1 + wedge.theta2))
+            self._place(self.label_texts[i], theta, self.labeldistance, True)
+            self._place(self.pct_texts[i], theta, 1.15, False)
+            self.pct_texts[i].set_text(autopct(100. * fracs[i]))
+        self.title.set_text(title)
+        return self.fig
+
+
+def pie_palette(categories, feature, seed=None):
+    """
+    Return the wedge colours of a pie: a contiguous slice of `PIE_COLORS`, one colour per category.
+
+    The slice is derived from the feature name (or from seed), never from the
+    process state, so every category keeps its colour across calls and runs and
+    identical data renders to identical bytes.
 
     Parameters:
-    - data: The input data.
-    - colors: The colors for the pie chart.
-    - key: The key for grouping the data (optional).
-    - savefilename: The filename to save the chart as an image file (optional).
+    - categories: The wedge labels, in drawing order.
+    - feature: The plotted feature; different features get different slices.
+    - seed: An integer mixed into the choice of the slices, to try other palettes (optional).
 
     Returns:
-    None
+    dict: The colour of every category.
     """
-    csv_features = ["Palestinians Fatalities","Israelis Fatalities","Palestinians Injuries","Israelis Injuries"]
-    monthly_data = data.drop('Year', axis=1).groupby('Month').sum().sort_index(ascending=False)
-    monthly_data = reset_months(monthly_data)
-    
-   
-    colors = ['#92C7CF','#AAD7D9','#FBF9F1','#E5E1DA','#DBA979','#ECCA9C','#E8EFCF','#AFD198',
-            '#FF407D','#FFCAD4','#FEC7B4','#FC819E','#FFCF96','#F6FDC3','#CDFAD5','#F2AFEF','#C499F3']
-    for feature in csv_features:
-        values = monthly_data[feature].values
-        
-        i = random.randint(12, 18)
-        j = i - 12
-        
-        fig, ax = plt.subplots(figsize=(6, 6), subplot_kw=dict(aspect='equal'))
-        wedge_properties = {'linewidth': 1, 'edgecolor': 'white'}
-        ax.pie(values, labels=monthly_data.index, colors=colors[j:i], autopct=make_autopct(values), labeldistance=0.8, pctdistance=1.15, shadow=True,
-            counterclock=True, wedgeprops=wedge_properties, rotatelabels=True,
-            textprops={'fontsize': 7})
+    categories = list(categories)
+    choices = len(PIE_COLORS) - len(categories) + 1
+    key = f"{feature}:{seed}" if seed is not None else feature
+    start = int(hashlib.sha1(key.encode("utf-8")).hexdigest(), 16) % max(choices, 1)
+    return {category: PIE_COLORS[(start + k) % len(PIE_COLORS)] for k, category in enumerate(categories)}
 
-        plt.subplots_adjust(left=0.1, right=0.9, bottom=0.1, top=0.95)
-        center_circle = plt.Circle((0, 0), 0.5, fc='white')
-        fig.gca().add_artist(center_circle)
-        fig.suptitle(f'{feature} per Months (2000- April 2024)')
 
-        # Save the chart as an image file
-        if Project_Path is not None:
-            savefilename = Project_Path+f'\outputs\{feature.replace(" ", "_")}_per_months.png'
-            plt.savefig(savefilename, bbox_inches='tight')
+def _pie_colors(categories, feature, seed=None):
+    return list(pie_palette(categories, feature, seed).values())
 
-        plt.show()
-    
-def pie_chart_sf(data, Project_Path=None):
+
+def monthly_pie_data(data):
     """
-    Create a pie chart based on the given data.
+    Return the per-month totals of the pie features, indexed by month abbreviation.
 
     Parameters:
-    - data: The input data.
-    - feature: The feature to be plotted.
-    - colors: The colors for the pie chart.
-    - key: The key for grouping the data (optional).
-    - savefilename: The filename to save the chart as an image file (optional).
+    - data: The input data (DataFrame, AggregateCube or Dataset).
+    """
+    if isinstance(data, Dataset):
+        # Kept up to date by Dataset.append
+        return reset_months(data.month_totals[PIE_FEATURES])
+    data = as_cube(data) or data
+    if isinstance(data, AggregateCube):
+        monthly_data = data.by_month(PIE_FEATURES)
+    else:
+        monthly_data = data.drop('Year', axis=1).groupby('Month').sum().sort_index(ascending=False)
+    return reset_months(monthly_data)
+
+
+def seasonal_pie_data(data):
+    """
+    Return the per-season totals of the pie features.
+
+    Parameters:
+    - data: The input data (DataFrame, AggregateCube or Dataset).
+    """
+    data = as_cube(data) or data
+    if isinstance(data, AggregateCube):
+        return data.by_season(PIE_FEATURES, SEASON_MAP).sort_index(ascending=False)
+    # Derive a 'Season' column in a view; the caller's DataFrame is left untouched
+    copier = DataFrameCopier(data).derive('Season', lambda df: df['Month'].map(SEASON_MAP))
+    columns = ['Year', 'Season', 'Month', *PIE_FEATURES]
+    data = copier.view(columns)
+    return data.drop(['Year','Month'], axis=1).groupby('Season').sum().sort_index(ascending=False)
+
+
+def pie_variants_mf(data, seed=None):
+    """
+    Yield the per-month pie chart of every feature, drawn on one reused figure.
+
+    Parameters:
+    - data: The input data (DataFrame, AggregateCube or Dataset).
+
+    - seed: The palette seed, see `pie_palette` (optional).
+
+    Yields:
+    tuple: (feature, figure). The figure is the same object for every feature and
+        is updated in place: save or serialise it before advancing.
+    """
+    monthly_data = monthly_pie_data(data)
+    skeleton = PieSkeleton(monthly_data.index, labeldistance=0.8)
+    for feature in PIE_FEATURES:
+        colors = _pie_colors(monthly_data.index, feature, seed)
+        yield feature, skeleton.update(monthly_data[feature].values, colors, f'{feature} per Months (2000- April 2024)')
+
+
+def pie_variants_sf(data, seed=None):
+    """
+    Yield the per-season pie chart of every feature, drawn on one reused figure.
+
+    Parameters:
+    - data: The input data (DataFrame, AggregateCube or Dataset).
+
+    - seed: The palette seed, see `pie_palette` (optional).
+
+    Yields:
+    tuple: (feature, figure). The figure is the same object for every feature and
+        is updated in place: save or serialise it before advancing.
+    """
+    seasonly_data = seasonal_pie_data(data)
+    skeleton = PieSkeleton(seasonly_data.index, labeldistance=0.6)
+    for feature in PIE_FEATURES:
+        colors = _pie_colors(seasonly_data.index, feature, seed)
+        yield feature, skeleton.update(seasonly_data[feature].values, colors, f'{feature} per seasons (2000- April 2024)')
+
+
+def pie_panels(table, labeldistance, title, seed=None):
+    """
+    Draw the pie of every feature of a table as one panel of a single 2x2 figure.
+
+    Parameters:
+    - table: The per-category totals, one column per feature.
+    - labeldistance: The radial position of the labels.
+    - title: The figure title.
+    - seed: The palette seed, see `pie_palette` (optional).
 
     Returns:
-    None
+    Figure: The matplotlib figure.
     """
-    
+    fig, axes = plt.subplots(2, 2, figsize=(12, 12), subplot_kw=dict(aspect='equal'))
+    fig.subplots_adjust(left=0.05, right=0.95, bottom=0.05, top=0.9, wspace=0.3, hspace=0.3)
+    for ax, feature in zip(axes.flat, PIE_FEATURES):
+        PieSkeleton(table.index, labeldistance, ax=ax).update(
+            table[feature].values, _pie_colors(table.index, feature, seed), feature)
+    fig.suptitle(title, fontsize=14)
+    return fig
 
-    # Create a pie chart
-    csv_features = ["Palestinians Fatalities","Israelis Fatalities","Palestinians Injuries","Israelis Injuries"]
-    season_map = {
-        'JANUARY': 'Winter', 'FEBRUARY': 'Winter', 'MARCH': 'Spring', 'APRIL': 'Spring',
-        'MAY': 'Spring', 'JUNE': 'Summer', 'JULY': 'Summer', 'AUGUST': 'Summer',
-        'SEPTEMBER': 'Autumn', 'OCTOBER': 'Autumn', 'NOVEMBER': 'Autumn', 'DECEMBER': 'Winter'
-    }
-    
-    # Add a 'Season' column to the DataFrame
-    data['Season'] = data['Month'].map(season_map)
-    columns = ['Year', 'Season', 'Month', "Palestinians Fatalities","Israelis Fatalities","Palestinians Injuries","Israelis Injuries"]
-    data = data[columns]
-    seasonly_data = data.drop(['Year','Month'], axis=1).groupby('Season').sum().sort_index(ascending=False)
-   
-    colors = ['#92C7CF','#AAD7D9','#FBF9F1','#E5E1DA','#DBA979','#ECCA9C','#E8EFCF','#AFD198',
-            '#FF407D','#FFCAD4','#FEC7B4','#FC819E','#FFCF96','#F6FDC3','#CDFAD5','#F2AFEF','#C499F3']
-    for feature in csv_features:
-        values = seasonly_data[feature].values
-        i = random.randint(4, 13)
-        j = i - 4
-        
-        fig, ax = plt.subplots(figsize=(6, 6), subplot_kw=dict(aspect='equal'))
-        wedge_properties = {'linewidth': 1, 'edgecolor': 'white'}
-        ax.pie(values, labels=seasonly_data.index, colors=colors[j:i], autopct=make_autopct(values), labeldistance=0.6, pctdistance=1.15, shadow=True,
-            counterclock=True, wedgeprops=wedge_properties, rotatelabels=True,
-            textprops={'fontsize': 7})
 
-        plt.subplots_adjust(left=0.1, right=0.9, bottom=0.1, top=0.95)
-        center_circle = plt.Circle((0, 0), 0.5, fc='white')
-        fig.gca().add_artist(center_circle)
-        fig.suptitle(f'{feature} per seasons (2000- April 2024)')
+def pie_panel_mf(data, seed=None):
+    """
+    Build the per-month pies of all four features as one multi-panel figure.
+
+    Parameters:
+    - data: The input data (DataFrame, AggregateCube or Dataset).
+    - seed: The palette seed, see `pie_palette` (optional).
+
+    Returns:
+    Figure: The matplotlib figure.
+    """
+    return pie_panels(monthly_pie_data(data), 0.8, 'Casualties per Months (2000- April 2024)', seed)
+
+
+def pie_panel_sf(data, seed=None):
+    """
+    Build the per-season pies of all four features as one multi-panel figure.
+
+    Parameters:
+    - data: The input data (DataFrame, AggregateCube or Dataset).
+    - seed: The palette seed, see `pie_palette` (optional).
+
+    Returns:
+    Figure: The matplotlib figure.
+    """
+    return pie_panels(seasonal_pie_data(data), 0.6, 'Casualties per seasons (2000- April 2024)', seed)
+
+
+def iter_pie_figures_mf(data, seed=None):
+    """
+    Yield the per-month pie chart of every feature, building each figure only when it is reached.
+
+    Parameters:
+    - data: The input data (DataFrame, AggregateCube or Dataset).
+
+    - seed: The palette seed, see `pie_palette` (optional).
+
+    Yields:
+    tuple: (feature, figure), a new matplotlib figure for every feature.
+    """
+    monthly_data = monthly_pie_data(data)
+    for feature in PIE_FEATURES:
+        yield feature, PieSkeleton(monthly_data.index, labeldistance=0.8).update(
+            monthly_data[feature].values, _pie_colors(monthly_data.index, feature, seed),
+            f'{feature} per Months (2000- April 2024)')
+
+
+def pie_figures_mf(data, seed=None):
+    """
+    Build the per-month pie chart of every feature without showing or saving them.
+
+    Parameters:
+    - data: The input data (DataFrame, AggregateCube or Dataset).
+
+    - seed: The palette seed, see `pie_palette` (optional).
+
+    Returns:
+    dict: The matplotlib figure of every feature, by feature name.
+    """
+    return dict(iter_pie_figures_mf(data, seed))
 
+
+def pie_chart_mf(data, Project_Path=None, reuse=False, single_figure=False, seed=None):
+    """
+    Create a pie chart based on the given data.
+
+    Parameters:
+    - data: The input data (DataFrame, AggregateCube or Dataset).
+    - Project_Path: The project directory; the charts are saved to its outputs folder (optional).
+    - reuse: Draw every feature on one reused figure and only save them, without
+      opening windows (default: False).
+    - single_figure: Draw the four features as panels of one figure, saved once as
+      per_months.png (default: False).
+    - seed: The palette seed, see `pie_palette` (optional).
+
+    Returns:
+    None
+    """
+    if single_figure:
+        fig = pie_panel_mf(data, seed)
+        if Project_Path is not None:
+            fig.savefig(Path(Project_Path) / 'outputs' / 'per_months.png', bbox_inches='tight')
+        plt.show()
+        return
+    # Built one at a time, so each window is shown before the next figure exists
+    figures = pie_variants_mf(data, seed) if reuse else iter_pie_figures_mf(data, seed)
+    for feature, fig in figures:
         # Save the chart as an image file
         if Project_Path is not None:
-            savefilename = Project_Path+f'\outputs\{feature.replace(" ", "_")}_per_seasons.png'
-            plt.savefig(savefilename, bbox_inches='tight')
+            savefilename = Path(Project_Path) / 'outputs' / f'{feature.replace(" ", "_")}_per_months.png'
+            fig.savefig(savefilename, bbox_inches='tight')
 
-        plt.show()
+        if not reuse:
+            plt.show()
+
+
+def iter_pie_figures_sf(data, seed=None):
+    """
+    Yield the per-season pie chart of every feature, building each figure only when it is reached.
+
+    Parameters:
+    - data: The input data (DataFrame, AggregateCube or Dataset).
+
+    - seed: The palette seed, see `pie_palette` (optional).
 
+    Yields:
+    tuple: (feature, figure), a new matplotlib figure for every feature.
+    """
+    seasonly_data = seasonal_pie_data(data)
+    for feature in PIE_FEATURES:
+        yield feature, PieSkeleton(seasonly_data.index, labeldistance=0.6).update(
+            seasonly_data[feature].values, _pie_colors(seasonly_data.index, feature, seed),
+            f'{feature} per seasons (2000- April 2024)')
 
 
-   
\ No newline at end of file
+def pie_figures_sf(data, seed=None):
+    """
+    Build the per-season pie chart of every feature without showing or saving them.
+
+    Parameters:
+    - data: The input data (DataFrame, AggregateCube or Dataset).
+
+    - seed: The palette seed, see `pie_palette` (optional).
+
+    Returns:
+    dict: The matplotlib figure of every feature, by feature name.
+    """
+    return dict(iter_pie_figures_sf(data, seed))
+
+
+def pie_chart_sf(data, Project_Path=None, reuse=False, single_figure=False, seed=None):
+    """
+    Create a pie chart based on the given data.
+
+    Parameters:
+    - data: The input data (DataFrame, AggregateCube or Dataset).
+    - Project_Path: The project directory; the charts are saved to its outputs folder (optional).
+    - reuse: Draw every feature on one reused figure and only save them, without
+      opening windows (default: False).
+    - single_figure: Draw the four features as panels of one figure, saved once as
+      per_seasons.png (default: False).
+    - seed: The palette seed, see `pie_palette` (optional).
+
+    Returns:
+    None
+    """
+    if single_figure:
+        fig = pie_panel_sf(data, seed)
+        if Project_Path is not None:
+            fig.savefig(Path(Project_Path) / 'outputs' / 'per_seasons.png', bbox_inches='tight')
+        plt.show()
+        return
+    # Built one at a time, so each window is shown before the next figure exists
+    figures = pie_variants_sf(data, seed) if reuse else iter_pie_figures_sf(data, seed)
+    for feature, fig in figures:
+        # Save the chart as an image file
+        if Project_Path is not None:
+            savefilename = Path(Project_Path) / 'outputs' / f'{feature.replace(" ", "_")}_per_seasons.png'
+            fig.savefig(savefilename, bbox_inches='tight')
+
+        if not reuse:
+            plt.show()
@@ -0,0 +1,314 @@
+import threading
+from functools import partial
+
+import numpy as np
+from bokeh.layouts import column, row
+from bokeh.models import CDSView, ColumnDataSource, IndexFilter, RadioButtonGroup, RangeSlider, Select
+from bokeh.palettes import Cividis256
+from bokeh.plotting import figure
+
+from ..utils.data import as_frame
+from ..utils.dataset import Dataset
+from .bars import StackBar
+
+MEASURES = ["Fatalities", "Injuries"]
+
+
+def cell_patches(old, new):
+    """
+    Return the `ColumnDataSource.patch` entries that turn one column into another.
+
+    Parameters:
+    old (list): The current values of the column.
+    new (list): The new values, of the same length.
+
+    Returns:
+    list: A single (slice, values) entry when every value changed, otherwise
+        one (index, value) entry per changed value; empty if nothing changed.
+    """
+    old, new = np.asarray(old), np.asarray(new)
+    changed = np.flatnonzero(old != new)
+    if len(changed) == len(new) and len(new):
+        return [(slice(0, len(new)), new.tolist())]
+    return [(int(i), new[i].item()) for i in changed]
+
+
+class StackBarSession:
+    """
+    A class used to hold the live StackBar document of one Bokeh server session.
+
+    The figure, its ColumnDataSource and the widgets are built once, when the
+    session opens. Afterwards nothing is rebuilt: switching the group or between
+    Fatalities and Injuries patches the changed cells of the source, the year
+    range only changes the indices of a CDSView filter and the x range factors,
+    and newly appended months are streamed (new years) or patched (existing
+    years) into the source. Only these deltas are sent to the browser.
+
+    Methods
+    -------
+    set_variable(variable): Shows another measure by patching the source.
+    set_years(low, high): Shows the years in [low, high] by updating the view filter.
+    sync(): Brings the source up to date with the data of the app.
+    """
+
+    def __init__(self, app, doc):
+        """
+        Initialize the StackBarSession object and add its layout to the document.
+
+        Parameters:
+        app (StackBarApp): The app serving the session.
+        doc (Document): The Bokeh document of the session.
+        """
+        self.app = app
+        self.doc = doc
+        self.variable = app.variable
+        table = app.table(self.variable)
+        self.years = [str(y) for y in table.index]
+        self.year_range = (int(table.index.min()), int(table.index.max()))
+
+        self.chart = StackBar(app.dataset, self.variable)
+        self.months = list(table.columns)
+        self.source = ColumnDataSource(data=self.chart._create_data_dict(table))
+        self.filter = IndexFilter(indices=self._visible(table))
+        visible = [self.years[i] for i in self.filter.indices]
+        self.figure = figure(x_range=visible, height=app.height, width=app.width,
+                             toolbar_location="right", tools="save,hover,pan,lasso_select,box_select",
+                             active_drag="lasso_select", tooltips="$name @months: @$name")
+        self.chart.draw_chart(self.figure, self.months, self.source, self._max_value(table), app.colors,
+                              theme=app.theme, view=CDSView(filter=self.filter))
+        doc.theme = app.theme
+
+        group, measure = self.variable.rsplit(" ", 1)
+        self.group_select = Select(title="Group", value=group, options=app.groups)
+        self.measure_buttons = RadioButtonGroup(labels=MEASURES, active=MEASURES.index(measure))
+        self.year_slider = RangeSlider(title="Years", start=self.year_range[0], end=self.year_range[1],
+                                       value=self.year_range, step=1)
+        self.group_select.on_change("value", self._on_variable)
+        self.measure_buttons.on_change("active", self._on_variable)
+        self.year_slider.on_change("value_throttled", self._on_years)
+
+        doc.title = "picviz StackBar"
+        doc.add_root(column(row(self.group_select, self.measure_buttons, self.year_slider), self.figure))
+
+    def _table(self):
+        return self.app.table(self.variable).rename(index=str).reindex(self.years, fill_value=0)
+
+    def _visible(self, table):
+        years = table.index.astype(int)
+        totals = table.to_numpy().sum(axis=1)
+        # Years without any count are hidden, as StackBar.remove_zero_rows does
+        mask = (years >= self.year_range[0]) & (years <= self.year_range[1]) & (totals > 0)
+        return np.flatnonzero(mask).tolist()
+
+    @staticmethod
+    def _max_value(table):
+        totals = table.to_numpy().sum(axis=1)
+        return int(totals.max()) if len(totals) else 0
+
+    def _refresh(self, table):
+        indices = self._visible(table)
+        if indices != list(self.filter.indices):
+            self.filter.indices = indices
+        visible = [self.years[i] for i in sorted(indices, key=lambda i: int(self.years[i]))]
+        if visible != list(self.figure.x_range.factors):
+            self.figure.x_range.factors = visible
+        max_value = self._max_value(table.iloc[indices])
+        self.figure.y_range.end = max_value + max_value // 8
+
+    def _patch(self, table):
+        patches = {}
+        for month in self.months:
+            entries = cell_patches(self.source.data[month], table[month].tolist())
+            if entries:
+                patches[month] = entries
+        if patches:
+            self.source.patch(patches)
+
+    def _on_variable(self, attr, old, new):
+        self.set_variable(f"{self.group_select.value} {MEASURES[self.measure_buttons.active]}")
+
+    def _on_years(self, attr, old, new):
+        self.set_years(*new)
+
+    def set_variable(self, variable):
+        """
+        Show another measure in the existing figure.
+
+        Parameters:
+        variable (str): The measure, e.g. 'Israelis Injuries'.
+
+        Raises:
+        ValueError: If the data has no such measure.
+        """
+        if variable not in self.app.dataset.measures:
+            raise ValueError(f"Invalid column name: {variable}")
+        self.variable = variable
+        self.chart.var = variable
+        self.chart.title = f"{variable} per Year/Month"
+        table = self._table()
+        self._patch(table)
+        self._refresh(table)
+        self.figure.title.text = self.chart.title
+        self.figure.yaxis.axis_label = variable.rsplit(" ", 1)[1]
+
+    def set_years(self, low, high):
+        """
+        Show only the years in [low, high].
+
+        Parameters:
+        low (int): The first year shown.
+        high (int): The last year shown.
+        """
+        self.year_range = (int(round(low)), int(round(high)))
+        self._refresh(self._table())
+
+    def sync(self):
+        """
+        Bring the source up to date with the data of the app.
+
+        Years the session has not seen yet are streamed as new rows; changed
+        months of known years are patched in place.
+        """
+        table = self.app.table(self.variable).rename(index=str)
+        new_years = [y for y in table.index if y not in set(self.years)]
+        known = table.reindex(self.years, fill_value=0)
+        self._patch(known)
+        if new_years:
+            self.source.stream(self.chart._create_data_dict(table.loc[new_years]))
+            self.years += new_years
+            first, last = int(table.index.astype(int).min()), int(table.index.astype(int).max())
+            following = self.year_range[1] >= self.year_slider.end
+            self.year_slider.update(start=min(first, self.year_slider.start), end=max(last, self.year_slider.end))
+            if following and last > self.year_range[1]:
+                # A slider left at the newest year follows the data
+                self.year_range = (self.year_range[0], last)
+                self.year_slider.value = self.year_range
+        self._refresh(self._table())
+
+
+class StackBarApp:
+    """
+    A class used to serve the StackBar chart as a Bokeh server application.
+
+    Every browser session gets one `StackBarSession`: its document and figure
+    are built once and then updated in place through `ColumnDataSource.patch`
+    and `ColumnDataSource.stream`, from the filter widgets and from `append`,
+    instead of building a new source and figure as `StackBar.show_plot` does.
+
+    Methods
+    -------
+    table(variable): Returns the Year x Month table of a measure.
+    make_document(doc): Builds the session of a new document; the Bokeh application handler.
+    append(new_rows): Adds newly published months and pushes them to every open session.
+    serve(port=5006, show=False, block=True, **server_kwargs): Starts the Bokeh server.
+    """
+
+    def __init__(self, data, variable="Palestinians Fatalities", height=500, width=1100, color_palette=None,
+                 theme='contrast'):
+        """
+        Initialize the StackBarApp object.
+
+        Parameters:
+        data (DataFrame or Dataset): The monthly rows, with `Year`, `Month` and measure columns.
+        variable (str): The measure shown when a session opens. Default is 'Palestinians Fatalities'.
+        height (int): The height of the figure. Default is 500.
+        width (int): The width of the figure. Default is 1100.
+        color_palette (list): The color palette of the months. Default is None.
+        theme (str): The Bokeh theme of the documents. Default is 'contrast'.
+
+        Raises:
+        ValueError: If the data has no such measure.
+        """
+        self.dataset = data if isinstance(data, Dataset) else Dataset(as_frame(data))
+        if variable not in self.dataset.measures:
+            raise ValueError(f"Invalid column name: {variable}")
+        self.variable = variable
+        self.groups = sorted({m.rsplit(" ", 1)[0] for m in self.dataset.measures
+                              if m.rsplit(" ", 1)[-1] in MEASURES})
+        self.height = height
+        self.width = width
+        self.colors = Cividis256[::21][0:12] if color_palette is None else color_palette[0:12]
+        self.theme = theme
+        self.chart = StackBar(self.dataset, variable)
+        self.sessions = set()
+        self._lock = threading.Lock()
+
+    def table(self, variable):
+        """
+        Return the Year x Month table of a measure, including years without any count.
+
+        Parameters:
+        variable (str): The measure.
+
+        Returns:
+        DataFrame: Indexed by Year with one column per month (Jan..Dec).
+        """
+        with self._lock:
+            table = self.dataset.cube.year_month(variable)
+        return self.chart.reindex_columns(table)
+
+    def make_document(self, doc):
+        """
+        Build the StackBar session of a newly opened document.
+
+        Parameters:
+        doc (Document): The Bokeh document of the session.
+
+        Returns:
+        StackBarSession: The session.
+        """
+        session = StackBarSession(self, doc)
+        with self._lock:
+            self.sessions.add(session)
+        doc.on_session_destroyed(lambda context: self._close(session))
+        return session
+
+    def _close(self, session):
+        with self._lock:
+            self.sessions.discard(session)
+
+    def append(self, new_rows):
+        """
+        Add newly published months to the data and push them to every open session.
+
+        The sessions are updated on their own event loop ticks, so append may be
+        called from any thread.
+
+        Parameters:
+        new_rows (DataFrame): The rows to add, with the columns of the data.
+
+        Returns:
+        AppendReport: What changed.
+        """
+        with self._lock:
+            report = self.dataset.append(new_rows)
+            sessions = list(self.sessions)
+        if report:
+            for session in sessions:
+                session.doc.add_next_tick_callback(partial(session.sync))
+        return report
+
+    def serve(self, port=5006, show=False, block=True, **server_kwargs):
+        """
+        Start a Bokeh server with the app at '/stackbar'.
+
+        Parameters:
+        port (int): The port to listen on. Default is 5006.
+        show (bool): Whether to open the app in a browser. Default is False.
+        block (bool): Whether to run the server until interrupted. Default is True.
+        **server_kwargs: Further keyword arguments of `bokeh.server.server.Server`,
+            e.g. `allow_websocket_origin`.
+
+        Returns:
+        Server: The started server.
+        """
+        from bokeh.server.server import Server
+
+        server = Server({"/stackbar": self.make_document}, port=port, **server_kwargs)
+        server.start()
+        if show:
+            server.io_loop.add_callback(server.show, "/stackbar")
+        if block:
+            server.io_loop.start()
+        return server
+
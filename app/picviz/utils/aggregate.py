@@ -0,0 +1,346 @@
+import numpy as np
+import pandas as pd
+
+from .data import MONTHS
+
+
+def month_codes(months):
+    """
+    Return the 0-based calendar position of each month name.
+
+    Parameters:
+    months (Series): Month names (e.g. 'JANUARY') or an ordered Month categorical.
+
+    Returns:
+    ndarray: The month codes as int64.
+
+    Raises:
+    ValueError: If a month name is unknown or missing.
+    """
+    if isinstance(months.dtype, pd.CategoricalDtype) and list(months.cat.categories) == MONTHS:
+        codes = months.cat.codes.to_numpy()
+    else:
+        codes = pd.Categorical(months.astype(str).str.strip().str.upper(), categories=MONTHS).codes
+    if (codes < 0).any():
+        raise ValueError("Month column contains unknown or missing month names.")
+    return codes.astype(np.int64)
+
+
+class StreamAggregator:
+    """
+    A class used to fold chunks of rows into Year x Month x measure totals.
+
+    Only the dense totals array is kept in memory, so event-level exports of any
+    size can be aggregated from `Loader.read_csv_stream`. The result of
+    `to_frame` has the shape of the monthly OCHA summary (one row per observed
+    Year/Month) and can be passed to `Heatmap`, `StackBar`, `Bar` and
+    `PieChartMs` in place of the raw data.
+
+    Methods
+    -------
+    add(chunk): Adds the rows of a chunk to the totals and returns the touched cells.
+    update(chunk): Adds the rows of a chunk to the totals.
+    fold(chunks): Adds every chunk of an iterable and returns self.
+    to_frame(): Returns the totals as a Year/Month DataFrame.
+    to_cube(): Returns the totals as an AggregateCube.
+    """
+
+    def __init__(self, measures=None, date_column=None):
+        """
+        Initialize the StreamAggregator object.
+
+        Parameters:
+        measures (list, optional): The columns to total. Defaults to every numeric
+            column of the first chunk except `Year`.
+        date_column (str, optional): A date column to derive `Year` and `Month`
+            from, for exports that carry one date per incident.
+        """
+        self.measures = list(measures) if measures is not None else None
+        self.date_column = date_column
+        self.first_year = None
+        self.totals = np.zeros((0, 12, 0), dtype=np.int64)
+        self.seen = np.zeros((0, 12), dtype=bool)
+        self.rows = 0
+
+    def _year_month(self, chunk):
+        if self.date_column is not None:
+            dates = pd.to_datetime(chunk[self.date_column])
+            if dates.isna().any():
+                raise ValueError(f"Column '{self.date_column}' contains missing or invalid dates.")
+            return dates.dt.year.to_numpy(dtype=np.int64), dates.dt.month.to_numpy(dtype=np.int64) - 1
+        if 'Year' not in chunk.columns or 'Month' not in chunk.columns:
+            raise ValueError("Chunks must have 'Year' and 'Month' columns or a date_column must be given.")
+        return chunk['Year'].to_numpy(dtype=np.int64), month_codes(chunk['Month'])
+
+    def _grow(self, low, high):
+        first = low if self.first_year is None else min(low, self.first_year)
+        last = high if self.first_year is None else max(high, self.first_year + len(self.totals) - 1)
+        if self.first_year == first and len(self.totals) == last - first + 1:
+            return
+        totals = np.zeros((last - first + 1, 12, len(self.measures)), dtype=np.int64)
+        seen = np.zeros((last - first + 1, 12), dtype=bool)
+        if self.first_year is not None:
+            offset = self.first_year - first
+            totals[offset:offset + len(self.totals)] = self.totals
+            seen[offset:offset + len(self.seen)] = self.seen
+        self.first_year, self.totals, self.seen = first, totals, seen
+
+    def add(self, chunk):
+        """
+        Add the rows of a chunk to the totals and return what changed.
+
+        The work is proportional to the rows of the chunk: only the Year/Month
+        cells those rows fall into are touched.
+
+        Parameters:
+        chunk (DataFrame): The rows to add.
+
+        Returns:
+        tuple: The touched cells as flat (year offset * 12 + month) indices into
+            `totals`, and the (cells, measures) array added to them.
+        """
+        if not isinstance(chunk, pd.DataFrame):
+            raise TypeError("chunk must be a pandas DataFrame")
+        if self.measures is None:
+            self.measures = [c for c in chunk.select_dtypes(include='number').columns if c != 'Year']
+        if chunk.empty:
+            return np.zeros(0, dtype=np.int64), np.zeros((0, len(self.measures)), dtype=np.int64)
+        missing = [c for c in self.measures if c not in chunk.columns]
+        if missing:
+            raise ValueError(f"Chunk is missing measure columns: {missing}")
+
+        years, months = self._year_month(chunk)
+        self._grow(int(years.min()), int(years.max()))
+        cells, inverse = np.unique((years - self.first_year) * 12 + months, return_inverse=True)
+        deltas = np.empty((len(cells), len(self.measures)), dtype=np.int64)
+        for i, measure in enumerate(self.measures):
+            values = chunk[measure].to_numpy(dtype=np.float64, na_value=0)
+            deltas[:, i] = np.rint(np.bincount(inverse, weights=values, minlength=len(cells)))
+        self.totals.reshape(-1, len(self.measures))[cells] += deltas
+        self.seen.reshape(-1)[cells] = True
+        self.rows += len(chunk)
+        return cells, deltas
+
+    def update(self, chunk):
+        """
+        Add the rows of a chunk to the totals.
+
+        Parameters:
+        chunk (DataFrame): The rows to add.
+
+        Returns:
+        StreamAggregator: self.
+        """
+        self.add(chunk)
+        return self
+
+    def fold(self, chunks):
+        """
+        Add every chunk of an iterable to the totals.
+
+        Parameters:
+        chunks (iterable): DataFrames, e.g. from `Loader.read_csv_stream`.
+
+        Returns:
+        StreamAggregator: self.
+        """
+        for chunk in chunks:
+            self.update(chunk)
+        return self
+
+    def to_frame(self):
+        """
+        Return the totals as a DataFrame shaped like the monthly OCHA summary.
+
+        Returns:
+        DataFrame: One row per observed Year/Month, sorted by Year then Month.
+        """
+        measures = self.measures or []
+        year_idx, month_idx = np.nonzero(self.seen)
+        df = pd.DataFrame({
+            'Year': (year_idx + (self.first_year or 0)).astype(np.int16),
+            'Month': pd.Categorical.from_codes(month_idx, categories=MONTHS, ordered=True),
+        })
+        for i, measure in enumerate(measures):
+            df[measure] = self.totals[year_idx, month_idx, i]
+        return df
+
+    def to_cube(self):
+        """
+        Return the totals as an AggregateCube.
+
+        Years without any row are dropped, as a groupby on the raw data would.
+
+        Returns:
+        AggregateCube: The Year x Month x measure totals.
+        """
+        observed = self.seen.any(axis=1)
+        years = np.flatnonzero(observed) + (self.first_year or 0)
+        return AggregateCube(self.totals[observed], years, self.measures or [])
+
+
+class AggregateCube:
+    """
+    A class used to hold dense Year x Month x measure totals.
+
+    The cube is built once per dataset, in a single pass over the rows, and is
+    accepted by every chart class in place of the raw DataFrame: each chart
+    slices or reduces it instead of running its own groupby.
+
+    Methods
+    -------
+    from_frame(df, measures=None): Builds the cube from a DataFrame.
+    year_month(measure): Returns a Year x Month table of one measure.
+    by_year(measures): Returns the yearly totals of the measures.
+    by_month(measures): Returns the monthly totals of the measures.
+    by_season(measures, season_map): Returns the seasonal totals of the measures.
+    reduce(by, measure): Returns the totals of one measure grouped by 'Year' or 'Month'.
+    totals(measures): Returns the grand totals of the measures.
+    """
+
+    def __init__(self, values, years, measures):
+        """
+        Initialize the AggregateCube object.
+
+        Parameters:
+        values (ndarray): The totals, shaped (years, 12, measures).
+        years (array-like): The year of each row of values.
+        measures (list): The name of each measure of values.
+
+        Raises:
+        ValueError: If the shape of values does not match years and measures.
+        """
+        values = np.asarray(values)
+        if values.shape != (len(years), 12, len(measures)):
+            raise ValueError(f"values must have shape ({len(years)}, 12, {len(measures)}), got {values.shape}")
+        self.values = values
+        self.years = np.asarray(years, dtype=np.int64)
+        self.measures = list(measures)
+        self.months = list(MONTHS)
+
+    @classmethod
+    def from_frame(cls, df, measures=None):
+        """
+        Build the cube from a DataFrame with `Year`, `Month` and measure columns.
+
+        Parameters:
+        df (DataFrame): The raw data.
+        measures (list, optional): The columns to total. Defaults to every numeric
+            column except `Year`.
+
+        Returns:
+        AggregateCube: The cube of the data.
+        """
+        return StreamAggregator(measures=measures).update(df).to_cube()
+
+    def __contains__(self, measure):
+        return measure in self.measures
+
+    def __repr__(self):
+        return f"AggregateCube(years={self.years.min() if len(self.years) else None}-" \
+               f"{self.years.max() if len(self.years) else None}, measures={self.measures})"
+
+    def _index(self, measures):
+        missing = [m for m in measures if m not in self.measures]
+        if missing:
+            raise KeyError(f"Measures not in cube: {missing}")
+        return [self.measures.index(m) for m in measures]
+
+    def year_month(self, measure):
+        """
+        Return a Year x Month table of one measure.
+
+        Parameters:
+        measure (str): The measure to slice.
+
+        Returns:
+        DataFrame: Indexed by Year with one column per month (JANUARY..DECEMBER).
+        """
+        (i,) = self._index([measure])
+        return pd.DataFrame(self.values[:, :, i], index=pd.Index(self.years, name='Year'),
+                            columns=pd.Index(self.months, name='Month'))
+
+    def by_year(self, measures):
+        """
+        Return the yearly totals of the measures.
+
+        Parameters:
+        measures (list): The measures to total.
+
+        Returns:
+        DataFrame: Indexed by Year with one column per measure.
+        """
+        return pd.DataFrame(self.values[:, :, self._index(measures)].sum(axis=1),
+                            index=pd.Index(self.years, name='Year'), columns=list(measures))
+
+    def by_month(self, measures):
+        """
+        Return the monthly totals of the measures over all years.
+
+        Parameters:
+        measures (list): The measures to total.
+
+        Returns:
+        DataFrame: Indexed by Month (JANUARY..DECEMBER) with one column per measure.
+        """
+        return pd.DataFrame(self.values[:, :, self._index(measures)].sum(axis=0),
+                            index=pd.Index(self.months, name='Month'), columns=list(measures))
+
+    def by_season(self, measures, season_map):
+        """
+        Return the seasonal totals of the measures over all years.
+
+        Parameters:
+        measures (list): The measures to total.
+        season_map (dict): The season of each month name.
+
+        Returns:
+        DataFrame: Indexed by Season with one column per measure.
+        """
+        return self.by_month(measures).groupby(season_map).sum().rename_axis('Season')
+
+    def reduce(self, by, measure):
+        """
+        Return the totals of one measure grouped by 'Year' or 'Month'.
+
+        Parameters:
+        by (str): 'Year' or 'Month'.
+        measure (str): The measure to total.
+
+        Returns:
+        Series: The totals, named after the measure.
+        """
+        if by == 'Year':
+            return self.by_year([measure])[measure]
+        if by == 'Month':
+            return self.by_month([measure])[measure]
+        raise ValueError(f"Cannot group an AggregateCube by '{by}'; use 'Year' or 'Month'.")
+
+    def totals(self, measures):
+        """
+        Return the grand totals of the measures.
+
+        Parameters:
+        measures (list): The measures to total.
+
+        Returns:
+        Series: Indexed by measure.
+        """
+        return pd.Series(self.values[:, :, self._index(measures)].sum(axis=(0, 1)), index=list(measures))
+
+
+def as_cube(data):
+    """
+    Return the AggregateCube behind the given chart input, if any.
+
+    Parameters:
+    data: A DataFrame, an AggregateCube or an object exposing one as `cube`
+        (e.g. a `Dataset`).
+
+    Returns:
+    AggregateCube: The cube, or None when data only holds raw rows.
+    """
+    if isinstance(data, AggregateCube):
+        return data
+    cube = getattr(data, 'cube', None)
+    return cube if isinstance(cube, AggregateCube) else None
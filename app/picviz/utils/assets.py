@@ -0,0 +1,174 @@
+import base64
+import copy
+import io
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+
+PACKAGE_DIR = Path(__file__).resolve().parents[1]
+IMAGES_DIR = PACKAGE_DIR / "images"
+_ROOT = PACKAGE_DIR.parents[1]
+
+
+def asset_path(path):
+    """
+    Resolve an asset path portably.
+
+    Windows-style backslashes are accepted on every platform. A relative path is
+    looked up in the working directory, then in the repository root, then by
+    file name in the picviz images and utils directories, so the default
+    'app/picviz/images/ps_h.png' works wherever the code is run from.
+
+    Parameters:
+    path (str): The asset path, e.g. 'app/picviz/images/ps_h.png' or 'ps_h.png'.
+
+    Returns:
+    Path: The resolved path, or the normalised path itself if no candidate exists.
+    """
+    normalised = Path(str(path).replace("\\", "/"))
+    if normalised.is_absolute():
+        return normalised
+    for candidate in (normalised, _ROOT / normalised, IMAGES_DIR / normalised.name,
+                      PACKAGE_DIR / "utils" / normalised.name):
+        if candidate.exists():
+            return candidate
+    return normalised
+
+
+class AssetRegistry:
+    """
+    A class used to decode the static chart assets once per process.
+
+    Images, their downscaled copies, their data URIs and parsed YAML files are
+    kept by resolved path and modification time, so a batch render pays each
+    decode and encode once and an edited asset is picked up on the next use.
+    The returned arrays are shared between charts and must not be modified.
+
+    Methods
+    -------
+    image(path, max_size=None): Returns the decoded RGBA image as a float array.
+    thumbnail(path, zoom, dpi=200): Returns a copy downscaled to the zoom level, with the remaining zoom.
+    data_uri(path, max_size=None): Returns the PNG of the image as a base64 data URI.
+    yaml(path): Returns the parsed YAML file.
+    clear(): Forgets every asset.
+    """
+
+    def __init__(self):
+        self._items = {}
+        self._lock = threading.Lock()
+
+    def _get(self, kind, path, params, load):
+        path = asset_path(path)
+        key = (kind, str(path), os.stat(path).st_mtime_ns, params)
+        value = self._items.get(key)
+        if value is None:
+            value = load(path)
+            with self._lock:
+                value = self._items.setdefault(key, value)
+        return value
+
+    def _pil(self, path, max_size=None):
+        def load(path):
+            from PIL import Image
+
+            with Image.open(path) as image:
+                image = image.convert("RGBA")
+            if max_size is not None and (image.width > max_size[0] or image.height > max_size[1]):
+                image.thumbnail(max_size, Image.LANCZOS)
+            return image
+
+        return self._get("pil", path, max_size, load)
+
+    def image(self, path, max_size=None):
+        """
+        Return an image decoded once, as matplotlib `imread` would.
+
+        Parameters:
+        path (str): The image path.
+        max_size (tuple, optional): (width, height) in pixels to downscale the
+            image into, keeping its aspect ratio. Defaults to the full size.
+
+        Returns:
+        ndarray: The (height, width, 4) RGBA image with values in [0, 1].
+
+        Raises:
+        FileNotFoundError: If the image does not exist.
+        """
+        def load(path):
+            array = np.asarray(self._pil(path, max_size), dtype=np.float32) / 255
+            array.flags.writeable = False
+            return array
+
+        return self._get("array", path, max_size, load)
+
+    def thumbnail(self, path, zoom, dpi=200):
+        """
+        Return an image downscaled to the size it is drawn at by an `OffsetImage` with the given zoom.
+
+        Parameters:
+        path (str): The image path.
+        zoom (float): The OffsetImage zoom of the full-size image.
+        dpi (int): The highest output resolution to keep detail for. Defaults to 200.
+
+        Returns:
+        tuple: The image array and the zoom to draw it with at the original size,
+            i.e. `OffsetImage(image, zoom=zoom)`.
+        """
+        width, height = self._pil(path).size
+        # OffsetImage sizes images in points: one pixel per point at zoom 1
+        scale = min(zoom * dpi / 72, 1.0)
+        size = (max(round(width * scale), 1), max(round(height * scale), 1))
+        array = self.image(path, max_size=size)
+        return array, zoom * width / array.shape[1]
+
+    def data_uri(self, path, max_size=None):
+        """
+        Return an image as a PNG data URI, e.g. for the `source` of a plotly layout image.
+
+        Parameters:
+        path (str): The image path.
+        max_size (tuple, optional): (width, height) in pixels to downscale the image into.
+
+        Returns:
+        str: The 'data:image/png;base64,...' URI.
+        """
+        def load(path):
+            buffer = io.BytesIO()
+            self._pil(path, max_size).save(buffer, format="PNG", optimize=True)
+            return "data:image/png;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+        return self._get("uri", path, max_size, load)
+
+    def yaml(self, path):
+        """
+        Return a YAML file parsed once.
+
+        Parameters:
+        path (str): The YAML path.
+
+        Returns:
+        The parsed content; a copy, so callers may modify it.
+        """
+        def load(path):
+            import yaml
+
+            with open(path, "r", encoding="utf-8") as f:
+                return yaml.safe_load(f)
+
+        return copy.deepcopy(self._get("yaml", path, None, load))
+
+    def clear(self):
+        """
+        Forget every asset.
+        """
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+
+# The process-wide registry used by the chart classes
+ASSETS = AssetRegistry()
@@ -0,0 +1,226 @@
+import errno
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+class ColumnarCache:
+    """
+    A class used to persist parsed data files as memory-mappable column files.
+
+    Every source file gets its own sidecar directory holding a `meta.json` and
+    one `.npy` file per dtype block (plus one per categorical column). The
+    sidecar is keyed by the source path, size, modification time and content
+    hash, so later loads only have to stat the file and memory-map the arrays.
+
+    Methods
+    -------
+    load(path, part=None): Returns the cached DataFrame for path, or None on a miss.
+    store(path, df, part=None): Writes df as the sidecar of path.
+    fingerprint(path, content_hash=True): Returns the cache key of path.
+    sidecar(path, part=None): Returns the sidecar directory of path.
+    """
+
+    VERSION = 1
+
+    def __init__(self, cache_dir=None):
+        """
+        Initialize the ColumnarCache object.
+
+        Parameters:
+        cache_dir (str, optional): Directory holding the sidecars. Defaults to a
+            `.picviz_cache` directory next to each source file.
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+
+    def sidecar(self, path, part=None):
+        """
+        Return the sidecar directory of the given source file.
+
+        Parameters:
+        path (str): The path of the source file.
+        part (str, optional): The part of the file, e.g. a workbook sheet name,
+            for files that are cached as several frames.
+
+        Returns:
+        Path: The sidecar directory.
+        """
+        path = Path(path).resolve()
+        root = self.cache_dir if self.cache_dir is not None else path.parent / ".picviz_cache"
+        name = str(path) if part is None else f"{path}::{part}"
+        digest = hashlib.sha1(name.encode("utf-8")).hexdigest()[:12]
+        return root / f"{path.stem}-{digest}"
+
+    @staticmethod
+    def content_hash(path, blocksize=1 << 20):
+        """
+        Return the sha256 hex digest of the file content.
+
+        Parameters:
+        path (str): The path of the file.
+        blocksize (int): The number of bytes read at once.
+
+        Returns:
+        str: The hex digest.
+        """
+        sha = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(blocksize), b""):
+                sha.update(block)
+        return sha.hexdigest()
+
+    def fingerprint(self, path, content_hash=True):
+        """
+        Return the cache key of the given source file.
+
+        Parameters:
+        path (str): The path of the source file.
+        content_hash (bool): Whether to hash the file content as well.
+
+        Returns:
+        dict: The path, size, mtime (ns) and, optionally, sha256 of the file.
+        """
+        stat = os.stat(path)
+        key = {"path": str(Path(path).resolve()), "size": stat.st_size, "mtime": stat.st_mtime_ns}
+        if content_hash:
+            key["sha256"] = self.content_hash(path)
+        return key
+
+    def _read_meta(self, sidecar):
+        try:
+            with open(sidecar / "meta.json", "r") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return meta if meta.get("version") == self.VERSION else None
+
+    def load(self, path, part=None):
+        """
+        Load the cached DataFrame of the given source file.
+
+        The size and mtime are checked first; the content hash is only computed
+        when they differ (e.g. the file was touched or copied), in which case an
+        unchanged hash refreshes the stored key instead of invalidating it.
+
+        Parameters:
+        path (str): The path of the source file.
+        part (str, optional): The part of the file, e.g. a workbook sheet name.
+
+        Returns:
+        DataFrame: The memory-mapped DataFrame, or None if the cache is missing or stale.
+        """
+        sidecar = self.sidecar(path, part)
+        meta = self._read_meta(sidecar)
+        if meta is None:
+            return None
+
+        key = self.fingerprint(path, content_hash=False)
+        cached = meta["key"]
+        if (key["path"], key["size"], key["mtime"]) != (cached["path"], cached["size"], cached["mtime"]):
+            if key["size"] != cached["size"] or self.content_hash(path) != cached["sha256"]:
+                return None
+            meta["key"].update(mtime=key["mtime"])
+            self._write_meta(sidecar, meta)
+
+        try:
+            return self._read_frame(sidecar, meta)
+        except (OSError, ValueError):
+            return None
+
+    def _read_frame(self, sidecar, meta):
+        df = None
+        for block in sorted(meta["blocks"], key=lambda b: len(b["columns"]), reverse=True):
+            values = np.load(sidecar / block["file"], mmap_mode="r")
+            if df is None:
+                df = pd.DataFrame(values.T, columns=block["columns"], copy=False)
+            else:
+                for name, column in zip(block["columns"], values):
+                    df[name] = column
+        if df is None:
+            df = pd.DataFrame(index=pd.RangeIndex(meta["rows"]))
+        for cat in meta["categoricals"]:
+            codes = np.load(sidecar / cat["file"], mmap_mode="r")
+            df[cat["column"]] = pd.Categorical.from_codes(codes, categories=cat["categories"],
+                                                          ordered=cat["ordered"])
+        return df[meta["columns"]]
+
+    def store(self, path, df, part=None):
+        """
+        Write the DataFrame as the sidecar of the given source file.
+
+        Columns are grouped by dtype into 2-D blocks so that the loaded frame can
+        wrap each memory-mapped block without copying. Categorical columns are
+        stored as their codes.
+
+        Parameters:
+        path (str): The path of the source file.
+        df (DataFrame): The DataFrame parsed from the file.
+        part (str, optional): The part of the file, e.g. a workbook sheet name.
+
+        Raises:
+        ValueError: If a column dtype cannot be stored.
+        """
+        blocks = {}
+        categoricals = []
+        for name in df.columns:
+            dtype = df[name].dtype
+            if isinstance(dtype, pd.CategoricalDtype):
+                categoricals.append(name)
+            elif isinstance(dtype, np.dtype) and (np.issubdtype(dtype, np.number) or np.issubdtype(dtype, np.bool_)):
+                blocks.setdefault(dtype.str, []).append(name)
+            else:
+                raise ValueError(f"Column '{name}' of dtype {dtype} cannot be cached; "
+                                 f"convert it to a NumPy dtype or a category first.")
+
+        sidecar = self.sidecar(path, part)
+        sidecar.parent.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(prefix=sidecar.name, dir=sidecar.parent))
+        meta = {"version": self.VERSION, "key": self.fingerprint(path), "rows": len(df),
+                "columns": [str(c) for c in df.columns], "blocks": [], "categoricals": []}
+        try:
+            for i, (dtype, names) in enumerate(blocks.items()):
+                filename = f"block{i}.npy"
+                np.save(tmp / filename, np.ascontiguousarray(df[names].to_numpy(dtype=dtype).T))
+                meta["blocks"].append({"file": filename, "columns": names})
+            for i, name in enumerate(categoricals):
+                filename = f"cat{i}.npy"
+                values = df[name].cat
+                np.save(tmp / filename, values.codes.to_numpy())
+                meta["categoricals"].append({"file": filename, "column": name,
+                                             "categories": values.categories.tolist(),
+                                             "ordered": bool(values.ordered)})
+            self._write_meta(tmp, meta)
+            self._install(tmp, sidecar)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+    @staticmethod
+    def _install(tmp, sidecar):
+        # Only renames touch the sidecar path: readers find the old sidecar, the new one or
+        # none (a miss), and a writer that loses a race keeps the sidecar of the winner
+        stale = Path(tempfile.mkdtemp(prefix=sidecar.name, dir=sidecar.parent))
+        try:
+            try:
+                os.replace(sidecar, stale / "old")
+            except FileNotFoundError:
+                pass
+            try:
+                os.replace(tmp, sidecar)
+            except OSError as e:
+                if e.errno not in (errno.ENOTEMPTY, errno.EEXIST):
+                    raise
+                shutil.rmtree(tmp, ignore_errors=True)
+        finally:
+            shutil.rmtree(stale, ignore_errors=True)
+
+    @staticmethod
+    def _write_meta(sidecar, meta):
+        with open(sidecar / "meta.json", "w") as f:
+            json.dump(meta, f)
@@ -1,21 +1,260 @@
 from pathlib import Path
 import pandas as pd
+import numpy as np
 import os
+import glob
+import json
+import html
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
+from .cache import ColumnarCache
+
+
+MONTHS = ['JANUARY', 'FEBRUARY', 'MARCH', 'APRIL', 'MAY', 'JUNE', 'JULY', 'AUGUST', 'SEPTEMBER', 'OCTOBER', 'NOVEMBER', 'DECEMBER']
 
 
 class Choice(Enum):
     Injuries = "Injuries"
     Fatalities = "Fatalities"
 
+
+def as_frame(data):
+    """
+    Return the DataFrame behind the given chart input.
+
+    Parameters:
+    data: A DataFrame or an object exposing one as `frame` (e.g. a `Dataset`
+        or a `SharedDataset`).
+
+    Returns:
+    DataFrame: The rows, or data unchanged if it holds none.
+    """
+    if isinstance(data, pd.DataFrame):
+        return data
+    frame = getattr(data, 'frame', None)
+    return frame if isinstance(frame, pd.DataFrame) else data
+
+
+TABLE_STYLES = [{"selector": "th", "props": [("background-color", "#113946"), ("color", "white"), ("font-size", "10pt")]},
+                {"selector": "td", "props": [("background-color", "#F9F3CC"), ("color", "black"), ("font-size", "8pt"), ("font-weight", "bold")]}]
+
+
+def _format_float(x):
+    return "{:.2f}".format(x).rstrip('0').rstrip('.') if isinstance(x, float) else x
+
+
+_CENTS_SUFFIX = np.array([''] + [('.%02d' % i).rstrip('0') for i in range(1, 100)])
+
+
+def format_floats(values):
+    """
+    Format floats to at most 2 decimal places without trailing zeros, column-wise.
+
+    Gives the same strings as `"{:.2f}".format(x).rstrip('0').rstrip('.')`, but
+    builds them from integer cents with NumPy string operations instead of
+    formatting every cell in Python. Values that are not finite, too large for
+    integer cents or within rounding distance of a half cent fall back to the
+    Python formatting.
+
+    Parameters:
+    values (Series): A float column.
+
+    Returns:
+    Series: The formatted strings, with the index of values.
+    """
+    x = values.to_numpy(dtype=np.float64)
+    scaled = np.abs(x) * 100
+    with np.errstate(invalid='ignore'):
+        fast = np.isfinite(scaled) & (scaled < 1e15) & (np.abs(scaled % 1 - 0.5) > 1e-6)
+    out = np.empty(len(x), dtype=object)
+    cents = np.rint(scaled[fast]).astype(np.int64)
+    units = (cents // 100).astype(str)
+    out[fast] = np.char.add(np.char.add(np.where(np.signbit(x[fast]), '-', ''), units), _CENTS_SUFFIX[cents % 100])
+    out[~fast] = [_format_float(v) for v in x[~fast].tolist()]
+    return pd.Series(out, index=values.index)
+
+
+def compact_dtypes(df):
+    """
+    Downcast an OCHA DataFrame to compact dtypes.
+
+    `Month` becomes an ordered categorical (January to December), `Year` int16,
+    the integer casualty counts int32 and any other text column a categorical.
+    Integer columns with missing values keep their (nullable) dtype.
+
+    Parameters:
+    df (DataFrame): The DataFrame to downcast.
+
+    Returns:
+    DataFrame: The downcast DataFrame.
+    """
+    columns = {}
+    for name in df.columns:
+        col = df[name]
+        if name == 'Month' and set(col.dropna().unique()) <= set(MONTHS):
+            columns[name] = pd.Categorical(col, categories=MONTHS, ordered=True)
+        elif name == 'Year' and pd.api.types.is_integer_dtype(col) and not col.hasnans:
+            columns[name] = col.astype(np.int16)
+        elif pd.api.types.is_integer_dtype(col) and not pd.api.types.is_bool_dtype(col) and not col.hasnans:
+            if col.empty or (col.min() >= np.iinfo(np.int32).min and col.max() <= np.iinfo(np.int32).max):
+                columns[name] = col.astype(np.int32)
+            else:
+                columns[name] = col
+        elif pd.api.types.is_object_dtype(col) or pd.api.types.is_string_dtype(col):
+            columns[name] = col.astype('category')
+        else:
+            columns[name] = col
+    return pd.DataFrame(columns, index=df.index)
+
+WIDE_MEASURES = ['Palestinians Injuries', 'Palestinians Fatalities', 'Israelis Injuries', 'Israelis Fatalities']
+GROUPS = {'Palestine': 'Palestinians', 'Israel': 'Israelis'}
+_CANONICAL_COLUMNS = {name.lower(): name for name in ['Year', 'Month', 'Injuries', 'Fatalities', 'Group'] + WIDE_MEASURES}
+
+
+def normalise_frame(df):
+    """
+    Bring a parsed OCHA file or sheet to the canonical column names and dtypes.
+
+    Column names are matched case- and whitespace-insensitively (e.g.
+    ' year ' becomes `Year`), month names are stripped and upper-cased and the
+    frame is downcast with `compact_dtypes`.
+
+    Parameters:
+    df (DataFrame): The parsed DataFrame.
+
+    Returns:
+    DataFrame: The normalised DataFrame.
+    """
+    df = df.rename(columns=lambda c: _CANONICAL_COLUMNS.get(' '.join(str(c).split()).lower(), c))
+    if 'Month' in df.columns and (pd.api.types.is_object_dtype(df['Month']) or pd.api.types.is_string_dtype(df['Month'])):
+        df = df.assign(Month=df['Month'].str.strip().str.upper())
+    return compact_dtypes(df)
+
+
+def frame_layout(df):
+    """
+    Return the layout of an OCHA DataFrame.
+
+    Parameters:
+    df (DataFrame): The DataFrame.
+
+    Returns:
+    str: 'grouped' for one `Injuries`/`Fatalities` pair per `Group` row (the
+        Excel layout), 'wide' otherwise (one column per group and measure, the
+        CSV layout).
+    """
+    return 'grouped' if {'Group', 'Injuries', 'Fatalities'} <= set(df.columns) else 'wide'
+
+
+def to_layout(df, layout):
+    """
+    Convert an OCHA DataFrame between the 'wide' and the 'grouped' layout.
+
+    Parameters:
+    df (DataFrame): The DataFrame, with `Year` and `Month` columns.
+    layout (str): The layout to convert to, 'wide' or 'grouped'.
+
+    Returns:
+    DataFrame: The converted DataFrame, or df itself if it already has the layout.
+
+    Raises:
+    ValueError: If layout is not 'wide' or 'grouped'.
+    """
+    if layout not in ('wide', 'grouped'):
+        raise ValueError("layout must be 'wide' or 'grouped'")
+    if frame_layout(df) == layout:
+        return df
+    if layout == 'wide':
+        groups = df['Group'].astype(str).str.strip()
+        wide = (df.assign(Group=groups.map(lambda g: GROUPS.get(g, g)))
+                  .pivot_table(index=['Year', 'Month'], columns='Group', values=['Injuries', 'Fatalities'],
+                               aggfunc='sum', fill_value=0, observed=True, sort=False))
+        wide.columns = [f"{group} {measure}" for measure, group in wide.columns]
+        wide = wide.reset_index()
+        order = [c for c in WIDE_MEASURES if c in wide.columns]
+        return compact_dtypes(wide[['Year', 'Month'] + order + [c for c in wide.columns[2:] if c not in order]])
+
+    frames = []
+    for group, prefix in GROUPS.items():
+        columns = {f"{prefix} {measure}": measure for measure in ['Injuries', 'Fatalities']}
+        if all(c in df.columns for c in columns):
+            frames.append(df[['Year', 'Month', *columns]].rename(columns=columns).assign(Group=group))
+    if not frames:
+        raise ValueError("The DataFrame has no group measure columns to convert.")
+    return compact_dtypes(pd.concat(frames, ignore_index=True))
+
+
+def concat_frames(frames):
+    """
+    Concatenate DataFrames row-wise, copying every column exactly once.
+
+    Each output column is built with a single `np.concatenate` (or
+    `union_categoricals`) over the inputs and wrapped without a further copy,
+    instead of `pd.concat` aligning and consolidating whole frames. Columns
+    missing from some inputs are filled with NaN.
+
+    Parameters:
+    frames (list): The DataFrames.
+
+    Returns:
+    DataFrame: The concatenated DataFrame with a fresh RangeIndex.
+    """
+    columns = list(dict.fromkeys(c for f in frames for c in f.columns))
+    out = {}
+    for name in columns:
+        parts = [f[name] if name in f.columns else pd.Series(np.full(len(f), np.nan)) for f in frames]
+        if all(isinstance(p.dtype, pd.CategoricalDtype) for p in parts):
+            try:
+                out[name] = pd.api.types.union_categoricals(parts)
+                continue
+            except TypeError:
+                pass
+        if any(isinstance(p.dtype, pd.CategoricalDtype) or not pd.api.types.is_numeric_dtype(p) for p in parts):
+            out[name] = pd.Categorical(np.concatenate([p.to_numpy(dtype=object) for p in parts]))
+        else:
+            out[name] = np.concatenate([p.to_numpy() for p in parts])
+    return pd.DataFrame(out, columns=columns, copy=False)
+
+
+def _normalised_part(sheet=None):
+    # The sidecar key of a normalised frame, kept apart from the merely compacted
+    # frame that `Loader.read_csv(cache=True)` stores under the plain path
+    return "normalised" if sheet is None else f"normalised:{sheet}"
+
+
+def _parse_part(path, sheet=None, cache_dir=None, cache=False):
+    # Runs in a pool worker: parse one CSV file or workbook sheet. With the cache
+    # on, the frame goes back through a memory-mapped sidecar instead of a pickle.
+    loader = Loader()
+    if sheet is None:
+        df = loader.read_csv(path)
+    else:
+        df = loader.read_excel(path, header=0, sheet_name=sheet)
+    df = normalise_frame(df)
+    if cache:
+        try:
+            ColumnarCache(cache_dir).store(path, df, part=_normalised_part(sheet))
+        except (OSError, ValueError) as e:
+            print("Error occurred while writing the columnar cache:", str(e))
+        else:
+            return None
+    return df
+
+
 class Loader:
     """
     A class used to load data from CSV files.
 
     Methods
     -------
-    read_csv(path): Loads and prints the data from the CSV file path if it is not None.
+    read_csv(path, cache=False, cache_dir=None): Loads the data from the CSV file path, optionally through the columnar cache.
+    read_csv_stream(path, chunksize=100000): Yields the CSV file in compact-dtype chunks.
     read_xsls(path): Loads and prints the data from the Excel file path if it is not None.
+    read_many(glob_or_paths, processes=None, cache=False): Loads many CSV files and workbook sheets in parallel as one DataFrame.
+    read_validated(path, schema=None): Loads and validates a CSV or Excel file once, returning a ValidatedDataset.
+    format_table(data): Returns the DataFrame with floats formatted column-wise.
+    write_html_pages(data, html_path, page_size=10000): Streams the table to disk as linked HTML pages.
+    write_virtual_table(data, html_path): Writes the table as one virtually scrolled HTML page.
     printout(data, show_index=False, title=None): Prints the data with a title.
     get_dataset_name(path): Returns the name of the file from the file path.
     plot_title(t, size=(12.6,0.5), fc= "#113946", pfc ="none"): Returns the title string.
@@ -26,12 +265,19 @@ class Loader:
         #    self.css = f.read()
         pass
 
-    def read_csv(self, path):
+    def read_csv(self, path, cache=False, cache_dir=None):
         """
         Load a CSV file and print its top 5 observations.
 
+        With `cache=True` the first read writes a columnar sidecar (see
+        `ColumnarCache`) with compact dtypes, and later reads memory-map it
+        instead of parsing the CSV again.
+
         Parameters:
         path (str): The path of the CSV file.
+        cache (bool): Whether to load through the columnar cache. Defaults to False.
+        cache_dir (str, optional): Directory holding the sidecars. Defaults to a
+            `.picviz_cache` directory next to the CSV file.
 
         Returns:
         DataFrame: The loaded DataFrame.
@@ -42,14 +288,64 @@ class Loader:
         if not Path(path).is_file():
             raise FileNotFoundError("File does not exist at the given path.")
 
+        if cache:
+            columnar_cache = ColumnarCache(cache_dir)
+            df = columnar_cache.load(path)
+            if df is not None:
+                return df
+
         try:
             df = pd.read_csv(path, encoding='utf-8')
         except pd.errors.ParserError as e:
             raise ValueError("Error occurred while parsing the CSV file.") from e
 
+        if cache:
+            df = compact_dtypes(df)
+            try:
+                columnar_cache.store(path, df)
+            except (OSError, ValueError) as e:
+                print("Error occurred while writing the columnar cache:", str(e))
+            else:
+                # None only while a concurrent writer swaps the sidecar; the parsed frame serves then
+                cached = columnar_cache.load(path)
+                if cached is not None:
+                    df = cached
+
         return df
 
-    def read_excel(self, path, header=None, index_col=None, usecols=None):
+    def read_csv_stream(self, path, chunksize=100000, usecols=None):
+        """
+        Load a CSV file lazily, one chunk of rows at a time.
+
+        Every chunk is downcast with `compact_dtypes`, so memory stays bounded by
+        `chunksize` whatever the file size. Feed the chunks to a
+        `StreamAggregator` to build the Year/Month totals the charts need.
+
+        Parameters:
+        path (str): The path of the CSV file.
+        chunksize (int): The number of rows per chunk. Defaults to 100000.
+        usecols (list-like, optional): Return a subset of the columns.
+
+        Yields:
+        DataFrame: The next chunk of the file.
+        """
+        if not path:
+            raise ValueError("Please provide a data path.")
+
+        if not Path(path).is_file():
+            raise FileNotFoundError("File does not exist at the given path.")
+
+        if not isinstance(chunksize, int) or chunksize <= 0:
+            raise ValueError("chunksize must be a positive integer.")
+
+        try:
+            with pd.read_csv(path, encoding='utf-8', chunksize=chunksize, usecols=usecols) as reader:
+                for chunk in reader:
+                    yield compact_dtypes(chunk)
+        except pd.errors.ParserError as e:
+            raise ValueError("Error occurred while parsing the CSV file.") from e
+
+    def read_excel(self, path, header=None, index_col=None, usecols=None, sheet_name=0):
         """
         Load an Excel file and print its top 5 observations.
 
@@ -58,6 +354,7 @@ class Loader:
         header (int, list of int, default None): Row(s) to use as the column names.
         index_col (int, str, sequence[int/str], or False, default None): Column(s) to set as index(MultiIndex).
         usecols (int, str, list-like, or callable, default None): Return a subset of the columns.
+        sheet_name (str or int, default 0): The sheet to load, by name or position.
 
         Returns:
         DataFrame: The loaded DataFrame.
@@ -72,18 +369,153 @@ class Loader:
             raise ValueError("Invalid file extension. Only '.xls' and '.xlsx' files are supported.")
 
         try:
-            df = pd.read_excel(path, header=header, index_col=index_col, usecols=usecols)
+            df = pd.read_excel(path, header=header, index_col=index_col, usecols=usecols, sheet_name=sheet_name)
         except pd.errors.ParserError as e:
             raise ValueError("Error occurred while parsing the Excel file.") from e
 
         return df
 
-   
+    @staticmethod
+    def expand_paths(glob_or_paths):
+        """
+        Expand a glob pattern, a path or a list of either into sorted file paths.
+
+        Parameters:
+        glob_or_paths (str, Path or list): e.g. 'data/ps_il_*.csv' or ['a.csv', 'b.xlsx'].
+
+        Returns:
+        list: The matching file paths, without duplicates.
+        """
+        items = [glob_or_paths] if isinstance(glob_or_paths, (str, os.PathLike)) else list(glob_or_paths)
+        paths = []
+        for item in items:
+            item = str(item)
+            paths += sorted(glob.glob(item, recursive=True)) if glob.has_magic(item) else [item]
+        return list(dict.fromkeys(paths))
+
+    def read_many(self, glob_or_paths, processes=None, cache=False, cache_dir=None, layout=None):
+        """
+        Load many CSV files and Excel workbooks as one DataFrame.
+
+        Every CSV file and every workbook sheet is parsed in a process pool and
+        normalised with `normalise_frame`. Frames of the other layout are
+        converted with `to_layout`, and all frames are joined with `concat_frames`,
+        which copies every column once. With `cache=True` unchanged files and
+        sheets are memory-mapped from their `ColumnarCache` sidecars without
+        being parsed. Workers hand new sidecars back through the cache instead
+        of pickling the frames.
+
+        Parameters:
+        glob_or_paths (str, Path or list): A glob pattern, a path or a list of either.
+        processes (int, optional): The number of worker processes. Defaults to the
+            number of CPUs; 1 parses in this process.
+        cache (bool): Whether to load through the columnar cache. Defaults to False.
+        cache_dir (str, optional): Directory holding the cache sidecars.
+        layout (str, optional): 'wide' or 'grouped'. Defaults to the layout of the first file.
+
+        Returns:
+        DataFrame: The rows of all files and sheets, in path and sheet order.
+
+        Raises:
+        ValueError: If no file matches or a file has an unsupported extension.
+        FileNotFoundError: If a listed file does not exist.
+        """
+        paths = self.expand_paths(glob_or_paths)
+        if not paths:
+            raise ValueError(f"No data files match {glob_or_paths!r}.")
+        parts = []
+        for path in paths:
+            if not Path(path).is_file():
+                raise FileNotFoundError(f"File does not exist at the given path: {path}")
+            if path.endswith(('.xls', '.xlsx')):
+                with pd.ExcelFile(path) as book:
+                    parts += [(path, sheet) for sheet in book.sheet_names]
+            elif path.endswith('.csv'):
+                parts.append((path, None))
+            else:
+                raise ValueError(f"Invalid file extension: {path}. Only '.csv', '.xls' and '.xlsx' files are supported.")
+
+        columnar_cache = ColumnarCache(cache_dir) if cache else None
+        frames = [columnar_cache.load(path, part=_normalised_part(sheet)) if cache else None for path, sheet in parts]
+        todo = [i for i, df in enumerate(frames) if df is None]
+        jobs = [(parts[i][0], parts[i][1], cache_dir, cache) for i in todo]
+        workers = min(processes or os.cpu_count() or 1, len(jobs))
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_parse_part, *zip(*jobs)))
+        else:
+            results = [_parse_part(*job) for job in jobs]
+        for i, df in zip(todo, results):
+            if df is None:
+                df = columnar_cache.load(parts[i][0], part=_normalised_part(parts[i][1]))
+            frames[i] = df if df is not None else _parse_part(*parts[i])
+
+        layout = layout or frame_layout(frames[0])
+        frames = [to_layout(df, layout) for df in frames]
+        return frames[0] if len(frames) == 1 else concat_frames(frames)
+
+    def read_validated(self, path, schema=None, cache=False, cache_dir=None):
+        """
+        Load a CSV or Excel file and validate it once against a schema.
+
+        The returned ValidatedDataset is trusted by the chart classes, which then
+        skip their own column, dtype and NaN checks.
+
+        Parameters:
+        path (str): The path of the CSV (.csv) or Excel (.xls, .xlsx) file.
+        schema (Schema, optional): The schema to check against. Defaults to the
+            known schema whose columns are all present.
+        cache (bool): Whether to load CSV files through the columnar cache. Defaults to False.
+        cache_dir (str, optional): Directory holding the cache sidecars.
+
+        Returns:
+        ValidatedDataset: The validated data.
+
+        Raises:
+        SchemaError: If the data does not match the schema.
+        """
+        from .schema import validate
+
+        if str(path).endswith(('.xls', '.xlsx')):
+            df = self.read_excel(str(path), header=0)
+        else:
+            df = self.read_csv(path, cache=cache, cache_dir=cache_dir)
+        return validate(df, schema)
+
+    @staticmethod
+    def format_table(data):
+        """
+        Format the float columns of a DataFrame to 2 decimal places without trailing zeros.
+
+        Float columns are formatted with `format_floats`; object columns keep the
+        cell-wise formatting of their float cells.
+
+        Parameters:
+        data (DataFrame): The DataFrame to format.
+
+        Returns:
+        DataFrame: A new DataFrame; data is left untouched.
+        """
+        columns = {}
+        for i, (name, col) in enumerate(data.items()):
+            if pd.api.types.is_float_dtype(col):
+                columns[i] = format_floats(col)
+            elif pd.api.types.is_object_dtype(col):
+                columns[i] = col.map(_format_float)
+            else:
+                columns[i] = col
+        formatted = pd.DataFrame(columns, index=data.index)
+        formatted.columns = data.columns
+        return formatted
+
     def dataframe_as_table(self, data, show_index=False, save_html=False, html_path=None, html_filename=None):
         """
         Display a pandas DataFrame with custom formatting.
         Removes trailing zeros and formats float numbers to 2 decimal places.
 
+        For large tables prefer `write_html_pages` or `write_virtual_table`,
+        which never render the whole table into one Styler.
+
         Parameters:
         data (DataFrame): The DataFrame to display.
         show_index (bool): Whether or not to show the DataFrame index.
@@ -101,11 +533,8 @@ class Loader:
         if data.empty:
             return None
 
-        table_styles = [{"selector": "th", "props": [("background-color", "#113946"), ("color", "white"), ("font-size", "10pt")]},
-                        {"selector": "td", "props": [("background-color", "#F9F3CC"), ("color", "black"), ("font-size", "8pt"), ("font-weight", "bold")]}]
-
-        data = data.applymap(lambda x: "{:.2f}".format(x).rstrip('0').rstrip('.') if isinstance(x, float) else x)
-        styled_df = data.style.set_table_styles(table_styles)
+        data = self.format_table(data)
+        styled_df = data.style.set_table_styles(TABLE_STYLES)
 
         if save_html and Path(html_path).is_dir():
             filename = 'styled_df.html' if html_filename is None else html_filename
@@ -117,6 +546,97 @@ class Loader:
 
         return styled_df
 
+    @staticmethod
+    def _table_css():
+        rules = []
+        for style in TABLE_STYLES:
+            props = "; ".join(f"{k}: {v}" for k, v in style["props"])
+            rules.append(f"{style['selector']} {{{props}}}")
+        return "\n".join(rules)
+
+    def write_html_pages(self, data, html_path, page_size=10000, show_index=False, html_filename=None):
+        """
+        Write a DataFrame as a series of linked HTML pages, one page at a time.
+
+        Each page is formatted and written before the next one is built, so
+        memory is bounded by `page_size` rows whatever the size of the table.
+
+        Parameters:
+        data (DataFrame): The DataFrame to write.
+        html_path (str): The directory to write the pages to.
+        page_size (int): The number of rows per page. Defaults to 10000.
+        show_index (bool): Whether or not to show the DataFrame index.
+        html_filename (str): The filename of the first page; later pages get a
+            `_<n>` suffix. Defaults to 'styled_df.html'.
+
+        Returns:
+        list: The paths of the written pages.
+        """
+        if not isinstance(data, pd.DataFrame):
+            raise ValueError("The 'data' parameter must be a pandas DataFrame.")
+        if not Path(html_path).is_dir():
+            raise FileNotFoundError("Directory does not exist at the given path.")
+        if not isinstance(page_size, int) or page_size <= 0:
+            raise ValueError("page_size must be a positive integer.")
+
+        stem, ext = os.path.splitext(html_filename or 'styled_df.html')
+        pages = max(1, -(-len(data) // page_size))
+        names = [f"{stem}{ext}" if i == 0 else f"{stem}_{i + 1}{ext}" for i in range(pages)]
+        css = self._table_css()
+        paths = []
+        for i in range(pages):
+            page = self.format_table(data.iloc[i * page_size:(i + 1) * page_size])
+            nav = []
+            if i > 0:
+                nav.append(f'<a href="{names[i - 1]}">&laquo; previous</a>')
+            nav.append(f"page {i + 1} of {pages}")
+            if i < pages - 1:
+                nav.append(f'<a href="{names[i + 1]}">next &raquo;</a>')
+            nav = " | ".join(nav)
+            path = os.path.join(html_path, names[i])
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(f"<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n<style>\n{css}\n</style>\n</head>\n<body>\n")
+                f.write(f"<p>{nav}</p>\n")
+                f.write(page.to_html(index=show_index, border=0))
+                f.write(f"\n<p>{nav}</p>\n</body>\n</html>\n")
+            paths.append(path)
+        return paths
+
+    def write_virtual_table(self, data, html_path, html_filename=None, show_index=False, height=600, row_height=22):
+        """
+        Write a DataFrame as one HTML page that renders only the visible rows.
+
+        The page embeds the raw values as a compact JSON array (no pre-rendered
+        `<td>` cells); a small script formats floats like `format_floats` and
+        draws the rows in view as the user scrolls.
+
+        Parameters:
+        data (DataFrame): The DataFrame to write.
+        html_path (str): The directory to write the page to.
+        html_filename (str): The filename of the page. Defaults to 'styled_df_virtual.html'.
+        show_index (bool): Whether or not to show the DataFrame index.
+        height (int): The height of the scroll area in pixels. Defaults to 600.
+        row_height (int): The height of one row in pixels. Defaults to 22.
+
+        Returns:
+        str: The path of the written page.
+        """
+        if not isinstance(data, pd.DataFrame):
+            raise ValueError("The 'data' parameter must be a pandas DataFrame.")
+        if not Path(html_path).is_dir():
+            raise FileNotFoundError("Directory does not exist at the given path.")
+
+        if show_index:
+            data = data.reset_index()
+        columns = json.dumps([str(c) for c in data.columns])
+        values = data.to_json(orient='values', date_format='iso', default_handler=str).replace('</', '<\\/')
+        path = os.path.join(html_path, html_filename or 'styled_df_virtual.html')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(_VIRTUAL_TABLE_TEMPLATE.format(css=self._table_css(), columns=columns, values=values,
+                                                   height=int(height), row_height=int(row_height),
+                                                   title=html.escape(Path(path).stem)))
+        return path
+
     @staticmethod
     def get_dataset_name(path):
         """
@@ -133,24 +653,161 @@ class Loader:
         return name
 
         
+_VIRTUAL_TABLE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+{css}
+#viewport {{height: {height}px; overflow-y: auto; position: relative;}}
+#viewport table {{position: absolute; top: 0; border-collapse: collapse;}}
+#viewport td, #viewport th {{height: {row_height}px; padding: 0 6px; white-space: nowrap;}}
+</style>
+</head>
+<body>
+<div id="viewport"><div id="spacer"></div><table><thead></thead><tbody></tbody></table></div>
+<script>
+const columns = {columns};
+const rows = {values};
+const rowHeight = {row_height};
+const viewport = document.getElementById("viewport");
+const table = viewport.querySelector("table");
+const tbody = table.querySelector("tbody");
+document.getElementById("spacer").style.height = ((rows.length + 1) * rowHeight) + "px";
+table.querySelector("thead").innerHTML = "<tr>" + columns.map(c => "<th>" + escape(c) + "</th>").join("") + "</tr>";
+function escape(v) {{
+  return String(v).replace(/&/g, "&amp;").replace(/</g, "&lt;").replace(/>/g, "&gt;");
+}}
+function format(v) {{
+  if (typeof v === "number" && !Number.isInteger(v)) {{
+    return v.toFixed(2).replace(/0+$/, "").replace(/\\.$/, "");
+  }}
+  return v === null ? "" : escape(v);
+}}
+function draw() {{
+  const first = Math.floor(viewport.scrollTop / rowHeight);
+  const count = Math.ceil(viewport.clientHeight / rowHeight) + 1;
+  table.style.top = (first * rowHeight) + "px";
+  tbody.innerHTML = rows.slice(first, first + count)
+    .map(r => "<tr>" + r.map(v => "<td>" + format(v) + "</td>").join("") + "</tr>").join("");
+}}
+viewport.addEventListener("scroll", () => window.requestAnimationFrame(draw));
+draw();
+</script>
+</body>
+</html>
+"""
+
+
 class DataFrameCopier:
+    """
+    A copy-on-write wrapper around a DataFrame.
+
+    The base frame is never copied and never mutated: `get_dataframe` and `view`
+    hand out shallow views (with pandas copy-on-write, writes to a view never
+    reach the base), and derived columns registered with `derive` are computed
+    on first use and only ever live in the views. Every view handed out instead
+    of a deep copy adds the bytes `df.copy()` would have allocated to
+    `bytes_saved` (and to the class-wide `total_bytes_saved`).
+
+    Methods
+    -------
+    get_dataframe(): Returns a read-only view of the base frame.
+    view(columns=None): Returns a view with base and derived columns.
+    derive(name, func): Registers a lazily materialised derived column.
+    copy(): Returns an explicit, writable deep copy.
+    """
+
+    total_bytes_saved = 0
+
     def __init__(self, df=None):
         """
         Initialize the DataFrameCopier object.
 
         Parameters:
-        - df (pandas.DataFrame, optional): The dataframe to be copied. Defaults to None.
+        - df (pandas.DataFrame, optional): The dataframe to wrap. It is referenced, not copied. Defaults to None.
         """
-        self.df = df.copy() if df is not None else None
+        self.df = df
+        self._derived = {}
+        self._materialised = {}
+        self.bytes_saved = 0
+
+    def _count_saved(self):
+        # df.copy() copies the column buffers (object columns: the pointers only),
+        # which is exactly what a shallow memory_usage reports.
+        saved = int(self.df.memory_usage(index=True, deep=False).sum())
+        self.bytes_saved += saved
+        DataFrameCopier.total_bytes_saved += saved
 
     def get_dataframe(self):
         """
-        Get the copied dataframe.
+        Get a read-only view of the dataframe.
+
+        Returns:
+        - pandas.DataFrame: A shallow view of the base dataframe, or None.
+        """
+        if self.df is None:
+            return None
+        self._count_saved()
+        return self.df.copy(deep=False)
+
+    def derive(self, name, func):
+        """
+        Register a derived column, computed from the base frame on first use.
+
+        Parameters:
+        - name (str): The name of the derived column.
+        - func (callable): Called with the base dataframe; returns the column values.
+
+        Returns:
+        - DataFrameCopier: self.
+        """
+        self._derived[name] = func
+        self._materialised.pop(name, None)
+        return self
+
+    def _column(self, name):
+        if name not in self._materialised:
+            self._materialised[name] = self._derived[name](self.df)
+        return self._materialised[name]
+
+    def view(self, columns=None):
+        """
+        Get a read-only view with the requested base and derived columns.
+
+        Only the derived columns that are requested are materialised.
+
+        Parameters:
+        - columns (list, optional): The columns of the view. Defaults to every base
+          column followed by every derived column.
+
+        Returns:
+        - pandas.DataFrame: The view.
+
+        Raises:
+        - KeyError: If a column is neither a base nor a derived column.
+        """
+        if columns is None:
+            columns = list(self.df.columns) + [c for c in self._derived if c not in self.df.columns]
+        unknown = [c for c in columns if c not in self._derived and c not in self.df.columns]
+        if unknown:
+            raise KeyError(f"Unknown columns: {unknown}")
+        view = self.df.copy(deep=False)
+        self._count_saved()
+        for name in columns:
+            if name in self._derived:
+                view[name] = self._column(name)
+        return view if list(view.columns) == list(columns) else view[list(columns)]
+
+    def copy(self):
+        """
+        Get an explicit, writable deep copy of the dataframe.
 
         Returns:
-        - pandas.DataFrame: The copied dataframe.
+        - pandas.DataFrame: The copy.
         """
-        return self.df
+        return self.df.copy() if self.df is not None else None
 
     def __str__(self):
         """
@@ -168,5 +825,4 @@ class DataFrameCopier:
         Returns:
         - str: The detailed representation of the DataFrameCopier object.
         """
-        return f"DataFrameCopier(df={self.df})"
-    
+        return f"DataFrameCopier(df={self.df}, derived={list(self._derived)}, bytes_saved={self.bytes_saved})"
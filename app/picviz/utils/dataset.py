@@ -0,0 +1,250 @@
+import numpy as np
+import pandas as pd
+
+from .aggregate import StreamAggregator
+from .data import Choice, Loader
+
+
+class AppendReport:
+    """
+    A class used to describe what an `append` changed.
+
+    Attributes
+    ----------
+    rows (int): The number of appended rows.
+    changed_measures (list): The measures whose totals changed.
+    new_years (list): The years that did not exist before the append.
+    max_changed (list): The measures whose largest Year/Month cell changed,
+        i.e. whose heatmap colour scale has to be redrawn.
+    charts (list): The charts whose output changed, e.g. 'Heatmap(Injuries)'.
+    """
+
+    def __init__(self, rows, changed_measures, new_years, max_changed, charts):
+        self.rows = rows
+        self.changed_measures = changed_measures
+        self.new_years = new_years
+        self.max_changed = max_changed
+        self.charts = charts
+
+    def __bool__(self):
+        return bool(self.charts)
+
+    def __repr__(self):
+        return (f"AppendReport(rows={self.rows}, changed_measures={self.changed_measures}, "
+                f"new_years={self.new_years}, charts={self.charts})")
+
+
+class Dataset:
+    """
+    A class used to hold the loaded rows together with their aggregates.
+
+    The Year x Month x measure totals, the per-month, per-year and grand totals
+    (read by the monthly pie charts, `CustomBar` and `PieChartYs`) and the
+    largest Year/Month cell of each measure (the colour scale of `Heatmap`) are
+    kept up to date by `append` in time proportional to the appended rows, so
+    these charts redraw without going over all rows. A Dataset can be passed to
+    the aggregate chart classes in place of a DataFrame.
+
+    Methods
+    -------
+    from_csv(path, cache=False, cache_dir=None): Loads a Dataset from a CSV file.
+    append(new_rows): Adds rows and returns an AppendReport.
+    charts_for(measures, new_years=False): Returns the charts that depend on the measures.
+    share(): Returns a SharedDataset of the rows and cube for multi-process rendering.
+    """
+
+    def __init__(self, frame, measures=None):
+        """
+        Initialize the Dataset object.
+
+        Parameters:
+        frame (DataFrame): The rows, with `Year`, `Month` and measure columns.
+        measures (list, optional): The columns to total. Defaults to every numeric
+            column except `Year`.
+        """
+        if not isinstance(frame, pd.DataFrame):
+            raise TypeError("frame must be a pandas DataFrame")
+        self._frames = [frame]
+        self._aggregator = StreamAggregator(measures=measures)
+        self._aggregator.add(frame)
+        self.measures = self._aggregator.measures
+        self._cube = None
+
+        totals = self._aggregator.totals
+        observed = self._aggregator.seen.any(axis=1)
+        self._year_totals = {int(year): row for year, row in
+                             zip(np.flatnonzero(observed) + (self._aggregator.first_year or 0),
+                                 totals[observed].sum(axis=1))}
+        self._month_totals = totals.sum(axis=0)
+        self._grand_totals = self._month_totals.sum(axis=0)
+        self._cell_max = totals.max(axis=(0, 1)) if totals.size else np.zeros(len(self.measures), dtype=np.int64)
+
+    @classmethod
+    def from_csv(cls, path, cache=False, cache_dir=None, measures=None):
+        """
+        Load a Dataset from a CSV file.
+
+        Parameters:
+        path (str): The path of the CSV file.
+        cache (bool): Whether to load through the columnar cache. Defaults to False.
+        cache_dir (str, optional): Directory holding the cache sidecars.
+        measures (list, optional): The columns to total.
+
+        Returns:
+        Dataset: The loaded Dataset.
+        """
+        return cls(Loader().read_csv(path, cache=cache, cache_dir=cache_dir), measures=measures)
+
+    @property
+    def frame(self):
+        """
+        DataFrame: All rows, concatenated on first access after an append.
+        """
+        if len(self._frames) > 1:
+            self._frames = [pd.concat(self._frames, ignore_index=True)]
+        return self._frames[0]
+
+    @property
+    def cube(self):
+        """
+        AggregateCube: The Year x Month x measure totals of all rows.
+        """
+        if self._cube is None:
+            self._cube = self._aggregator.to_cube()
+        return self._cube
+
+    @property
+    def years(self):
+        """
+        list: The observed years, ascending.
+        """
+        return sorted(self._year_totals)
+
+    @property
+    def year_totals(self):
+        """
+        DataFrame: The totals of every measure per year.
+        """
+        years = self.years
+        return pd.DataFrame([self._year_totals[y] for y in years], index=pd.Index(years, name='Year'),
+                            columns=self.measures)
+
+    @property
+    def month_totals(self):
+        """
+        DataFrame: The totals of every measure per month over all years.
+        """
+        return pd.DataFrame(self._month_totals, index=pd.Index(self.cube.months, name='Month'), columns=self.measures)
+
+    @property
+    def grand_totals(self):
+        """
+        Series: The total of every measure over all rows.
+        """
+        return pd.Series(self._grand_totals, index=self.measures)
+
+    @property
+    def cell_max(self):
+        """
+        Series: The largest Year/Month total of every measure.
+        """
+        return pd.Series(self._cell_max, index=self.measures)
+
+    def __len__(self):
+        return self._aggregator.rows
+
+    def __repr__(self):
+        return f"Dataset(rows={len(self)}, years={self.years[:1] + self.years[-1:]}, measures={self.measures})"
+
+    def append(self, new_rows):
+        """
+        Add rows (e.g. a newly published month) to the dataset.
+
+        Only the Year/Month cells the new rows fall into are touched; the
+        per-month, per-year and grand totals and the cell maxima are updated from
+        those cells alone.
+
+        Parameters:
+        new_rows (DataFrame): The rows to add, with the columns of the dataset.
+
+        Returns:
+        AppendReport: What changed, including the charts that have to be redrawn.
+
+        Raises:
+        TypeError: If new_rows is not a pandas DataFrame.
+        ValueError: If new_rows misses a column of the dataset.
+        """
+        if not isinstance(new_rows, pd.DataFrame):
+            raise TypeError("new_rows must be a pandas DataFrame")
+        missing = [c for c in self._frames[0].columns if c not in new_rows.columns]
+        if missing:
+            raise ValueError(f"new_rows is missing columns: {missing}")
+        if new_rows.empty:
+            return AppendReport(0, [], [], [], [])
+
+        known_years = set(self._year_totals)
+        cells, deltas = self._aggregator.add(new_rows)
+        self._frames.append(new_rows[self._frames[0].columns])
+        self._cube = None
+
+        agg = self._aggregator
+        years = cells // 12 + agg.first_year
+        months = cells % 12
+        totals = agg.totals.reshape(-1, len(self.measures))[cells]
+        for year in np.unique(years):
+            self._year_totals[int(year)] = agg.totals[year - agg.first_year].sum(axis=0)
+        np.add.at(self._month_totals, months, deltas)
+        self._grand_totals += deltas.sum(axis=0)
+
+        old_max = self._cell_max.copy()
+        if (deltas < 0).any():
+            self._cell_max = agg.totals.max(axis=(0, 1))
+        else:
+            self._cell_max = np.maximum(self._cell_max, totals.max(axis=0))
+
+        changed = [m for m, d in zip(self.measures, deltas.any(axis=0)) if d]
+        new_years = sorted(int(y) for y in np.unique(years) if int(y) not in known_years)
+        max_changed = [m for m, a, b in zip(self.measures, old_max, self._cell_max) if a != b]
+        charts = self.charts_for(changed, new_years=bool(new_years))
+        # Scatter draws every row, so any new row changes it
+        charts += [f"Scatter({m})" for m in self.measures]
+        return AppendReport(len(new_rows), changed, new_years, max_changed, charts)
+
+    def share(self):
+        """
+        Copy the rows and cube into shared memory for multi-process rendering.
+
+        Returns:
+        SharedDataset: The shared handle; the caller owns (and must unlink) it.
+        """
+        from .shared import SharedDataset
+        return SharedDataset(self)
+
+    def charts_for(self, measures, new_years=False):
+        """
+        Return the charts whose output depends on the given measures.
+
+        Parameters:
+        measures (list): The measures that changed.
+        new_years (bool): Whether a year was added, which adds a column to every
+            heatmap and a bar to every yearly bar chart even if its totals are zero.
+
+        Returns:
+        list: Chart names such as 'StackBar(Israelis Injuries)' or 'Heatmap(Fatalities)'.
+        """
+        measures = set(measures)
+        charts = []
+        for choice in Choice:
+            related = {m for m in self.measures if choice.value in m}
+            if related & measures or (new_years and related):
+                charts.append(f"Heatmap({choice.value})")
+            if related & measures:
+                charts.append(f"PieChartMs({choice.value})")
+        if measures:
+            charts += ["PieChartYs", "CustomBar"]
+        for m in self.measures:
+            if m in measures or new_years:
+                charts.append(f"Bar({m})")
+            if m in measures:
+                charts += [f"StackBar({m})", f"pie_chart_mf({m})", f"pie_chart_sf({m})"]
+        return charts
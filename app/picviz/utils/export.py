@@ -0,0 +1,573 @@
+import base64
+import html
+import io
+import json
+import os
+import tempfile
+import webbrowser
+
+FORMATS = {
+    "html": "text/html",
+    "json": "application/json",
+    "png": "image/png",
+    "svg": "image/svg+xml",
+    "pdf": "application/pdf",
+}
+
+# How HTML output loads plotly.js and BokehJS: embedded in every file, from the
+# public CDN, or from one local copy next to the files (see `write_assets`)
+HTML_ASSETS = ("inline", "cdn", "directory")
+PLOTLY_JS = "plotly.min.js"
+
+
+def figure_library(fig):
+    """
+    Return the plotting library of a figure.
+
+    Parameters:
+    fig: A matplotlib, plotly or bokeh figure.
+
+    Returns:
+    str: 'matplotlib', 'plotly' or 'bokeh'.
+
+    Raises:
+    TypeError: If the figure is of none of these libraries.
+    """
+    module = type(fig).__module__
+    for library in ("matplotlib", "plotly", "bokeh"):
+        if module.startswith(library):
+            return library
+    raise TypeError(f"Unsupported figure type: {type(fig).__name__}")
+
+
+def figure_bytes(fig, format="html", title=None, assets=None, **savefig_kwargs):
+    """
+    Serialise a figure into memory.
+
+    Parameters:
+    fig: A matplotlib, plotly or bokeh figure. Matplotlib figures are closed afterwards.
+    format (str): 'html' or 'json' (plotly, bokeh), or 'png', 'svg', 'pdf'
+        (matplotlib; plotly through kaleido).
+    title (str, optional): The HTML page title of bokeh figures.
+    assets (str, optional): How HTML output loads plotly.js / BokehJS, one of
+        `HTML_ASSETS`. 'directory' references the local copies written by
+        `write_assets` into the same directory. Defaults to inline for plotly
+        and the CDN for bokeh.
+    **savefig_kwargs: Extra keyword arguments of matplotlib `savefig`.
+
+    Returns:
+    bytes: The serialised figure.
+
+    Raises:
+    ValueError: If the library cannot write the format, or assets is unknown.
+    """
+    library = figure_library(fig)
+    if format not in FORMATS:
+        raise ValueError(f"Unsupported format {format!r}. Supported formats: {sorted(FORMATS)}")
+    if assets is not None and assets not in HTML_ASSETS:
+        raise ValueError(f"Unsupported assets {assets!r}. Supported assets: {HTML_ASSETS}")
+    if library == "matplotlib":
+        if format in ("html", "json"):
+            raise ValueError(f"matplotlib figures cannot be written as {format}.")
+        import matplotlib.pyplot as plt
+        if format in ("svg", "pdf"):
+            # no creation date and fixed SVG ids, so identical figures serialise to identical bytes
+            savefig_kwargs.setdefault("metadata", {"Date" if format == "svg" else "CreationDate": None})
+        buffer = io.BytesIO()
+        with plt.rc_context({"svg.hashsalt": "picviz"}):
+            fig.savefig(buffer, format=format, **savefig_kwargs)
+        plt.close(fig)
+        return buffer.getvalue()
+    if library == "plotly":
+        if format == "html":
+            include = {None: True, "inline": True, "cdn": "cdn", "directory": "directory"}[assets]
+            return fig.to_html(full_html=True, include_plotlyjs=include).encode("utf-8")
+        if format == "json":
+            return fig.to_json().encode("utf-8")
+        return fig.to_image(format=format)
+    if format == "html":
+        from bokeh.embed import file_html
+        return file_html(fig, _bokeh_resources(assets or "cdn"), title or "Bokeh Plot").encode("utf-8")
+    if format == "json":
+        from bokeh.embed import json_item
+        return json.dumps(json_item(fig), separators=(",", ":")).encode("utf-8")
+    raise ValueError(f"bokeh figures cannot be written as {format}.")
+
+
+def _bokeh_resources(assets, components=None):
+    from bokeh.resources import Resources
+
+    if assets == "directory":
+        # server mode with a relative root references ./static/js/bokeh*.min.js
+        return Resources(mode="server", root_url="./", components=components)
+    return Resources(mode=assets, components=components)
+
+
+def _write_once(path, payload):
+    """
+    Write bytes to a file unless it already holds exactly these bytes.
+
+    Returns:
+    bool: True if the file was written.
+    """
+    try:
+        if os.path.getsize(path) == len(payload):
+            with open(path, "rb") as f:
+                if f.read() == payload:
+                    return False
+    except OSError:
+        pass
+    with open(path, "wb") as f:
+        f.write(payload)
+    return True
+
+
+def write_assets(directory, libraries=("plotly", "bokeh")):
+    """
+    Write plotly.js and the BokehJS bundles once into a directory, for HTML
+    written with `assets='directory'`.
+
+    Files that already hold the installed version are left untouched, so every
+    render of a gallery shares one copy instead of embedding about 4.5 MB of
+    plotly.js into each page.
+
+    Parameters:
+    directory (str): The directory of the HTML files.
+    libraries (tuple): 'plotly' and/or 'bokeh'.
+
+    Returns:
+    list: The paths that were (re)written.
+    """
+    os.makedirs(directory, exist_ok=True)
+    written = []
+    if "plotly" in libraries:
+        from plotly.offline import get_plotlyjs
+
+        path = os.path.join(directory, PLOTLY_JS)
+        if _write_once(path, get_plotlyjs().encode("utf-8")):
+            written.append(path)
+    if "bokeh" in libraries:
+        from bokeh.util.paths import bokehjs_path
+
+        for url in _bokeh_resources("directory").js_files:
+            relative = url.split("?")[0].removeprefix("./")
+            path = os.path.join(directory, relative)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(os.path.join(bokehjs_path(), os.path.relpath(relative, "static")), "rb") as f:
+                if _write_once(path, f.read()):
+                    written.append(path)
+    return written
+
+
+def display_bytes(payload, format="html"):
+    """
+    Display serialised figure bytes, inline in a notebook or in the web browser.
+
+    Parameters:
+    payload (bytes): The output of `figure_bytes`.
+    format (str): The format of payload.
+    """
+    try:
+        from IPython import get_ipython
+        shell = get_ipython()
+    except ImportError:
+        shell = None
+    if shell is not None:
+        from IPython.display import HTML, SVG, Image, display
+        if format == "html":
+            display(HTML(payload.decode("utf-8")))
+        elif format == "svg":
+            display(SVG(payload))
+        elif format == "png":
+            display(Image(payload))
+        return
+    fd, path = tempfile.mkstemp(suffix=f".{format}", prefix="picviz_")
+    with os.fdopen(fd, "wb") as f:
+        f.write(payload)
+    webbrowser.open(f"file://{path}")
+
+
+def render_figures(figures, format="png", **savefig_kwargs):
+    """
+    Serialise several figures into memory, e.g. the output of `pie_figures_mf`.
+
+    Parameters:
+    figures (dict): The figures by name.
+    format (str): The output format, see `figure_bytes`.
+    **savefig_kwargs: Extra keyword arguments of matplotlib `savefig`.
+
+    Returns:
+    dict: The serialised figures by name.
+    """
+    return {name: figure_bytes(fig, format, **savefig_kwargs) for name, fig in figures.items()}
+
+
+class Renderable:
+    """
+    A mixin giving every chart with a `build_figure()` a headless `render`.
+
+    `render` builds the figure and writes it straight to an in-memory buffer: it
+    never calls `show()`, opens a browser or touches a display, so it is safe on
+    render servers and in worker processes.
+
+    Methods
+    -------
+    render(format=None, cache=None, assets=None, **options): Returns the chart as bytes.
+    """
+
+    RENDER_FORMAT = "html"
+
+    def render(self, format=None, cache=None, assets=None, **options):
+        """
+        Render the chart to bytes without displaying it.
+
+        Parameters:
+        format (str, optional): The output format, see `figure_bytes`. Defaults to
+            `RENDER_FORMAT` ('png' for the matplotlib charts, 'html' otherwise).
+        cache (RenderCache, optional): Serve the bytes from this render cache when
+            the data and parameters are unchanged.
+        assets (str, optional): How HTML output loads its JavaScript, see `figure_bytes`.
+        **options: The keyword arguments of `build_figure`.
+
+        Returns:
+        bytes: The rendered chart.
+        """
+        format = format or self.RENDER_FORMAT
+        if cache is not None:
+            return cache.render(self, format, assets=assets, **options)
+        return figure_bytes(self.build_figure(**options), format, assets=assets)
+
+
+IMAGE_FORMATS = ("png", "jpg", "jpeg", "webp", "svg", "pdf")
+
+
+class StaticExporter:
+    """
+    A class used to export many figures to PNG/SVG/PDF through one warm exporter.
+
+    Plotly figures are rendered by kaleido, which drives a headless browser.
+    Starting that browser takes seconds, so the exporter starts it once (the
+    kaleido sync server) and pushes every queued figure through it in a single
+    `plotly.io.write_images` batch. Matplotlib figures in the batch are written
+    with `savefig`. Use it as a context manager to stop the browser afterwards:
+
+        with StaticExporter() as exporter:
+            exporter.add(Heatmap(df, Choice.Injuries, 'turbid').build_figure(), 'outputs/Iheatmapgo.png')
+            exporter.add(Scatter(df, 'Israelis Injuries').build_figure(), 'outputs/Scatter_il_i.png')
+            exporter.flush()
+
+    Methods
+    -------
+    start(): Starts the persistent export browser.
+    stop(): Stops it.
+    add(fig, path): Queues a figure for export.
+    flush(): Exports the queued figures in one batch.
+    export(figures, paths): Exports figures in one batch.
+    to_bytes(fig, format='png'): Returns one image rendered by the warm exporter.
+    """
+
+    def __init__(self, scale=None):
+        """
+        Initialize the StaticExporter object.
+
+        Parameters:
+        scale (float, optional): The resolution scale of the plotly images.
+            Defaults to the plotly default (1).
+        """
+        self.scale = scale
+        self._queue = []
+        self._started = False
+
+    @staticmethod
+    def _kaleido():
+        try:
+            import kaleido
+        except ImportError as e:
+            raise RuntimeError("Static export of plotly figures needs kaleido: pip install kaleido") from e
+        return kaleido
+
+    def start(self):
+        """
+        Start the persistent export browser, if the kaleido version has one.
+
+        Raises:
+        RuntimeError: If kaleido is not installed.
+        """
+        kaleido = self._kaleido()
+        if not self._started and hasattr(kaleido, "start_sync_server"):
+            kaleido.start_sync_server(silence_warnings=True)
+            self._started = True
+        return self
+
+    def stop(self):
+        """
+        Stop the persistent export browser.
+        """
+        if self._started:
+            self._kaleido().stop_sync_server(silence_warnings=True)
+            self._started = False
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def add(self, fig, path):
+        """
+        Queue a figure for export; the format is taken from the file extension.
+
+        Parameters:
+        fig: A plotly or matplotlib figure.
+        path (str): The output path, ending in .png, .jpg, .webp, .svg or .pdf.
+
+        Raises:
+        ValueError: If the extension is not an image format.
+        """
+        format = os.path.splitext(str(path))[1].lstrip(".").lower()
+        if format not in IMAGE_FORMATS:
+            raise ValueError(f"Unsupported image format {format!r}. Supported formats: {IMAGE_FORMATS}")
+        self._queue.append((fig, str(path)))
+
+    def flush(self):
+        """
+        Export every queued figure in one batch.
+
+        Returns:
+        list: The written paths.
+        """
+        queue, self._queue = self._queue, []
+        if not queue:
+            return []
+        figures, paths = zip(*queue)
+        return self.export(figures, paths)
+
+    def export(self, figures, paths):
+        """
+        Export figures in one batch.
+
+        Parameters:
+        figures (list): Plotly or matplotlib figures.
+        paths (list): The output path of every figure.
+
+        Returns:
+        list: The written paths.
+
+        Raises:
+        TypeError: If a figure is neither a plotly nor a matplotlib figure.
+        """
+        plotly_figures, plotly_paths = [], []
+        for fig, path in zip(figures, paths):
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            library = figure_library(fig)
+            if library == "plotly":
+                plotly_figures.append(fig)
+                plotly_paths.append(path)
+            elif library == "matplotlib":
+                with open(path, "wb") as f:
+                    f.write(figure_bytes(fig, os.path.splitext(path)[1].lstrip(".").lower()))
+            else:
+                raise TypeError("bokeh figures cannot be exported as static images here; write them as html.")
+        if plotly_figures:
+            import plotly.io as pio
+            self._kaleido()
+            # write_images uses the plotly defaults instead of the figure size, unlike to_image
+            widths = [fig.layout.width for fig in plotly_figures]
+            heights = [fig.layout.height for fig in plotly_figures]
+            if hasattr(pio, "write_images"):
+                pio.write_images(plotly_figures, plotly_paths, scale=self.scale, width=widths, height=heights)
+            else:
+                for fig, path, width, height in zip(plotly_figures, plotly_paths, widths, heights):
+                    pio.write_image(fig, path, scale=self.scale, width=width, height=height)
+        return list(paths)
+
+    def to_bytes(self, fig, format="png"):
+        """
+        Render one figure to image bytes through the warm exporter.
+
+        Parameters:
+        fig: A plotly or matplotlib figure.
+        format (str): The image format.
+
+        Returns:
+        bytes: The image.
+        """
+        if figure_library(fig) == "plotly":
+            self._kaleido()
+            return fig.to_image(format=format, scale=self.scale)
+        return figure_bytes(fig, format)
+
+
+class Dashboard:
+    """
+    A class used to bundle many figures into one self-contained HTML page.
+
+    plotly.js and BokehJS are loaded once for the whole page. Plotly and bokeh
+    figures are embedded as compact JSON and drawn in the browser; matplotlib
+    figures are embedded as PNG images.
+
+        dashboard = Dashboard("Palestine-Israel casualties")
+        dashboard.add(Heatmap(df, Choice.Injuries, 'turbid').build_figure(), "Injuries per month")
+        dashboard.add(StackBar(df).build_figure(), "Injuries per year")
+        dashboard.write("outputs/dashboard.html", assets="directory")
+
+    Methods
+    -------
+    add(fig, title=None): Adds a figure.
+    add_payload(library, format, payload, title=None): Adds an already serialised figure.
+    to_html(assets='inline'): Returns the page.
+    write(path, assets='inline'): Writes the page and, for assets='directory', the shared scripts.
+    """
+
+    def __init__(self, title="picviz dashboard"):
+        """
+        Initialize the Dashboard object.
+
+        Parameters:
+        title (str): The page title.
+        """
+        self.title = title
+        self.panels = []
+
+    @staticmethod
+    def panel_format(library):
+        """
+        Return the format a figure of a library is embedded in.
+
+        Parameters:
+        library (str): 'matplotlib', 'plotly' or 'bokeh'.
+
+        Returns:
+        str: 'png' for matplotlib, 'json' otherwise.
+        """
+        return "png" if library == "matplotlib" else "json"
+
+    def add(self, fig, title=None):
+        """
+        Serialise a figure and add it to the page.
+
+        Parameters:
+        fig: A matplotlib, plotly or bokeh figure. Matplotlib figures are closed afterwards.
+        title (str, optional): The panel heading.
+        """
+        library = figure_library(fig)
+        format = self.panel_format(library)
+        kwargs = {"bbox_inches": "tight"} if library == "matplotlib" else {}
+        self.add_payload(library, format, figure_bytes(fig, format, **kwargs), title)
+
+    def add_payload(self, library, format, payload, title=None):
+        """
+        Add an already serialised figure, e.g. one rendered in a worker or read from a RenderCache.
+
+        Parameters:
+        library (str): 'matplotlib', 'plotly' or 'bokeh'.
+        format (str): 'json' for plotly and bokeh, 'png' or 'svg' for matplotlib.
+        payload (bytes): The serialised figure.
+        title (str, optional): The panel heading.
+
+        Raises:
+        ValueError: If the format cannot be embedded for the library.
+        """
+        expected = ("png", "svg") if library == "matplotlib" else ("json",)
+        if format not in expected:
+            raise ValueError(f"{library} panels must be {' or '.join(expected)}, got {format!r}.")
+        self.panels.append((library, format, payload, title))
+
+    def __len__(self):
+        return len(self.panels)
+
+    def _scripts(self, assets):
+        libraries = {library for library, _, _, _ in self.panels}
+        scripts = []
+        if "plotly" in libraries:
+            if assets == "inline":
+                from plotly.offline import get_plotlyjs
+                scripts.append(f"<script>{get_plotlyjs()}</script>")
+            else:
+                from plotly.io._utils import plotly_cdn_url
+                src = plotly_cdn_url() if assets == "cdn" else PLOTLY_JS
+                scripts.append(f'<script charset="utf-8" src="{src}"></script>')
+        if "bokeh" in libraries:
+            scripts.append(_bokeh_resources(assets, components=["bokeh"]).render_js())
+        return "\n".join(scripts)
+
+    def to_html(self, assets="inline"):
+        """
+        Return the dashboard page.
+
+        Parameters:
+        assets (str): How the page loads plotly.js and BokehJS, one of `HTML_ASSETS`.
+
+        Returns:
+        str: The HTML page.
+
+        Raises:
+        ValueError: If assets is unknown.
+        """
+        if assets not in HTML_ASSETS:
+            raise ValueError(f"Unsupported assets {assets!r}. Supported assets: {HTML_ASSETS}")
+        sections, specs = [], []
+        for i, (library, format, payload, title) in enumerate(self.panels):
+            heading = f"<h2>{html.escape(title)}</h2>" if title else ""
+            if library == "matplotlib":
+                body = f'<img alt="{html.escape(title or "")}" src="data:{FORMATS[format]};base64,' \
+                       f'{base64.b64encode(payload).decode("ascii")}">'
+            else:
+                body = f'<div id="panel-{i}"></div>'
+                # payloads are embedded verbatim, not re-encoded; only '</' must not close the tag
+                spec = payload.decode("utf-8").replace("</", "<\\/")
+                specs.append(f'{{"id":"panel-{i}","library":"{library}","spec":{spec}}}')
+            sections.append(f'<section class="panel">{heading}{body}</section>')
+        return _DASHBOARD.format(title=html.escape(self.title), scripts=self._scripts(assets),
+                                 sections="\n".join(sections), specs="[" + ",".join(specs) + "]")
+
+    def write(self, path, assets="inline"):
+        """
+        Write the dashboard page, and the shared scripts next to it for assets='directory'.
+
+        Parameters:
+        path (str): The output path.
+        assets (str): How the page loads plotly.js and BokehJS, one of `HTML_ASSETS`.
+
+        Returns:
+        str: The path.
+        """
+        page = self.to_html(assets).encode("utf-8")
+        directory = os.path.dirname(os.path.abspath(path))
+        if assets == "directory":
+            write_assets(directory, tuple({library for library, _, _, _ in self.panels}))
+        os.makedirs(directory, exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(page)
+        return path
+
+
+_DASHBOARD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{font-family: sans-serif; margin: 1em; background: #fafafa;}}
+.panel {{background: #fff; margin: 0 0 1.5em; padding: 0.5em; box-shadow: 0 1px 3px #ccc;}}
+.panel h2 {{font-size: 1.1em; margin: 0.2em 0 0.5em;}}
+.panel img {{max-width: 100%;}}
+</style>
+{scripts}
+</head>
+<body>
+<h1>{title}</h1>
+{sections}
+<script type="application/json" id="picviz-figures">{specs}</script>
+<script>
+for (const panel of JSON.parse(document.getElementById("picviz-figures").textContent)) {{
+  if (panel.library === "plotly") {{
+    Plotly.newPlot(panel.id, panel.spec.data, panel.spec.layout, {{responsive: true}});
+  }} else {{
+    Bokeh.embed.embed_item(panel.spec, panel.id);
+  }}
+}}
+</script>
+</body>
+</html>
+"""
@@ -0,0 +1,93 @@
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s*\|\s*(\d+)\s*\|(\s*)(\S+)\s*$")
+_ROOT = Path(__file__).resolve().parents[3]
+
+
+def measure(statement="import app.picviz", python=None, cwd=None):
+    """
+    Run a statement in a fresh interpreter with `-X importtime` and parse the report.
+
+    Parameters:
+    statement (str): The Python code to time, e.g. "import app.picviz; app.picviz.Heatmap".
+    python (str, optional): The interpreter to run. Defaults to the current one.
+    cwd (str, optional): The working directory. Defaults to the repository root.
+
+    Returns:
+    list: One (module, self_us, cumulative_us, depth) tuple per imported module,
+        in import order.
+
+    Raises:
+    RuntimeError: If the statement fails.
+    """
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    proc = subprocess.run([python or sys.executable, "-X", "importtime", "-c", statement],
+                          cwd=cwd or _ROOT, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"Statement failed:\n{proc.stderr[-2000:]}")
+    rows = []
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+def total_ms(rows):
+    """
+    Return the wall time of the top-level imports in milliseconds.
+
+    Parameters:
+    rows (list): The output of `measure`.
+
+    Returns:
+    float: The summed cumulative time of the depth-0 imports.
+    """
+    return sum(cumulative for _, _, cumulative, depth in rows if depth == 0) / 1000
+
+
+def report(rows, top=15):
+    """
+    Format the slowest imports of a `measure` run as a text table.
+
+    Parameters:
+    rows (list): The output of `measure`.
+    top (int): The number of modules to list. Defaults to 15.
+
+    Returns:
+    str: The report.
+    """
+    lines = [f"{'cumulative ms':>14} {'self ms':>9}  module"]
+    for module, self_us, cumulative_us, depth in sorted(rows, key=lambda r: r[2], reverse=True)[:top]:
+        lines.append(f"{cumulative_us / 1000:14.1f} {self_us / 1000:9.1f}  {'  ' * depth}{module}")
+    lines.append(f"total: {total_ms(rows):.1f} ms over {len(rows)} modules")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report the import time of picviz and check it against a budget.")
+    parser.add_argument("--touch", nargs="*", default=[],
+                        help="picviz attributes to access after the import, e.g. Heatmap StackBar")
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="fail (exit code 1) if the total import time exceeds this many milliseconds")
+    parser.add_argument("--top", type=int, default=15, help="number of modules to list")
+    parser.add_argument("--repeat", type=int, default=3, help="runs to take the fastest of")
+    args = parser.parse_args(argv)
+
+    statement = "import app.picviz as picviz" + "".join(f"; picviz.{name}" for name in args.touch)
+    rows = min((measure(statement) for _ in range(max(args.repeat, 1))), key=total_ms)
+    print(report(rows, top=args.top))
+    if args.budget_ms is not None and total_ms(rows) > args.budget_ms:
+        print(f"import time {total_ms(rows):.1f} ms exceeds the budget of {args.budget_ms:.1f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,319 @@
+import hashlib
+import inspect
+import os
+import tempfile
+from enum import Enum
+from importlib import metadata
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .aggregate import AggregateCube
+from .export import figure_bytes
+
+_LIBRARIES = ("plotly", "matplotlib", "bokeh", "pandas", "numpy")
+_PLAIN = (str, int, float, bool, type(None), Enum, Path)
+
+
+def library_versions():
+    """
+    Return the installed versions of the plotting and data libraries.
+
+    Returns:
+    dict: The version of every library, or None if it is not installed.
+    """
+    versions = {}
+    for name in _LIBRARIES:
+        try:
+            versions[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            versions[name] = None
+    return versions
+
+
+def fingerprint(obj, sha=None):
+    """
+    Hash the content of a chart input or parameter.
+
+    DataFrames and Series are hashed by their columns, dtypes, index and values
+    (`pd.util.hash_pandas_object`), arrays by dtype, shape and bytes, and
+    AggregateCubes by their totals, years and measures. Containers are hashed
+    recursively and anything else by its repr.
+
+    Parameters:
+    obj: The object to hash.
+    sha (hashlib object, optional): The hash to update. Defaults to a new sha256.
+
+    Returns:
+    hashlib object: The updated hash.
+    """
+    sha = sha or hashlib.sha256()
+    if isinstance(obj, pd.DataFrame):
+        sha.update(repr((list(obj.columns), [str(t) for t in obj.dtypes])).encode())
+        sha.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, pd.Series):
+        sha.update(repr((obj.name, str(obj.dtype))).encode())
+        sha.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, np.ndarray):
+        sha.update(repr((obj.dtype.str, obj.shape)).encode())
+        sha.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, AggregateCube):
+        fingerprint((obj.values, obj.years, list(obj.measures)), sha)
+    elif isinstance(obj, dict):
+        for key in sorted(obj, key=repr):
+            sha.update(repr(key).encode())
+            fingerprint(obj[key], sha)
+    elif isinstance(obj, (list, tuple)):
+        sha.update(f"{type(obj).__name__}{len(obj)}".encode())
+        for item in obj:
+            fingerprint(item, sha)
+    elif isinstance(obj, Enum):
+        sha.update(repr(obj.value).encode())
+    else:
+        sha.update(repr(obj).encode())
+    return sha
+
+
+def _is_plain(value):
+    if isinstance(value, (list, tuple)):
+        return all(_is_plain(v) for v in value)
+    if isinstance(value, dict):
+        return all(_is_plain(v) for v in value.values())
+    return isinstance(value, _PLAIN)
+
+
+def chart_params(chart):
+    """
+    Return the parameters of a chart that affect its output.
+
+    These are the plain (str, number, enum, path and containers of them)
+    attributes of the chart and of its `config`, without data, helpers and
+    output file names.
+
+    Parameters:
+    chart: The chart object.
+
+    Returns:
+    dict: The parameters by attribute name.
+    """
+    params = {name: value for name, value in vars(chart).items()
+              if _is_plain(value) and 'filename' not in name}
+    config = getattr(chart, 'config', None)
+    if config is not None and not _is_plain(config):
+        attrs = {**{k: v for k, v in vars(type(config)).items() if not k.startswith('_')}, **vars(config)}
+        params['config'] = {k: v for k, v in attrs.items() if _is_plain(v)}
+    return params
+
+
+_SOURCE_HASHES = {}
+
+
+def source_hash(cls):
+    """
+    Return the sha256 of the source file of a chart class, so code changes invalidate the cache.
+
+    Parameters:
+    cls (type): The chart class.
+
+    Returns:
+    str: The hex digest, or '' if the source is not available.
+    """
+    try:
+        path = inspect.getfile(cls)
+        stat = os.stat(path)
+    except (TypeError, OSError):
+        return ''
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    if key not in _SOURCE_HASHES:
+        with open(path, 'rb') as f:
+            _SOURCE_HASHES[key] = hashlib.sha256(f.read()).hexdigest()
+    return _SOURCE_HASHES[key]
+
+
+class RenderCache:
+    """
+    A class used to store rendered charts on disk, addressed by their content.
+
+    The key of a rendering hashes the aggregated data slice the chart draws
+    (`cache_slice()` of the chart), the chart class and its source file, its
+    parameters (`chart_params`), the build options, the output format and the
+    library versions. A hit returns the stored bytes without building the
+    figure. The cache is bounded by size: when a write pushes it over
+    `max_bytes`, the least recently used entries are removed.
+
+    Methods
+    -------
+    key(chart, format='html', **options): Returns the cache key of a rendering.
+    get(key): Returns the stored bytes, or None.
+    put(key, payload): Stores the bytes and evicts the least recently used entries.
+    render(chart, format='html', savefig_kwargs=None, assets=None, **options): Returns the rendered bytes, from the cache if possible.
+    clear(): Removes every entry.
+    """
+
+    SUFFIX = ".bin"
+
+    def __init__(self, cache_dir=None, max_bytes=512 * 1024 ** 2):
+        """
+        Initialize the RenderCache object.
+
+        Parameters:
+        cache_dir (str, optional): The cache directory. Defaults to `.picviz_render_cache`
+            in the working directory.
+        max_bytes (int): The size bound of the cache. Defaults to 512 MiB.
+        """
+        self.cache_dir = Path(cache_dir if cache_dir is not None else ".picviz_render_cache")
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._versions = library_versions()
+
+    def key(self, chart, format="html", **options):
+        """
+        Return the cache key of rendering a chart.
+
+        Parameters:
+        chart: The chart object; it must have `cache_slice()` and `build_figure()`.
+        format (str): The output format.
+        **options: The keyword arguments of `build_figure`.
+
+        Returns:
+        str: The hex digest.
+        """
+        cls = type(chart)
+        sha = hashlib.sha256(f"{cls.__module__}.{cls.__qualname__}:{format}".encode())
+        sha.update(source_hash(cls).encode())
+        fingerprint(self._versions, sha)
+        fingerprint(chart_params(chart), sha)
+        fingerprint(options, sha)
+        fingerprint(chart.cache_slice(), sha)
+        return sha.hexdigest()
+
+    def _path(self, key):
+        return self.cache_dir / key[:2] / (key + self.SUFFIX)
+
+    def get(self, key):
+        """
+        Return the stored bytes of a key and mark the entry as recently used.
+
+        Parameters:
+        key (str): The cache key.
+
+        Returns:
+        bytes: The stored bytes, or None on a miss.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                payload = f.read()
+            os.utime(path)
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return payload
+
+    def put(self, key, payload):
+        """
+        Store the bytes of a key, then evict the least recently used entries over `max_bytes`.
+
+        Parameters:
+        key (str): The cache key.
+        payload (bytes): The rendered chart.
+        """
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        self.evict()
+
+    def entries(self):
+        """
+        Return the cache entries, least recently used first.
+
+        Returns:
+        list: (mtime, size, path) tuples.
+        """
+        entries = []
+        if not self.cache_dir.is_dir():
+            return entries
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(self.SUFFIX):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        return sorted(entries)
+
+    @property
+    def size(self):
+        """
+        int: The total size of the stored entries in bytes.
+        """
+        return sum(size for _, size, _ in self.entries())
+
+    def __len__(self):
+        return len(self.entries())
+
+    def evict(self):
+        """
+        Remove the least recently used entries until the cache fits in `max_bytes`.
+
+        Returns:
+        int: The number of removed entries.
+        """
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self):
+        """
+        Remove every entry.
+        """
+        for _, _, path in self.entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def render(self, chart, format="html", savefig_kwargs=None, assets=None, **options):
+        """
+        Return the rendered bytes of a chart, building the figure only on a miss.
+
+        Parameters:
+        chart: The chart object.
+        format (str): The output format, see `figure_bytes`.
+        savefig_kwargs (dict, optional): Extra keyword arguments of matplotlib `savefig`.
+        assets (str, optional): How HTML output loads its JavaScript, see `figure_bytes`.
+        **options: The keyword arguments of `build_figure`.
+
+        Returns:
+        bytes: The rendered chart.
+        """
+        key = self.key(chart, format, savefig=savefig_kwargs, assets=assets, **options)
+        payload = self.get(key)
+        if payload is None:
+            payload = figure_bytes(chart.build_figure(**options), format, assets=assets, **(savefig_kwargs or {}))
+            self.put(key, payload)
+        return payload
@@ -0,0 +1,231 @@
+import pandas as pd
+
+from .aggregate import AggregateCube
+from .data import MONTHS, as_frame
+
+
+class SchemaError(ValueError):
+    """
+    Raised when a DataFrame does not match a Schema. `problems` lists every failed check.
+    """
+
+    def __init__(self, schema, problems):
+        self.schema = schema
+        self.problems = problems
+        super().__init__(f"Data does not match schema '{schema.name}':\n- " + "\n- ".join(problems))
+
+
+class Schema:
+    """
+    A class used to describe the columns a chart input must have.
+
+    Column kinds are 'integer', 'number', 'string' and 'month' (upper-case month
+    names, as text or categorical).
+
+    Methods
+    -------
+    check(df): Returns the list of problems of df, empty if it matches.
+    """
+
+    def __init__(self, name, columns, ranges=None, min_rows=1):
+        """
+        Initialize the Schema object.
+
+        Parameters:
+        name (str): The name of the schema, used in error messages.
+        columns (dict): The kind of every required column.
+        ranges (dict, optional): Inclusive (low, high) bounds of numeric columns;
+            None leaves a side open.
+        min_rows (int): The minimum number of rows. Defaults to 1.
+        """
+        self.name = name
+        self.columns = dict(columns)
+        self.ranges = dict(ranges or {})
+        self.min_rows = min_rows
+
+    def __repr__(self):
+        return f"Schema(name={self.name!r}, columns={list(self.columns)})"
+
+    def check(self, df):
+        """
+        Check a DataFrame against the schema in one vectorised pass per check.
+
+        Parameters:
+        df (DataFrame): The DataFrame to check.
+
+        Returns:
+        list: The problems found, empty if df matches the schema.
+        """
+        if not isinstance(df, pd.DataFrame):
+            return [f"expected a pandas DataFrame, got {type(df).__name__}"]
+        problems = []
+        if len(df) < self.min_rows:
+            problems.append(f"expected at least {self.min_rows} rows, got {len(df)}")
+
+        missing = [c for c in self.columns if c not in df.columns]
+        if missing:
+            problems.append(f"missing columns: {missing}")
+        present = [c for c in self.columns if c in df.columns]
+        if not present or not len(df):
+            return problems
+
+        nans = df[present].isna().to_numpy().any(axis=0)
+        problems += [f"column '{c}' contains NaN values" for c, bad in zip(present, nans) if bad]
+
+        numeric = []
+        for name in present:
+            kind, col = self.columns[name], df[name]
+            if kind == 'integer' and not pd.api.types.is_integer_dtype(col):
+                problems.append(f"column '{name}' must be integer, got {col.dtype}")
+            elif kind == 'number' and not pd.api.types.is_numeric_dtype(col):
+                problems.append(f"column '{name}' must be numeric, got {col.dtype}")
+            elif kind in ('string', 'month') and pd.api.types.is_numeric_dtype(col):
+                problems.append(f"column '{name}' must be text, got {col.dtype}")
+            elif kind == 'month':
+                values = col.cat.categories if isinstance(col.dtype, pd.CategoricalDtype) else col.dropna().unique()
+                unknown = sorted({str(v) for v in values} - set(MONTHS))
+                if unknown:
+                    problems.append(f"column '{name}' has unknown months: {unknown[:5]}")
+            elif kind in ('integer', 'number'):
+                numeric.append(name)
+
+        bounded = [c for c in numeric if c in self.ranges]
+        if bounded:
+            lows, highs = df[bounded].min().to_numpy(), df[bounded].max().to_numpy()
+            for name, low, high in zip(bounded, lows, highs):
+                lo, hi = self.ranges[name]
+                if (lo is not None and low < lo) or (hi is not None and high > hi):
+                    problems.append(f"column '{name}' has values outside [{lo}, {hi}]: min {low}, max {high}")
+        return problems
+
+
+OCHA_MONTHLY = Schema(
+    "ocha-monthly",
+    {"Year": "integer", "Month": "month", "Palestinians Injuries": "integer", "Palestinians Fatalities": "integer",
+     "Israelis Injuries": "integer", "Israelis Fatalities": "integer"},
+    ranges={"Year": (1900, 2100), "Palestinians Injuries": (0, None), "Palestinians Fatalities": (0, None),
+            "Israelis Injuries": (0, None), "Israelis Fatalities": (0, None)},
+)
+
+OCHA_GROUPED = Schema(
+    "ocha-grouped",
+    {"Year": "integer", "Month": "month", "Injuries": "integer", "Fatalities": "integer", "Group": "string"},
+    ranges={"Year": (1900, 2100), "Injuries": (0, None), "Fatalities": (0, None)},
+)
+
+SCHEMAS = [OCHA_MONTHLY, OCHA_GROUPED]
+
+
+class ValidatedDataset:
+    """
+    A class used to mark a DataFrame as validated against a Schema.
+
+    Chart classes accept a ValidatedDataset in place of a DataFrame and skip
+    their own column, dtype and NaN checks for it. The frame must not be
+    modified after validation.
+
+    Methods
+    -------
+    frame: The validated DataFrame.
+    schema: The Schema it was validated against.
+    cube: The AggregateCube of the frame, built on first use.
+    """
+
+    def __init__(self, frame, schema):
+        self._frame = frame
+        self._schema = schema
+        self._cube = None
+
+    @property
+    def frame(self):
+        """
+        DataFrame: The validated rows.
+        """
+        return self._frame
+
+    @property
+    def schema(self):
+        """
+        Schema: The schema the rows were validated against.
+        """
+        return self._schema
+
+    @property
+    def columns(self):
+        """
+        Index: The columns of the validated rows.
+        """
+        return self._frame.columns
+
+    @property
+    def cube(self):
+        """
+        AggregateCube: The Year x Month x measure totals of the integer columns, built on first use.
+        """
+        if self._cube is None:
+            measures = [c for c, kind in self._schema.columns.items() if kind == 'integer' and c != 'Year']
+            self._cube = AggregateCube.from_frame(self._frame, measures=measures)
+        return self._cube
+
+    def has_columns(self, columns):
+        """
+        Return whether the schema guarantees the given columns.
+
+        Parameters:
+        columns (list): The column names.
+
+        Returns:
+        bool: True if every column is part of the schema.
+        """
+        return all(c in self._schema.columns for c in columns)
+
+    def __len__(self):
+        return len(self._frame)
+
+    def __repr__(self):
+        return f"ValidatedDataset(schema={self._schema.name!r}, rows={len(self)})"
+
+
+def detect_schema(df):
+    """
+    Return the first known Schema whose columns are all present in df.
+
+    Parameters:
+    df (DataFrame): The DataFrame.
+
+    Returns:
+    Schema: The matching schema, or None.
+    """
+    for schema in SCHEMAS:
+        if all(c in df.columns for c in schema.columns):
+            return schema
+    return None
+
+
+def validate(data, schema=None):
+    """
+    Validate a DataFrame once and return a ValidatedDataset the charts trust.
+
+    Parameters:
+    data (DataFrame): The DataFrame (or an object exposing one as `frame`).
+    schema (Schema, optional): The schema to check against. Defaults to the
+        first of `SCHEMAS` whose columns are all present.
+
+    Returns:
+    ValidatedDataset: The validated data.
+
+    Raises:
+    SchemaError: If the data does not match the schema, or no schema matches.
+    """
+    if isinstance(data, ValidatedDataset) and (schema is None or data.schema is schema):
+        return data
+    df = as_frame(data)
+    if schema is None:
+        schema = detect_schema(df) if isinstance(df, pd.DataFrame) else None
+        if schema is None:
+            raise SchemaError(Schema("auto", {}), [f"no known schema matches the columns "
+                                                  f"{list(getattr(df, 'columns', []))}"])
+    problems = schema.check(df)
+    if problems:
+        raise SchemaError(schema, problems)
+    return ValidatedDataset(df, schema)
@@ -0,0 +1,223 @@
+import secrets
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from .aggregate import AggregateCube
+from .data import compact_dtypes
+
+
+def _attach(name):
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 has no `track`; pool workers share the owner's resource tracker.
+        return shared_memory.SharedMemory(name=name)
+
+
+def _numpy_values(col):
+    """
+    Return the values of a numeric or boolean column as a NumPy array.
+
+    Nullable extension columns (e.g. Int64, boolean, Float64) become their NumPy
+    dtype, or float64 with NaN where values are missing.
+
+    Raises:
+    TypeError: If the column has no NumPy representation.
+    """
+    dtype = col.dtype
+    if not isinstance(dtype, pd.api.extensions.ExtensionDtype):
+        return col.to_numpy()
+    if col.hasnans:
+        return col.to_numpy(dtype='float64', na_value=np.nan)
+    values = col.to_numpy(dtype=getattr(dtype, 'numpy_dtype', None))
+    if values.dtype == object:
+        raise TypeError(f"Column {col.name!r} of dtype {dtype} cannot be shared as a NumPy array")
+    return values
+
+
+class SharedDataset:
+    """
+    A class used to share one copy of a dataset between processes.
+
+    The rows (downcast with `compact_dtypes` and grouped by NumPy dtype into
+    2-D blocks, categoricals as codes) and the AggregateCube are laid out in a
+    single `multiprocessing.shared_memory` segment; nullable extension columns
+    are shared as plain NumPy columns, see `_numpy_values`. Pickling a SharedDataset only sends the segment name and layout, so
+    pool workers attach to the segment and wrap read-only NumPy views of it
+    without copying: memory stays flat as workers are added. A SharedDataset
+    can be passed to the chart classes in place of a DataFrame.
+
+    The creating process owns the segment and must release it with `unlink`
+    (or by using the object as a context manager) once the workers are done.
+
+    Methods
+    -------
+    frame: The rows as a DataFrame of shared, read-only columns.
+    cube: The AggregateCube over the shared totals, or None.
+    close(): Detaches this process from the segment.
+    unlink(): Frees the segment (owner only).
+    """
+
+    def __init__(self, data):
+        """
+        Copy the dataset into a new shared memory segment.
+
+        Parameters:
+        data (DataFrame or Dataset): The rows to share. A Dataset also shares its
+            cube; for a DataFrame with `Year` and `Month` columns the cube is built here.
+
+        Raises:
+        TypeError: If data is neither a DataFrame nor exposes one as `frame`, or a
+            numeric column has no NumPy representation.
+        """
+        frame = data if isinstance(data, pd.DataFrame) else getattr(data, 'frame', None)
+        if not isinstance(frame, pd.DataFrame):
+            raise TypeError("data must be a pandas DataFrame or a Dataset")
+        cube = getattr(data, 'cube', None)
+        if cube is None and {'Year', 'Month'} <= set(frame.columns):
+            cube = AggregateCube.from_frame(frame)
+
+        arrays, layout = self._plan(compact_dtypes(frame), cube)
+        size = max(sum(a.nbytes for a in arrays), 1)
+        self._shm = shared_memory.SharedMemory(name=f"picviz_{secrets.token_hex(6)}", create=True, size=size)
+        self._owner = True
+        offset = 0
+        for array, entry in zip(arrays, layout['arrays']):
+            entry['offset'] = offset
+            np.ndarray(array.shape, dtype=array.dtype, buffer=self._shm.buf, offset=offset)[...] = array
+            offset += array.nbytes
+        self._layout = layout
+        self._frame = None
+        self._cube = None
+
+    @staticmethod
+    def _plan(frame, cube):
+        arrays, entries, blocks = [], [], {}
+        layout = {'rows': len(frame), 'columns': [str(c) for c in frame.columns], 'arrays': entries,
+                  'blocks': [], 'categoricals': [], 'cube': None}
+
+        def add(array, **entry):
+            arrays.append(np.ascontiguousarray(array))
+            entries.append(dict(entry, dtype=arrays[-1].dtype.str, shape=arrays[-1].shape))
+            return len(entries) - 1
+
+        for name in frame.columns:
+            col = frame[name]
+            if isinstance(col.dtype, pd.CategoricalDtype) or not (pd.api.types.is_numeric_dtype(col)
+                                                                   or pd.api.types.is_bool_dtype(col)):
+                col = col.astype('category')
+                layout['categoricals'].append({'array': add(col.cat.codes.to_numpy()), 'column': str(name),
+                                               'categories': col.cat.categories.tolist(),
+                                               'ordered': bool(col.cat.ordered)})
+            else:
+                values = _numpy_values(col)
+                blocks.setdefault(values.dtype.str, []).append((name, values))
+        for columns in blocks.values():
+            layout['blocks'].append({'array': add(np.stack([values for _, values in columns])),
+                                     'columns': [str(name) for name, _ in columns]})
+        if cube is not None:
+            layout['cube'] = {'array': add(cube.values), 'years': cube.years.tolist(), 'measures': cube.measures}
+        return arrays, layout
+
+    def _view(self, index):
+        entry = self._layout['arrays'][index]
+        array = np.ndarray(tuple(entry['shape']), dtype=np.dtype(entry['dtype']),
+                           buffer=self._shm.buf, offset=entry['offset'])
+        array.flags.writeable = False
+        return array
+
+    @property
+    def name(self):
+        """
+        str: The name of the shared memory segment.
+        """
+        return self._shm.name
+
+    @property
+    def nbytes(self):
+        """
+        int: The size of the shared memory segment.
+        """
+        return self._shm.size
+
+    @property
+    def frame(self):
+        """
+        DataFrame: The rows, backed by read-only views of the shared segment.
+        """
+        if self._frame is None:
+            layout = self._layout
+            df = None
+            for block in sorted(layout['blocks'], key=lambda b: len(b['columns']), reverse=True):
+                values = self._view(block['array'])
+                if df is None:
+                    df = pd.DataFrame(values.T, columns=block['columns'], copy=False)
+                else:
+                    for name, column in zip(block['columns'], values):
+                        df[name] = column
+            if df is None:
+                df = pd.DataFrame(index=pd.RangeIndex(layout['rows']))
+            for cat in layout['categoricals']:
+                df[cat['column']] = pd.Categorical.from_codes(self._view(cat['array']),
+                                                              categories=cat['categories'], ordered=cat['ordered'])
+            self._frame = df[layout['columns']]
+        return self._frame
+
+    @property
+    def cube(self):
+        """
+        AggregateCube: The Year x Month x measure totals over the shared segment, or None.
+        """
+        spec = self._layout['cube']
+        if self._cube is None and spec is not None:
+            self._cube = AggregateCube(self._view(spec['array']), spec['years'], spec['measures'])
+        return self._cube
+
+    def __getstate__(self):
+        return {'name': self._shm.name, 'layout': self._layout}
+
+    def __setstate__(self, state):
+        self._shm = _attach(state['name'])
+        self._owner = False
+        self._layout = state['layout']
+        self._frame = None
+        self._cube = None
+
+    def __len__(self):
+        return self._layout['rows']
+
+    def __repr__(self):
+        return f"SharedDataset(name={self.name!r}, rows={len(self)}, nbytes={self.nbytes})"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        if self._owner:
+            self.unlink()
+
+    def close(self):
+        """
+        Detach this process from the segment. The frame and cube become unusable.
+        """
+        self._frame = None
+        self._cube = None
+        try:
+            self._shm.close()
+        except BufferError:
+            # Views handed out to the caller are still alive; the mapping goes with the process.
+            pass
+
+    def unlink(self):
+        """
+        Free the shared memory segment. Only the creating process may call this.
+
+        Raises:
+        RuntimeError: If called from a process that attached to the segment.
+        """
+        if not self._owner:
+            raise RuntimeError("Only the process that created the SharedDataset can unlink it.")
+        self._shm.unlink()
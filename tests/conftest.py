@@ -0,0 +1,14 @@
+import os
+
+import pytest
+
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "ps_il.csv")
+
+
+@pytest.fixture(scope="session")
+def frame():
+    from app.picviz.utils.data import Loader
+
+    return Loader().read_csv(DATA)
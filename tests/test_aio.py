@@ -0,0 +1,135 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.picviz import aio
+from app.picviz.aio import AsyncRenderer, RendererBusy, RenderTimeout
+
+
+@pytest.fixture
+def slow_chart(monkeypatch):
+    """Replace the chart rendering with one that holds its worker until released."""
+    release = threading.Event()
+    calls = []
+
+    def render_chart(chart, data, params=None, format=None, options=None, timeout=None, cache_dir=None,
+                     assets=None):
+        calls.append(chart)
+        release.wait(5)
+        return chart.encode()
+
+    monkeypatch.setattr(aio, "render_chart", render_chart)
+    return release, calls
+
+
+def test_render_returns_chart_bytes(frame):
+    async def main():
+        async with AsyncRenderer(max_workers=1, executor="thread") as renderer:
+            renderer.add_dataset("monthly", frame)
+            return await renderer.render("Scatter", "monthly", {"var": "Israelis Injuries"}, format="json")
+
+    assert asyncio.run(main()).startswith(b"{")
+
+
+def test_burst_without_wait_is_bounded(slow_chart):
+    release, calls = slow_chart
+
+    async def main():
+        async with AsyncRenderer(max_workers=2, max_queue=1, executor="thread") as renderer:
+            requests = [asyncio.create_task(renderer.render("Bar", None, wait=False)) for _ in range(6)]
+            await asyncio.sleep(0.1)
+            release.set()
+            return await asyncio.gather(*requests, return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert results[:3] == [b"Bar"] * 3
+    assert all(isinstance(r, RendererBusy) for r in results[3:])
+    assert len(calls) == 3
+
+
+def test_waiting_requests_are_served_in_turn(slow_chart):
+    release, calls = slow_chart
+
+    async def main():
+        async with AsyncRenderer(max_workers=2, max_queue=1, executor="thread") as renderer:
+            requests = [asyncio.create_task(renderer.render("Bar", None)) for _ in range(6)]
+            await asyncio.sleep(0.1)
+            stats = renderer.stats()
+            release.set()
+            return stats, await asyncio.gather(*requests)
+
+    stats, results = asyncio.run(main())
+    assert (stats["running"], stats["waiting"]) == (2, 1)
+    assert results == [b"Bar"] * 6
+
+
+def test_deadline_keeps_the_slot_until_the_worker_is_done(slow_chart):
+    release, calls = slow_chart
+
+    async def main():
+        async with AsyncRenderer(max_workers=1, executor="thread") as renderer:
+            with pytest.raises(RenderTimeout):
+                await renderer.render("Bar", None, timeout=0.1)
+            running = renderer.stats()["running"]
+            release.set()
+            await asyncio.sleep(0.1)
+            return running, renderer.stats()["running"], await renderer.render("Bar", None)
+
+    assert asyncio.run(main()) == (1, 0, b"Bar")
+
+
+def test_deadline_covers_the_wait_for_a_worker(slow_chart):
+    release, calls = slow_chart
+
+    async def main():
+        async with AsyncRenderer(max_workers=1, executor="thread") as renderer:
+            first = asyncio.create_task(renderer.render("Bar", None))
+            await asyncio.sleep(0.05)
+            started = time.monotonic()
+            with pytest.raises(RenderTimeout):
+                await renderer.render("Bar", None, timeout=0.1)
+            elapsed = time.monotonic() - started
+            release.set()
+            await first
+            return elapsed
+
+    assert asyncio.run(main()) < 1
+    assert calls == ["Bar"]
+
+
+def test_cancelled_request_frees_its_place(slow_chart):
+    release, calls = slow_chart
+
+    async def main():
+        async with AsyncRenderer(max_workers=1, max_queue=1, executor="thread") as renderer:
+            first = asyncio.create_task(renderer.render("Bar", None))
+            waiting = asyncio.create_task(renderer.render("Bar", None))
+            await asyncio.sleep(0.05)
+            waiting.cancel()
+            await asyncio.gather(waiting, return_exceptions=True)
+            queued = renderer.stats()["waiting"]
+            third = asyncio.create_task(renderer.render("Bar", None, wait=False))
+            await asyncio.sleep(0.05)
+            release.set()
+            return queued, await first, await third
+
+    assert asyncio.run(main()) == (0, b"Bar", b"Bar")
+    assert calls == ["Bar", "Bar"]
+
+
+def test_invalid_requests():
+    async def main():
+        renderer = AsyncRenderer(max_workers=1, executor="thread")
+        with pytest.raises(ValueError):
+            await renderer.render("Pie", None)
+        with pytest.raises(ValueError):
+            await renderer.render("Bar", "unknown")
+        await renderer.close()
+        with pytest.raises(RuntimeError):
+            await renderer.render("Bar", None)
+
+    asyncio.run(main())
+    with pytest.raises(ValueError):
+        AsyncRenderer(executor="fork")
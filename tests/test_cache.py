@@ -0,0 +1,126 @@
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.picviz.utils.cache import ColumnarCache
+from app.picviz.utils.data import Loader, compact_dtypes
+
+from conftest import DATA
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "ps_il.csv"
+    shutil.copy(DATA, path)
+    return path
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ColumnarCache(tmp_path / "cache")
+
+
+@pytest.fixture
+def parsed(source):
+    return compact_dtypes(pd.read_csv(source))
+
+
+def test_round_trip_is_memory_mapped(cache, source, parsed):
+    assert cache.load(source) is None
+    cache.store(source, parsed)
+    loaded = cache.load(source)
+    pd.testing.assert_frame_equal(loaded, parsed)
+    array = loaded["Israelis Injuries"].to_numpy()
+    while array is not None and not isinstance(array, np.memmap):
+        array = array.base
+    assert array is not None
+
+
+def test_changed_source_is_a_miss(cache, source, parsed):
+    cache.store(source, parsed)
+    with open(source, "a") as f:
+        f.write("2024,MAY,1,1,1,1\n")
+    assert cache.load(source) is None
+
+
+def test_touched_source_refreshes_the_key(cache, source, parsed):
+    cache.store(source, parsed)
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert cache.load(source) is not None
+    assert cache._read_meta(cache.sidecar(source))["key"]["mtime"] == stat.st_mtime_ns + 10 ** 9
+
+
+def test_parts_have_their_own_sidecars(cache, source, parsed):
+    cache.store(source, parsed)
+    cache.store(source, parsed.iloc[:10], part="normalised")
+    assert len(cache.load(source)) == len(parsed)
+    assert len(cache.load(source, part="normalised")) == 10
+    assert cache.load(source, part="other") is None
+
+
+def test_store_replaces_the_sidecar(cache, source, parsed):
+    cache.store(source, parsed)
+    old = cache.load(source)
+    cache.store(source, parsed.iloc[:5])
+    assert len(cache.load(source)) == 5
+    # frames loaded before the replacement keep their mapped columns
+    assert len(old) == len(parsed) and old["Year"].sum() == parsed["Year"].sum()
+    assert os.listdir(cache.cache_dir) == [cache.sidecar(source).name]
+
+
+def test_failed_store_keeps_the_old_sidecar(cache, source, parsed, monkeypatch):
+    cache.store(source, parsed)
+
+    def broken(sidecar, meta):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(cache, "_write_meta", broken)
+    with pytest.raises(OSError):
+        cache.store(source, parsed.iloc[:5])
+    monkeypatch.undo()
+    assert len(cache.load(source)) == len(parsed)
+    assert os.listdir(cache.cache_dir) == [cache.sidecar(source).name]
+
+
+def test_concurrent_stores_leave_one_valid_sidecar(cache, source, parsed):
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda _: cache.store(source, parsed), range(32)))
+    pd.testing.assert_frame_equal(cache.load(source), parsed)
+    assert os.listdir(cache.cache_dir) == [cache.sidecar(source).name]
+
+
+def test_unreadable_sidecars_are_misses(cache, source, parsed):
+    cache.store(source, parsed)
+    meta = cache.sidecar(source) / "meta.json"
+    meta.write_text("{not json")
+    assert cache.load(source) is None
+    cache.store(source, parsed)
+    (cache.sidecar(source) / "block0.npy").unlink()
+    assert cache.load(source) is None
+
+
+def test_uncacheable_columns(cache, source):
+    with pytest.raises(ValueError):
+        cache.store(source, pd.DataFrame({"a": ["x", "y"]}))
+    with pytest.raises(ValueError):
+        cache.store(source, pd.DataFrame({"a": pd.array([1, None], dtype="Int64")}))
+
+
+def test_compact_dtypes_keeps_nullable_integers_with_missing_values():
+    frame = compact_dtypes(pd.DataFrame({"Year": pd.array([2000, None], dtype="Int64"),
+                                         "Count": pd.array([1, None], dtype="Int64"),
+                                         "Total": pd.array([1, 2], dtype="Int64")}))
+    assert [str(t) for t in frame.dtypes] == ["Int64", "Int64", "int32"]
+
+
+def test_read_csv_through_the_cache(tmp_path, source):
+    loader = Loader()
+    first = loader.read_csv(source, cache=True, cache_dir=tmp_path / "cache")
+    second = loader.read_csv(source, cache=True, cache_dir=tmp_path / "cache")
+    pd.testing.assert_frame_equal(first, second)
+    pd.testing.assert_frame_equal(second, compact_dtypes(pd.read_csv(source)))
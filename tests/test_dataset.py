@@ -0,0 +1,44 @@
+import pandas as pd
+import pytest
+
+from app.picviz.src.bars import CustomBar
+from app.picviz.src.heatmap import Choice, Heatmap
+from app.picviz.src.pies import PIE_FEATURES, PieChartYs, monthly_pie_data
+from app.picviz.utils.dataset import Dataset
+
+
+@pytest.fixture
+def appended(frame):
+    dataset = Dataset(frame.iloc[:100])
+    report = dataset.append(frame.iloc[100:])
+    return dataset, report
+
+
+def test_append_keeps_aggregates_of_all_rows(frame, appended):
+    dataset, report = appended
+    fresh = Dataset(frame)
+    assert len(dataset) == len(frame)
+    pd.testing.assert_series_equal(dataset.grand_totals, fresh.grand_totals)
+    pd.testing.assert_series_equal(dataset.cell_max, fresh.cell_max)
+    pd.testing.assert_frame_equal(dataset.year_totals, fresh.year_totals)
+    pd.testing.assert_frame_equal(dataset.month_totals, fresh.month_totals)
+    assert report.rows == len(frame) - 100
+    assert "Heatmap(Injuries)" in report.charts and "CustomBar" in report.charts
+
+
+def test_append_nothing(appended):
+    dataset, _ = appended
+    report = dataset.append(dataset.frame.iloc[:0])
+    assert not report and report.rows == 0
+
+
+def test_charts_read_the_dataset_aggregates(frame, appended):
+    dataset, _ = appended
+    assert Heatmap(dataset, Choice.Injuries, "turbid").build_figure().to_json() == \
+        Heatmap(frame, Choice.Injuries, "turbid").build_figure().to_json()
+    assert PieChartYs(dataset, "Totals").build_figure().to_json() == PieChartYs(frame, "Totals").build_figure().to_json()
+    pd.testing.assert_frame_equal(monthly_pie_data(dataset), monthly_pie_data(frame)[PIE_FEATURES])
+
+    chart, reference = CustomBar(data=dataset, title="Totals"), CustomBar(data=frame, title="Totals")
+    assert chart.clean_data() == reference.clean_data()
+    assert chart.compute_statistics() == reference.compute_statistics()
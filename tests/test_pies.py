@@ -0,0 +1,30 @@
+import matplotlib.pyplot as plt
+import pytest
+
+from app.picviz.src import pies
+from app.picviz.utils.export import figure_bytes
+
+
+@pytest.mark.parametrize("kind", ["mf", "sf"])
+def test_reused_variants_render_like_fresh_figures(frame, kind):
+    fresh = {}
+    for feature, fig in getattr(pies, f"iter_pie_figures_{kind}")(frame):
+        fresh[feature] = figure_bytes(fig, "png"), figure_bytes(fig, "svg")
+        plt.close(fig)
+    reused = set()
+    for feature, fig in getattr(pies, f"pie_variants_{kind}")(frame):
+        reused.add(id(fig))
+        assert (figure_bytes(fig, "png"), figure_bytes(fig, "svg")) == fresh[feature], feature
+    plt.close("all")
+    assert len(fresh) == len(pies.PIE_FEATURES) and len(reused) == 1
+
+
+def test_skeleton_moves_wedges_and_rewrites_labels():
+    skeleton = pies.PieSkeleton(["A", "B", "C"], labeldistance=0.8)
+    fig = skeleton.update([1, 1, 2], ["red", "green", "blue"], "first")
+    assert skeleton.update([2, 1, 1], ["blue", "green", "red"], "second") is fig
+    assert [(w.theta1, w.theta2) for w in skeleton.wedges] == [(0, 180), (180, 270), (270, 360)]
+    assert [t.get_text() for t in skeleton.label_texts] == ["A", "B", "C"]
+    assert skeleton.title.get_text() == "second"
+    assert len(fig.axes[0].patches) == 3 * 2 + 1
+    plt.close(fig)
@@ -0,0 +1,83 @@
+import os
+
+import plotly.graph_objects as go
+import pytest
+
+from app.picviz.src.heatmap import Choice, Heatmap
+from app.picviz.utils import render_cache
+from app.picviz.utils.render_cache import RenderCache
+
+
+BUILDS = []
+
+
+class Chart:
+    def __init__(self, values, title="chart"):
+        self.values = values
+        self.title = title
+
+    def cache_slice(self):
+        return list(self.values)
+
+    def build_figure(self):
+        BUILDS.append(self.title)
+        return go.Figure(go.Bar(y=self.values), layout={"title": {"text": self.title}})
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return RenderCache(tmp_path / "renders")
+
+
+def test_render_builds_only_on_a_miss(cache):
+    BUILDS.clear()
+    chart = Chart([1, 2, 3])
+    first = cache.render(chart, "json")
+    assert cache.render(chart, "json") == first
+    assert (len(BUILDS), cache.hits, cache.misses, len(cache)) == (1, 1, 1, 1)
+
+
+def test_key_covers_data_parameters_format_and_options(cache):
+    key = cache.key(Chart([1, 2, 3]), "json")
+    assert cache.key(Chart([1, 2, 3]), "json") == key
+    assert len({key, cache.key(Chart([1, 2, 4]), "json"), cache.key(Chart([1, 2, 3], title="other"), "json"),
+                cache.key(Chart([1, 2, 3]), "html"), cache.key(Chart([1, 2, 3]), "json", assets="cdn")}) == 5
+
+
+def test_evicts_least_recently_used(cache):
+    payload = b"x" * 100
+    cache.max_bytes = 300
+    for i, key in enumerate(["aa1", "bb2", "cc3"]):
+        cache.put(key, payload)
+        os.utime(cache._path(key), ns=(10 ** 9 * (i + 1),) * 2)
+    assert cache.get("aa1") == payload
+    cache.put("dd4", payload)
+    assert [cache.get(k) is not None for k in ["aa1", "bb2", "cc3", "dd4"]] == [True, False, True, True]
+    assert cache.size == 300
+
+
+def test_failed_put_leaves_no_partial_entry(cache, monkeypatch):
+    def broken(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(render_cache.os, "replace", broken)
+    with pytest.raises(OSError):
+        cache.put("aa1", b"payload")
+    monkeypatch.undo()
+    assert cache.get("aa1") is None
+    assert os.listdir(cache.cache_dir / "aa") == []
+
+
+def test_clear(cache):
+    cache.put("aa1", b"a")
+    cache.put("bb2", b"b")
+    cache.clear()
+    assert (len(cache), cache.get("aa1")) == (0, None)
+
+
+def test_chart_renders_through_the_cache(cache, frame):
+    first = Heatmap(frame, Choice.Injuries, "turbid").render("json", cache=cache)
+    second = Heatmap(frame, Choice.Injuries, "turbid").render("json", cache=cache)
+    other = Heatmap(frame, Choice.Fatalities, "turbid").render("json", cache=cache)
+    assert first == second != other
+    assert (cache.hits, cache.misses) == (1, 2)
@@ -0,0 +1,149 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPConnection
+
+import pytest
+
+from app.picviz import aio
+from app.picviz.server import ChartService, LRUCache, RequestError, SingleFlight, make_server, parse_years
+
+MEASURES = ["Palestinians Injuries", "Palestinians Fatalities", "Israelis Injuries", "Israelis Fatalities"]
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_bytes=10)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    assert cache.get("a") == b"aaaa"
+    cache.put("c", b"cccc")
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (b"aaaa", b"cccc")
+    assert cache.stats() == {"entries": 2, "bytes": 8, "max_bytes": 10, "hits": 3, "misses": 1}
+
+
+def test_lru_replaces_and_skips_oversized():
+    cache = LRUCache(max_bytes=10)
+    cache.put("a", b"aaaa")
+    cache.put("a", b"aaaaaa")
+    cache.put("big", b"x" * 11)
+    assert (len(cache), cache.size, cache.get("big")) == (1, 6, None)
+
+
+def test_single_flight_shares_result():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def func():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "chart"
+
+    with ThreadPoolExecutor(4) as pool:
+        leader = pool.submit(flight.do, "key", func)
+        started.wait(5)
+        followers = [pool.submit(flight.do, "key", func) for _ in range(3)]
+        while len(flight._calls["key"].done._cond._waiters) < 3:
+            pass
+        release.set()
+        results = [leader.result()] + [f.result() for f in followers]
+    assert results == [("chart", False)] + [("chart", True)] * 3
+    assert len(calls) == 1
+    assert flight.do("key", lambda: "again") == ("again", False)
+
+
+def test_single_flight_raises_error_in_every_caller():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def func():
+        started.set()
+        release.wait(5)
+        raise ValueError("broken")
+
+    with ThreadPoolExecutor(2) as pool:
+        leader = pool.submit(flight.do, "key", func)
+        started.wait(5)
+        follower = pool.submit(flight.do, "key", func)
+        while not flight._calls["key"].done._cond._waiters:
+            pass
+        release.set()
+        for future in (leader, follower):
+            with pytest.raises(ValueError, match="broken"):
+                future.result()
+    assert flight._calls == {}
+
+
+def test_parse_years():
+    assert parse_years("2010-2020") == (2010, 2020)
+    assert parse_years("2014") == (2014, 2014)
+    assert parse_years("2010-") == (2010, None)
+    for value in ("20x0", "2020-2010"):
+        with pytest.raises(RequestError):
+            parse_years(value)
+
+
+@pytest.fixture
+def server(frame, monkeypatch):
+    release = threading.Event()
+
+    def render_chart(chart, data, params=None, format=None, options=None, timeout=None, cache_dir=None,
+                     assets=None):
+        release.wait(5)
+        return json.dumps([chart, params]).encode()
+
+    monkeypatch.setattr(aio, "render_chart", render_chart)
+    service = ChartService(frame, max_workers=1, max_queue=1, executor="thread", timeout=10)
+    httpd = make_server(service, port=0)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd, release
+    release.set()
+    httpd.shutdown()
+    httpd.server_close()
+    service.close()
+
+
+def get(httpd, path, headers=None):
+    connection = HTTPConnection(*httpd.server_address, timeout=10)
+    connection.request("GET", path, headers=headers or {})
+    response = connection.getresponse()
+    return response.status, dict(response.getheaders()), response.read()
+
+
+def test_concurrent_requests_over_the_queue_get_503(server):
+    httpd, release = server
+    paths = [f"/charts/Bar.png?variable={m.replace(' ', '%20')}" for m in MEASURES]
+    paths += ["/charts/Bar.png?years=2010-2012", "/charts/Bar.png?years=2013-2015"]
+    with ThreadPoolExecutor(len(paths)) as pool:
+        responses = [pool.submit(get, httpd, path) for path in paths]
+        # One request renders and one waits; the others are answered at once
+        deadline = time.monotonic() + 5
+        while sum(r.done() for r in responses) < len(paths) - 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        busy = [r.result() for r in responses if r.done()]
+        release.set()
+        statuses = sorted(r.result()[0] for r in responses)
+    assert statuses == [200, 200] + [503] * (len(paths) - 2)
+    assert [(status, headers["Retry-After"]) for status, headers, _ in busy] == [(503, "1")] * (len(paths) - 2)
+
+
+def test_cached_and_not_modified(server):
+    httpd, release = server
+    release.set()
+    status, headers, body = get(httpd, "/charts/Heatmap.json?choice=Fatalities")
+    assert (status, headers["X-Picviz-Cache"]) == (200, "miss")
+    status, headers, _ = get(httpd, "/charts/Heatmap.json?choice=Fatalities", {"If-None-Match": headers["ETag"]})
+    assert (status, headers["X-Picviz-Cache"]) == (304, "hit")
+
+
+def test_bad_requests(server):
+    httpd, release = server
+    assert get(httpd, "/charts/Pie")[0] == 404
+    assert get(httpd, "/charts/Heatmap?choice=Deaths")[0] == 400
+    assert get(httpd, "/charts/Bar.html")[0] == 400
+    assert get(httpd, "/charts/Bar?years=1900-1901")[0] == 404
+    assert get(httpd, "/health")[0] == 200
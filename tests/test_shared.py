@@ -0,0 +1,57 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.picviz.utils.shared import SharedDataset
+
+
+def test_rows_and_cube_round_trip(frame):
+    with SharedDataset(frame) as shared:
+        pd.testing.assert_frame_equal(shared.frame, frame, check_dtype=False, check_categorical=False)
+        assert shared.cube.totals(["Israelis Injuries"]).iloc[0] == frame["Israelis Injuries"].sum()
+        attached = pickle.loads(pickle.dumps(shared))
+        try:
+            pd.testing.assert_frame_equal(attached.frame, shared.frame)
+            assert not attached.frame["Israelis Injuries"].to_numpy().flags.writeable
+            with pytest.raises(RuntimeError):
+                attached.unlink()
+        finally:
+            attached.close()
+
+
+def _total(shared, column):
+    return int(shared.frame[column].sum())
+
+
+def test_workers_attach_to_the_segment(frame):
+    with SharedDataset(frame) as shared, ProcessPoolExecutor(2) as pool:
+        totals = list(pool.map(_total, [shared] * 2, ["Israelis Injuries", "Palestinians Fatalities"]))
+    assert totals == [frame["Israelis Injuries"].sum(), frame["Palestinians Fatalities"].sum()]
+
+
+def test_nullable_columns_are_shared_as_numpy():
+    frame = pd.DataFrame({
+        "Year": pd.array([2000, 2001, 2002], dtype="Int64"),
+        "Month": ["JANUARY", "FEBRUARY", "MARCH"],
+        "Count": pd.array([1, None, 3], dtype="Int64"),
+        "Rate": pd.array([0.5, 1.5, None], dtype="Float64"),
+        "Flag": pd.array([True, False, True], dtype="boolean"),
+        "Gap": pd.array([True, None, False], dtype="boolean"),
+    })
+    with SharedDataset(frame) as shared:
+        result = shared.frame
+        assert result["Year"].tolist() == [2000, 2001, 2002]
+        np.testing.assert_array_equal(result["Count"], [1, np.nan, 3])
+        np.testing.assert_array_equal(result["Rate"], [0.5, 1.5, np.nan])
+        assert result["Flag"].dtype == bool and result["Flag"].tolist() == [True, False, True]
+        np.testing.assert_array_equal(result["Gap"], [1, np.nan, 0])
+        assert result["Month"].tolist() == ["JANUARY", "FEBRUARY", "MARCH"]
+        assert list(result.columns) == list(frame.columns)
+
+
+def test_rejects_non_frames():
+    with pytest.raises(TypeError):
+        SharedDataset([1, 2, 3])